@@ -0,0 +1,24 @@
+"""request_version_column
+
+Revision ID: 4b1e7d2a9c30
+Revises: c97868e77dbe
+Create Date: 2026-10-19 09:00:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4b1e7d2a9c30'
+down_revision = 'c97868e77dbe'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('workflow_requests', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('workflow_requests', 'version')
@@ -0,0 +1,45 @@
+"""parallel_branches
+
+Revision ID: 8d3f61c2a7e5
+Revises: 4b1e7d2a9c30
+Create Date: 2026-10-19 09:30:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d3f61c2a7e5'
+down_revision = '4b1e7d2a9c30'
+branch_labels = None
+depends_on = None
+
+joinpolicy = sa.Enum('ALL', 'N_OF_M', name='joinpolicy')
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        # ADD VALUE cannot run inside the migration transaction
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TYPE stepstatus ADD VALUE IF NOT EXISTS 'WAITING'")
+
+    joinpolicy.create(bind, checkfirst=True)
+    op.add_column('step_transitions', sa.Column('is_parallel', sa.Boolean(), server_default=sa.false(), nullable=False))
+    op.add_column('workflow_steps', sa.Column('join_policy', joinpolicy, nullable=True))
+    op.add_column('workflow_steps', sa.Column('join_threshold', sa.Integer(), nullable=True))
+    op.add_column('request_steps', sa.Column('branch_path', sa.String(length=255), nullable=True))
+    op.add_column('request_steps', sa.Column('join_arrivals', sa.Integer(), server_default='0', nullable=False))
+    op.create_index(op.f('ix_request_steps_branch_path'), 'request_steps', ['branch_path'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_request_steps_branch_path'), table_name='request_steps')
+    op.drop_column('request_steps', 'join_arrivals')
+    op.drop_column('request_steps', 'branch_path')
+    op.drop_column('workflow_steps', 'join_threshold')
+    op.drop_column('workflow_steps', 'join_policy')
+    op.drop_column('step_transitions', 'is_parallel')
+    joinpolicy.drop(op.get_bind(), checkfirst=True)
+    # Postgres cannot drop a single enum value; 'WAITING' stays on stepstatus
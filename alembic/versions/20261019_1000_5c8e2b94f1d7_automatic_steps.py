@@ -0,0 +1,30 @@
+"""automatic_steps
+
+Revision ID: 5c8e2b94f1d7
+Revises: 8d3f61c2a7e5
+Create Date: 2026-10-19 10:00:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c8e2b94f1d7'
+down_revision = '8d3f61c2a7e5'
+branch_labels = None
+depends_on = None
+
+steptype = sa.Enum('HUMAN', 'AUTOMATIC', name='steptype')
+
+
+def upgrade() -> None:
+    steptype.create(op.get_bind(), checkfirst=True)
+    op.add_column('workflow_steps', sa.Column('step_type', steptype, server_default='HUMAN', nullable=False))
+    op.add_column('workflow_steps', sa.Column('action_config', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('workflow_steps', 'action_config')
+    op.drop_column('workflow_steps', 'step_type')
+    steptype.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,123 @@
+"""request_event_stream
+
+Revision ID: e71a4c0b93d2
+Revises: 5c8e2b94f1d7
+Create Date: 2026-10-19 10:30:00.000000+00:00
+
+"""
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e71a4c0b93d2'
+down_revision = '5c8e2b94f1d7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('request_events',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('request_id', sa.Uuid(), nullable=False),
+    sa.Column('sequence', sa.Integer(), nullable=False),
+    sa.Column('event_type', sa.String(length=50), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=True),
+    sa.Column('actor_id', sa.Uuid(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['actor_id'], ['users.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['request_id'], ['workflow_requests.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('request_id', 'sequence', name='uq_request_events_sequence')
+    )
+    op.create_table('request_snapshots',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('request_id', sa.Uuid(), nullable=False),
+    sa.Column('sequence', sa.Integer(), nullable=False),
+    sa.Column('state', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['request_id'], ['workflow_requests.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('request_id', 'sequence', name='uq_request_snapshots_sequence')
+    )
+    op.add_column('workflow_requests', sa.Column('last_event_seq', sa.Integer(), server_default='0', nullable=False))
+    _backfill_events()
+
+
+def _backfill_events() -> None:
+    """
+    Derive a stream for requests created before this migration from the
+    relational tables, so replays and timelines cover them too.
+    """
+    bind = op.get_bind()
+    requests = sa.table('workflow_requests',
+        sa.column('id', sa.Uuid()), sa.column('workflow_id', sa.Uuid()),
+        sa.column('requester_id', sa.Uuid()), sa.column('request_data', sa.JSON()),
+        sa.column('status', sa.String()), sa.column('created_at', sa.DateTime()),
+        sa.column('completed_at', sa.DateTime()), sa.column('last_event_seq', sa.Integer()),
+    )
+    steps = sa.table('request_steps',
+        sa.column('id', sa.Uuid()), sa.column('request_id', sa.Uuid()),
+        sa.column('step_id', sa.Uuid()), sa.column('status', sa.String()),
+        sa.column('assigned_to', sa.Uuid()), sa.column('started_at', sa.DateTime()),
+        sa.column('completed_at', sa.DateTime()), sa.column('deadline', sa.DateTime()),
+        sa.column('comments', sa.Text()),
+    )
+    events = sa.table('request_events',
+        sa.column('id', sa.Uuid()), sa.column('request_id', sa.Uuid()),
+        sa.column('sequence', sa.Integer()), sa.column('event_type', sa.String()),
+        sa.column('payload', sa.JSON()), sa.column('actor_id', sa.Uuid()),
+    )
+
+    def iso(value):
+        return value.isoformat() if value else None
+
+    steps_by_request = {}
+    for row in bind.execute(sa.select(steps)).mappings():
+        steps_by_request.setdefault(row['request_id'], []).append(row)
+
+    for req in bind.execute(sa.select(requests)).mappings():
+        # (time, event_type, payload, actor_id)
+        timeline = [(req['created_at'], 'REQUEST_CREATED', {
+            'at': iso(req['created_at']), 'request_id': str(req['id']),
+            'workflow_id': str(req['workflow_id']),
+            'requester_id': str(req['requester_id']) if req['requester_id'] else None,
+            'request_data': req['request_data'],
+        }, req['requester_id'])]
+        for step in steps_by_request.get(req['id'], []):
+            started = step['started_at'] or req['created_at']
+            timeline.append((started, 'STEP_ACTIVATED', {
+                'at': iso(started), 'request_step_id': str(step['id']),
+                'step_id': str(step['step_id']), 'branch_path': None,
+                'deadline': iso(step['deadline']),
+            }, None))
+            if step['completed_at']:
+                actor = step['assigned_to']
+                timeline.append((step['completed_at'], 'STEP_COMPLETED', {
+                    'at': iso(step['completed_at']), 'request_step_id': str(step['id']),
+                    'step_id': str(step['step_id']), 'outcome': step['status'],
+                    'actor_id': str(actor) if actor else None, 'comment': step['comments'],
+                }, actor))
+        if req['completed_at']:
+            timeline.append((req['completed_at'], 'REQUEST_COMPLETED', {
+                'at': iso(req['completed_at']), 'outcome': None, 'status': req['status'],
+            }, None))
+
+        timeline.sort(key=lambda item: item[0] or req['created_at'])
+        rows = [
+            {'id': uuid.uuid4(), 'request_id': req['id'], 'sequence': seq,
+             'event_type': event_type, 'payload': payload, 'actor_id': actor}
+            for seq, (_, event_type, payload, actor) in enumerate(timeline, start=1)
+        ]
+        bind.execute(events.insert(), rows)
+        bind.execute(
+            requests.update().where(requests.c.id == req['id']).values(last_event_seq=len(rows))
+        )
+
+
+def downgrade() -> None:
+    op.drop_column('workflow_requests', 'last_event_seq')
+    op.drop_table('request_snapshots')
+    op.drop_table('request_events')
@@ -0,0 +1,93 @@
+"""workflow_versions
+
+Revision ID: 3f7b2d9e6c51
+Revises: 9a2c5e7f1b48
+Create Date: 2026-10-19 12:00:00.000000+00:00
+
+"""
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f7b2d9e6c51'
+down_revision = '9a2c5e7f1b48'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('workflow_versions',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('workflow_id', sa.Uuid(), nullable=False),
+    sa.Column('version_number', sa.Integer(), nullable=False),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('published_by', sa.Uuid(), nullable=True),
+    sa.Column('published_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['published_by'], ['users.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['workflow_id'], ['workflows.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('workflow_id', 'version_number', name='uq_workflow_versions_number')
+    )
+    op.create_index(op.f('ix_workflow_versions_workflow_id'), 'workflow_versions', ['workflow_id'], unique=False)
+    op.add_column('workflows', sa.Column('current_version_id', sa.Uuid(), nullable=True))
+    op.create_foreign_key('fk_workflows_current_version_id', 'workflows', 'workflow_versions', ['current_version_id'], ['id'], ondelete='SET NULL')
+    op.add_column('workflow_steps', sa.Column('version_id', sa.Uuid(), nullable=True))
+    op.create_index(op.f('ix_workflow_steps_version_id'), 'workflow_steps', ['version_id'], unique=False)
+    op.create_foreign_key('fk_workflow_steps_version_id', 'workflow_steps', 'workflow_versions', ['version_id'], ['id'], ondelete='CASCADE')
+    op.add_column('workflow_requests', sa.Column('workflow_version_id', sa.Uuid(), nullable=True))
+    op.create_index(op.f('ix_workflow_requests_workflow_version_id'), 'workflow_requests', ['workflow_version_id'], unique=False)
+    op.create_foreign_key('fk_workflow_requests_workflow_version_id', 'workflow_requests', 'workflow_versions', ['workflow_version_id'], ['id'])
+    _backfill_versions()
+
+
+def _backfill_versions() -> None:
+    """
+    Publish each existing definition as its version 1 and pin the requests
+    already running on it, so only new edits create new versions.
+    """
+    bind = op.get_bind()
+    workflows = sa.table('workflows',
+        sa.column('id', sa.Uuid()), sa.column('created_by', sa.Uuid()),
+        sa.column('created_at', sa.DateTime()), sa.column('current_version_id', sa.Uuid()),
+    )
+    versions = sa.table('workflow_versions',
+        sa.column('id', sa.Uuid()), sa.column('workflow_id', sa.Uuid()),
+        sa.column('version_number', sa.Integer()), sa.column('notes', sa.Text()),
+        sa.column('published_by', sa.Uuid()), sa.column('published_at', sa.DateTime()),
+    )
+    steps = sa.table('workflow_steps',
+        sa.column('workflow_id', sa.Uuid()), sa.column('version_id', sa.Uuid()),
+    )
+    requests = sa.table('workflow_requests',
+        sa.column('workflow_id', sa.Uuid()), sa.column('workflow_version_id', sa.Uuid()),
+    )
+
+    with_steps = sa.select(workflows).where(
+        sa.exists().where(steps.c.workflow_id == workflows.c.id)
+    )
+    for wf in bind.execute(with_steps).mappings().all():
+        version_id = uuid.uuid4()
+        bind.execute(versions.insert().values(
+            id=version_id, workflow_id=wf['id'], version_number=1,
+            notes='Definition before versioning', published_by=wf['created_by'],
+            published_at=wf['created_at'],
+        ))
+        bind.execute(steps.update().where(steps.c.workflow_id == wf['id']).values(version_id=version_id))
+        bind.execute(requests.update().where(requests.c.workflow_id == wf['id']).values(workflow_version_id=version_id))
+        bind.execute(workflows.update().where(workflows.c.id == wf['id']).values(current_version_id=version_id))
+
+
+def downgrade() -> None:
+    op.drop_constraint('fk_workflow_requests_workflow_version_id', 'workflow_requests', type_='foreignkey')
+    op.drop_index(op.f('ix_workflow_requests_workflow_version_id'), table_name='workflow_requests')
+    op.drop_column('workflow_requests', 'workflow_version_id')
+    op.drop_constraint('fk_workflow_steps_version_id', 'workflow_steps', type_='foreignkey')
+    op.drop_index(op.f('ix_workflow_steps_version_id'), table_name='workflow_steps')
+    op.drop_column('workflow_steps', 'version_id')
+    op.drop_constraint('fk_workflows_current_version_id', 'workflows', type_='foreignkey')
+    op.drop_column('workflows', 'current_version_id')
+    op.drop_index(op.f('ix_workflow_versions_workflow_id'), table_name='workflow_versions')
+    op.drop_table('workflow_versions')
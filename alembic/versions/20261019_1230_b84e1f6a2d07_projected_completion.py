@@ -0,0 +1,27 @@
+"""projected_completion
+
+Revision ID: b84e1f6a2d07
+Revises: 3f7b2d9e6c51
+Create Date: 2026-10-19 12:30:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b84e1f6a2d07'
+down_revision = '3f7b2d9e6c51'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Open requests get a projection when their next step is activated
+    op.add_column('workflow_requests', sa.Column('projected_completion_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index('ix_workflow_requests_status_projection', 'workflow_requests', ['status', 'projected_completion_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_workflow_requests_status_projection', table_name='workflow_requests')
+    op.drop_column('workflow_requests', 'projected_completion_at')
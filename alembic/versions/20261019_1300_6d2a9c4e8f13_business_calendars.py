@@ -0,0 +1,42 @@
+"""business_calendars
+
+Revision ID: 6d2a9c4e8f13
+Revises: b84e1f6a2d07
+Create Date: 2026-10-19 13:00:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6d2a9c4e8f13'
+down_revision = 'b84e1f6a2d07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('business_calendars',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('timezone', sa.String(length=64), nullable=False),
+    sa.Column('working_hours', sa.JSON(), nullable=False),
+    sa.Column('holidays', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.add_column('workflows', sa.Column('calendar_id', sa.Uuid(), nullable=True))
+    op.create_foreign_key('fk_workflows_calendar_id', 'workflows', 'business_calendars', ['calendar_id'], ['id'], ondelete='SET NULL')
+    op.add_column('roles', sa.Column('calendar_id', sa.Uuid(), nullable=True))
+    op.create_foreign_key('fk_roles_calendar_id', 'roles', 'business_calendars', ['calendar_id'], ['id'], ondelete='SET NULL')
+
+
+def downgrade() -> None:
+    op.drop_constraint('fk_roles_calendar_id', 'roles', type_='foreignkey')
+    op.drop_column('roles', 'calendar_id')
+    op.drop_constraint('fk_workflows_calendar_id', 'workflows', type_='foreignkey')
+    op.drop_column('workflows', 'calendar_id')
+    op.drop_table('business_calendars')
@@ -0,0 +1,46 @@
+"""step_duration_stats
+
+Revision ID: 2e8c4a7b1f90
+Revises: 6d2a9c4e8f13
+Create Date: 2026-10-19 13:30:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2e8c4a7b1f90'
+down_revision = '6d2a9c4e8f13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('step_duration_stats',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('step_id', sa.Uuid(), nullable=False),
+    sa.Column('period_start', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('period_end', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('sample_count', sa.Integer(), nullable=False),
+    sa.Column('breach_count', sa.Integer(), nullable=False),
+    sa.Column('p50_hours', sa.Float(), nullable=False),
+    sa.Column('p90_hours', sa.Float(), nullable=False),
+    sa.Column('p99_hours', sa.Float(), nullable=False),
+    sa.Column('mean_hours', sa.Float(), nullable=False),
+    sa.Column('max_hours', sa.Float(), nullable=False),
+    sa.Column('sketch', sa.JSON(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['step_id'], ['workflow_steps.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_step_duration_stats_step_period', 'step_duration_stats', ['step_id', 'period_end'], unique=False)
+    op.create_index(op.f('ix_step_duration_stats_period_end'), 'step_duration_stats', ['period_end'], unique=False)
+    op.create_index(op.f('ix_request_steps_completed_at'), 'request_steps', ['completed_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_request_steps_completed_at'), table_name='request_steps')
+    op.drop_index(op.f('ix_step_duration_stats_period_end'), table_name='step_duration_stats')
+    op.drop_index('ix_step_duration_stats_step_period', table_name='step_duration_stats')
+    op.drop_table('step_duration_stats')
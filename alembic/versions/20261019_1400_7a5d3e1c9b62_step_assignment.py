@@ -0,0 +1,32 @@
+"""step_assignment
+
+Revision ID: 7a5d3e1c9b62
+Revises: 2e8c4a7b1f90
+Create Date: 2026-10-19 14:00:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a5d3e1c9b62'
+down_revision = '2e8c4a7b1f90'
+branch_labels = None
+depends_on = None
+
+assignmentstrategy = sa.Enum('ROUND_ROBIN', 'LEAST_LOADED', 'SKILL_WEIGHTED', name='assignmentstrategy')
+
+
+def upgrade() -> None:
+    assignmentstrategy.create(op.get_bind(), checkfirst=True)
+    op.add_column('workflow_steps', sa.Column('assignment_strategy', assignmentstrategy, nullable=True))
+    op.add_column('workflow_steps', sa.Column('assignment_skill', sa.String(length=100), nullable=True))
+    op.add_column('users', sa.Column('skills', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'skills')
+    op.drop_column('workflow_steps', 'assignment_skill')
+    op.drop_column('workflow_steps', 'assignment_strategy')
+    assignmentstrategy.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,41 @@
+"""delegations
+
+Revision ID: c3f9a1d7e284
+Revises: 7a5d3e1c9b62
+Create Date: 2026-10-19 14:30:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f9a1d7e284'
+down_revision = '7a5d3e1c9b62'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('delegations',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('delegator_id', sa.Uuid(), nullable=False),
+    sa.Column('delegate_id', sa.Uuid(), nullable=False),
+    sa.Column('starts_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('ends_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('reason', sa.Text(), nullable=True),
+    sa.Column('created_by', sa.Uuid(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['delegate_id'], ['users.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['delegator_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_delegations_delegator_window', 'delegations', ['delegator_id', 'starts_at', 'ends_at'], unique=False)
+    op.create_index('ix_delegations_delegate_window', 'delegations', ['delegate_id', 'starts_at', 'ends_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_delegations_delegate_window', table_name='delegations')
+    op.drop_index('ix_delegations_delegator_window', table_name='delegations')
+    op.drop_table('delegations')
@@ -0,0 +1,30 @@
+"""step_stats_unique_period
+
+Revision ID: 5b1e7d3a9c26
+Revises: c3f9a1d7e284
+Create Date: 2026-10-19 15:00:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b1e7d3a9c26'
+down_revision = 'c3f9a1d7e284'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keep the first of any period stored twice by overlapping runs
+    op.execute(
+        "DELETE FROM step_duration_stats a USING step_duration_stats b "
+        "WHERE a.step_id = b.step_id AND a.period_start = b.period_start "
+        "AND (a.computed_at, a.id) > (b.computed_at, b.id)"
+    )
+    op.create_unique_constraint('uq_step_duration_stats_step_period_start', 'step_duration_stats', ['step_id', 'period_start'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_step_duration_stats_step_period_start', 'step_duration_stats', type_='unique')
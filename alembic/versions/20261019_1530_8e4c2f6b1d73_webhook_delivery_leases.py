@@ -0,0 +1,24 @@
+"""webhook_delivery_leases
+
+Revision ID: 8e4c2f6b1d73
+Revises: 5b1e7d3a9c26
+Create Date: 2026-10-19 15:30:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e4c2f6b1d73'
+down_revision = '5b1e7d3a9c26'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('webhook_deliveries', sa.Column('lease_id', sa.Uuid(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('webhook_deliveries', 'lease_id')
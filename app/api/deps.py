@@ -3,20 +3,26 @@ Dependency injection utilities
 Responsibility: Provide reusable dependencies for route handlers
 """
 
-from typing import Generator, List, Optional
+import logging
+import uuid
+from typing import AsyncGenerator, Generator, List, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from pydantic import ValidationError
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 
 from app.core import security
 from app.core.config import settings
-from app.db.session import SessionLocal
-from app.db.models.user import User
+from app.db.session import SessionLocal, AsyncSessionLocal, read_your_writes
+from app.db.models.user import User, Role
 from app.schemas.token import TokenPayload
 from app.services.rbac import check_permissions
 
+logger = logging.getLogger("workflow-platform.auth")
+
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_PREFIX}/login/access-token"
 )
@@ -34,11 +40,53 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
-def get_current_user(
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency function to get an async database session.
+    Used by `async def` endpoints so that waiting on the database does not
+    pin a threadpool worker.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def _use_replica(token: str) -> bool:
+    """
+    Reads go to the replica unless none is configured or the caller
+    committed a write within the read-your-writes window.
+    """
+    if not settings.DATABASE_READ_URL:
+        return False
+    return not read_your_writes.is_recent(_decode_token_subject(token))
+
+
+def get_read_db(
     db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)
-) -> User:
+) -> Session:
     """
-    Validate JWT token and retrieve the current user.
+    Database session for read-only endpoints, routed to the read replica.
+    Shares the request's session, so declare it before get_current_user to
+    have the user lookup served by the replica as well.
+    """
+    if _use_replica(token):
+        db.info["read_only"] = True
+    return db
+
+
+async def get_async_read_db(
+    db: AsyncSession = Depends(get_async_db), token: str = Depends(reusable_oauth2)
+) -> AsyncSession:
+    """
+    Async variant of get_read_db.
+    """
+    if _use_replica(token):
+        db.info["read_only"] = True
+    return db
+
+
+def _decode_token_subject(token: str) -> uuid.UUID:
+    """
+    Decode a JWT and return the user id stored in its subject.
     """
     try:
         payload = jwt.decode(
@@ -51,21 +99,55 @@ def get_current_user(
             detail="Could not validate credentials",
         )
 
-    import uuid
-
     try:
-        user_id = uuid.UUID(token_data.sub)
-    except ValueError:
+        return uuid.UUID(token_data.sub)
+    except (TypeError, ValueError):
         raise HTTPException(status_code=401, detail="Invalid token payload")
 
-    import logging
-    logger = logging.getLogger("workflow-platform.auth")
-    
-    user = db.query(User).filter(User.id == user_id).first()
+
+def _ensure_active(user: Optional[User]) -> User:
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
+    return user
+
+
+def get_current_user(
+    db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)
+) -> User:
+    """
+    Validate JWT token and retrieve the current user.
+    """
+    user_id = _decode_token_subject(token)
+
+    user = _ensure_active(db.query(User).filter(User.id == user_id).first())
+    # Lets the session attribute committed writes to this user (read-your-writes)
+    db.info["user_id"] = user.id
+
+    role_names = [r.name for r in user.roles]
+    logger.info(f"Authenticated User: {user.email} | Roles: {role_names}")
+
+    return user
+
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db), token: str = Depends(reusable_oauth2)
+) -> User:
+    """
+    Async variant of get_current_user.
+    Roles and permissions are eagerly loaded, since RBAC checks run after the
+    query and lazy loading is not available on an AsyncSession.
+    """
+    user_id = _decode_token_subject(token)
+
+    result = await db.execute(
+        select(User)
+        .options(selectinload(User.roles).selectinload(Role.permissions))
+        .filter(User.id == user_id)
+    )
+    user = _ensure_active(result.scalars().first())
+    db.info["user_id"] = user.id
 
     role_names = [r.name for r in user.roles]
     logger.info(f"Authenticated User: {user.email} | Roles: {role_names}")
@@ -0,0 +1,63 @@
+"""
+Conditional GET helpers
+Responsibility: Build strong ETags from version columns and answer
+If-None-Match with 304 before a response body is built
+"""
+
+import hashlib
+from typing import Any, Dict, Optional
+from fastapi import Request, Response
+
+# Responses depend on the caller's token: browsers may keep them, shared
+# caches may not, and every reuse must be revalidated
+CACHE_CONTROL = "private, no-cache"
+# For representations that never change once created, e.g. a published
+# workflow version: reused without revalidation
+CACHE_CONTROL_IMMUTABLE = "private, max-age=31536000, immutable"
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Strong ETag over the values that determine a representation, e.g. a row's
+    id and version counter or updated_at.
+    """
+    raw = "|".join("" if p is None else str(p) for p in parts)
+    return '"' + hashlib.blake2b(raw.encode(), digest_size=16).hexdigest() + '"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison (RFC 9110 13.1.2)
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates
+
+
+def not_modified(
+    request: Request,
+    response: Response,
+    etag: str,
+    cache_control: str = CACHE_CONTROL,
+) -> Optional[Response]:
+    """
+    Return a 304 if the client already holds `etag`; otherwise put the ETag
+    on `response` and return None, so the endpoint carries on.
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
+def validators(response: Response) -> Dict[str, str]:
+    """
+    The ETag and Cache-Control set by not_modified(), for endpoints that
+    return a pre-built Response instead of `response`.
+    """
+    return {
+        name: response.headers[name]
+        for name in ("ETag", "Cache-Control")
+        if name in response.headers
+    }
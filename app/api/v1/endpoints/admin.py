@@ -1,10 +1,16 @@
-from fastapi import APIRouter, Depends
+from typing import Any, List, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from app.api import deps
 from app.db.models.user import User
 from app.db.models.workflow import Workflow
 from app.db.models.request import WorkflowRequest, RequestStep
+from app.db.pool_metrics import pool_snapshots
+from app.schemas.stats import StepDurationStatSchema, StepDurationSummary
+from app.services import post_commit
 from app.services.rbac import check_role
+from app.services.step_stats import StepStatistics
 
 router = APIRouter()
 
@@ -31,3 +37,73 @@ def get_admin_stats(
         "requests": total_requests,
         "sla_breaches": sla_breaches,
     }
+
+
+@router.get("/db-pool")
+def get_db_pool_stats(
+    current_user: User = Depends(deps.get_current_user),
+):
+    """
+    Connection pool checkout wait times and saturation for this worker process.
+    Restricted to Administrative roles.
+    """
+    check_role(current_user, "admin")
+    return pool_snapshots()
+
+
+@router.get("/post-commit")
+def get_post_commit_stats(
+    current_user: User = Depends(deps.get_current_user),
+):
+    """
+    Post-commit side effect executor depth, latency and backpressure for this
+    worker process. Restricted to Administrative roles.
+    """
+    check_role(current_user, "admin")
+    return post_commit.executor.metrics()
+
+
+@router.get("/step-stats", response_model=List[StepDurationSummary])
+def get_step_stats(
+    db: Session = Depends(deps.get_read_db),
+    workflow_id: Optional[UUID] = None,
+    days: Optional[int] = Query(None, ge=1, le=366),
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Duration percentiles (p50/p90/p99) and SLA breach rate per workflow step
+    over the last `days` days (STEP_STATS_SUMMARY_DAYS by default), for
+    tuning sla_hours. Restricted to Administrative roles.
+    """
+    check_role(current_user, "admin")
+    return StepStatistics.summary(db, workflow_id=workflow_id, days=days)
+
+
+@router.get("/step-stats/{step_id}", response_model=List[StepDurationStatSchema])
+def get_step_stats_history(
+    step_id: UUID,
+    db: Session = Depends(deps.get_read_db),
+    limit: int = Query(30, ge=1, le=365),
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    A step's aggregated periods, newest first, for trend comparisons.
+    Restricted to Administrative roles.
+    """
+    check_role(current_user, "admin")
+    return StepStatistics.history(db, step_id, limit=limit)
+
+
+@router.post("/step-stats/refresh")
+def refresh_step_stats(
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user),
+):
+    """
+    Aggregate the steps completed since the last run now, instead of waiting
+    for the periodic job. Restricted to Administrative roles.
+    """
+    check_role(current_user, "admin")
+    steps = StepStatistics.aggregate(db)
+    db.commit()
+    return {"steps": steps}
@@ -1,5 +1,7 @@
 from typing import Any, List, Optional
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from uuid import UUID
 
@@ -12,27 +14,29 @@ router = APIRouter()
 
 
 @router.get("/", response_model=List[AuditLogSchema])
-def read_audit_logs(
-    db: Session = Depends(deps.get_db),
+async def read_audit_logs(
+    db: AsyncSession = Depends(deps.get_async_read_db),
     skip: int = 0,
     limit: int = 100,
     request_id: Optional[UUID] = None,
-    current_user: User = Depends(deps.get_current_user),
+    current_user: User = Depends(deps.get_current_user_async),
 ) -> Any:
     """
     Retrieve audit logs.
     """
-    query = db.query(AuditLog)
+    query = select(AuditLog)
     if request_id:
         query = query.filter(AuditLog.request_id == request_id)
-    logs = query.order_by(AuditLog.timestamp.desc()).offset(skip).limit(limit).all()
-    return logs
+    result = await db.execute(
+        query.order_by(AuditLog.timestamp.desc()).offset(skip).limit(limit)
+    )
+    return result.scalars().all()
 
 
 @router.get("/{id}", response_model=AuditLogSchema)
 def read_audit_log(
     *,
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_read_db),
     id: UUID,
     current_user: User = Depends(deps.get_current_user),
 ) -> Any:
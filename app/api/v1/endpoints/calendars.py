@@ -0,0 +1,126 @@
+from typing import Any, List
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session, selectinload
+
+from app.api import deps
+from app.db.models.calendar import BusinessCalendar
+from app.db.models.user import Role, User
+from app.schemas.calendar import (
+    BusinessCalendarCreate,
+    BusinessCalendarUpdate,
+    BusinessCalendarSchema,
+)
+from app.services.calendar import calendars
+from app.services.rbac import check_role
+
+router = APIRouter()
+
+
+def _get_calendar(db: Session, calendar_id: UUID) -> BusinessCalendar:
+    calendar = (
+        db.query(BusinessCalendar).filter(BusinessCalendar.id == calendar_id).first()
+    )
+    if not calendar:
+        raise HTTPException(status_code=404, detail="Calendar not found")
+    return calendar
+
+
+def _get_roles(db: Session, role_ids: List[UUID]) -> List[Role]:
+    roles = db.query(Role).filter(Role.id.in_(role_ids)).all() if role_ids else []
+    if len(roles) != len(set(role_ids)):
+        raise HTTPException(status_code=404, detail="Role not found")
+    return roles
+
+
+@router.get("/", response_model=List[BusinessCalendarSchema])
+def read_calendars(
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    List business calendars.
+    """
+    return (
+        db.query(BusinessCalendar)
+        .options(selectinload(BusinessCalendar.roles))
+        .order_by(BusinessCalendar.name)
+        .all()
+    )
+
+
+@router.post("/", response_model=BusinessCalendarSchema, status_code=201)
+def create_calendar(
+    *,
+    db: Session = Depends(deps.get_db),
+    calendar_in: BusinessCalendarCreate,
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Create a business calendar and assign it to roles (teams). (Admin only)
+    """
+    check_role(current_user, "admin")
+    data = calendar_in.model_dump(mode="json", exclude={"role_ids"})
+    calendar = BusinessCalendar(**data)
+    calendar.roles = _get_roles(db, calendar_in.role_ids)
+    db.add(calendar)
+    db.commit()
+    db.refresh(calendar)
+    calendars.invalidate()
+    return calendar
+
+
+@router.get("/{calendar_id}", response_model=BusinessCalendarSchema)
+def read_calendar(
+    calendar_id: UUID,
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Get a business calendar by ID.
+    """
+    return _get_calendar(db, calendar_id)
+
+
+@router.patch("/{calendar_id}", response_model=BusinessCalendarSchema)
+def update_calendar(
+    *,
+    db: Session = Depends(deps.get_db),
+    calendar_id: UUID,
+    calendar_in: BusinessCalendarUpdate,
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Update a business calendar. Deadlines already set are kept; new ones
+    use the updated calendar. (Admin only)
+    """
+    check_role(current_user, "admin")
+    calendar = _get_calendar(db, calendar_id)
+    data = calendar_in.model_dump(mode="json", exclude_unset=True)
+    if "role_ids" in data:
+        calendar.roles = _get_roles(db, calendar_in.role_ids or [])
+        del data["role_ids"]
+    for field, value in data.items():
+        setattr(calendar, field, value)
+    db.commit()
+    db.refresh(calendar)
+    calendars.invalidate()
+    return calendar
+
+
+@router.delete("/{calendar_id}", status_code=204)
+def delete_calendar(
+    *,
+    db: Session = Depends(deps.get_db),
+    calendar_id: UUID,
+    current_user: User = Depends(deps.get_current_user),
+) -> None:
+    """
+    Delete a business calendar; its workflows and roles fall back to
+    round-the-clock SLA hours. (Admin only)
+    """
+    check_role(current_user, "admin")
+    calendar = _get_calendar(db, calendar_id)
+    db.delete(calendar)
+    db.commit()
+    calendars.invalidate()
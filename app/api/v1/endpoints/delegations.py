@@ -0,0 +1,89 @@
+from datetime import datetime
+from typing import Any, List, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.api import deps
+from app.db.models.delegation import Delegation
+from app.db.models.user import User
+from app.schemas.delegation import DelegationCreate, DelegationSchema
+from app.services.rbac import check_role
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[DelegationSchema])
+def read_delegations(
+    db: Session = Depends(deps.get_db),
+    user_id: Optional[UUID] = None,
+    include_past: bool = False,
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Delegations given or received by the current user, or by `user_id`
+    (Admin only). Ended ones are left out unless `include_past` is set.
+    """
+    if user_id is not None and user_id != current_user.id:
+        check_role(current_user, "admin")
+    user_id = user_id or current_user.id
+    query = db.query(Delegation).filter(
+        or_(Delegation.delegator_id == user_id, Delegation.delegate_id == user_id)
+    )
+    if not include_past:
+        query = query.filter(Delegation.ends_at > datetime.utcnow())
+    return query.order_by(Delegation.starts_at).all()
+
+
+@router.post("/", response_model=DelegationSchema, status_code=201)
+def create_delegation(
+    *,
+    db: Session = Depends(deps.get_db),
+    delegation_in: DelegationCreate,
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Hand the current user's new tasks to a delegate for a date range.
+    Admins may create a delegation on behalf of another user.
+    """
+    delegator_id = delegation_in.delegator_id or current_user.id
+    if delegator_id != current_user.id:
+        check_role(current_user, "admin")
+        if not db.query(User.id).filter(User.id == delegator_id).first():
+            raise HTTPException(status_code=404, detail="User not found")
+    if delegation_in.delegate_id == delegator_id:
+        raise HTTPException(status_code=422, detail="Cannot delegate to yourself")
+    delegate = db.query(User).filter(User.id == delegation_in.delegate_id).first()
+    if not delegate or not delegate.is_active:
+        raise HTTPException(status_code=404, detail="Delegate not found")
+
+    delegation = Delegation(
+        **delegation_in.model_dump(exclude={"delegator_id"}),
+        delegator_id=delegator_id,
+        created_by=current_user.id,
+    )
+    db.add(delegation)
+    db.commit()
+    db.refresh(delegation)
+    return delegation
+
+
+@router.delete("/{delegation_id}", status_code=204)
+def delete_delegation(
+    *,
+    db: Session = Depends(deps.get_db),
+    delegation_id: UUID,
+    current_user: User = Depends(deps.get_current_user),
+) -> None:
+    """
+    Cancel a delegation (its delegator or an admin). Tasks already assigned
+    to the delegate stay with them.
+    """
+    delegation = db.query(Delegation).filter(Delegation.id == delegation_id).first()
+    if not delegation:
+        raise HTTPException(status_code=404, detail="Delegation not found")
+    if delegation.delegator_id != current_user.id:
+        check_role(current_user, "admin")
+    db.delete(delegation)
+    db.commit()
@@ -1,36 +1,53 @@
-from typing import Any, List, Dict
-from fastapi import APIRouter, Depends, HTTPException, status, Body
-from sqlalchemy.orm import Session
+import json
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, List, Dict, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Body
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, contains_eager
 from uuid import UUID
 
 from app.api import deps
+from app.api.etag import make_etag, not_modified
+from app.core.config import settings
 from app.db.models.user import User
 from app.schemas.request import (
+    BulkDecisionCreate,
+    BulkDecisionResult,
     WorkflowRequestCreate,
+    WorkflowRequestBulkCreate,
+    WorkflowRequestBulkResult,
     WorkflowRequestSchema,
+    RequestEventSchema,
     RequestStepSchema,
 )
+from app.services import event_bus
+from app.services.delegation import DelegationService
+from app.services.event_store import EventStore
 from app.services.workflow_engine import WorkflowEngine
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[WorkflowRequestSchema])
-def read_requests(
-    db: Session = Depends(deps.get_db),
+async def read_requests(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(deps.get_async_read_db),
     skip: int = 0,
     limit: int = 100,
     status: str = None,
     requester_id: str = None,
-    current_user: User = Depends(deps.get_current_user),
+    current_user: User = Depends(deps.get_current_user_async),
 ) -> Any:
     """
     Retrieve workflow requests with optional filtering.
     """
     from app.db.models.request import WorkflowRequest, RequestStatus
 
-    query = db.query(WorkflowRequest)
-    
+    query = select(WorkflowRequest)
+
     # Filter by status if provided
     if status:
         try:
@@ -38,7 +55,7 @@ def read_requests(
             query = query.filter(WorkflowRequest.status == status_enum)
         except KeyError:
             pass  # Invalid status, ignore filter
-    
+
     # Filter by requester if provided
     if requester_id:
         try:
@@ -47,78 +64,99 @@ def read_requests(
             query = query.filter(WorkflowRequest.requester_id == req_uuid)
         except ValueError:
             pass  # Invalid UUID, ignore filter
-    
-    requests = query.order_by(WorkflowRequest.created_at.desc()).offset(skip).limit(limit).all()
-    return requests
+
+    # Every UPDATE bumps a request's version, so count + sum(version) changes
+    # whenever any row matching the filters is added, changed or removed
+    summary = await db.execute(
+        query.with_only_columns(
+            func.count(WorkflowRequest.id),
+            func.sum(WorkflowRequest.version),
+            func.max(WorkflowRequest.updated_at),
+        )
+    )
+    etag = make_etag("requests", *summary.one(), status, requester_id, skip, limit)
+    if cached := not_modified(request, response, etag):
+        return cached
+
+    result = await db.execute(
+        query.options(*WorkflowRequestSchema.loader_options())
+        .order_by(WorkflowRequest.created_at.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    return result.scalars().all()
 
 
 @router.get("/my-tasks", response_model=List[Dict[str, Any]])
-def get_my_tasks(
-    db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+async def get_my_tasks(
+    db: AsyncSession = Depends(deps.get_async_read_db),
+    current_user: User = Depends(deps.get_current_user_async),
 ) -> Any:
     """
     Get pending workflow steps assigned to the current user.
-    Returns tasks where the user has the required role/permission.
+    Returns tasks where the user has the required role/permission, minus
+    those a step's assignment strategy gave to another member. While the
+    user stands in for someone through a delegation, that person's tasks
+    (assigned to them, or open to them) are included, judged on that
+    person's rights alone.
     """
     from app.db.models.request import WorkflowRequest, RequestStep, StepStatus
-    from app.db.models.workflow import WorkflowStep
-    
-    # Find all pending steps where user has required role or permission
-    user_role_ids = {role.id for role in current_user.roles}
-    user_permission_ids = set()
-    is_admin = False
-    
-    for role in current_user.roles:
-        if role.name.lower() == "admin":
-            is_admin = True
-        for perm in role.permissions:
-            user_permission_ids.add(perm.id)
-    
-    # Get pending request steps
-    pending_steps = (
-        db.query(RequestStep)
+    from app.db.models.workflow import WorkflowStep, StepType
+
+    principal = await db.run_sync(
+        lambda session: WorkflowEngine._principal(current_user, session)
+    )
+
+    # Get pending request steps, with the step definition, request and
+    # workflow loaded in the same round trip (no lazy loads on AsyncSession)
+    result = await db.execute(
+        select(RequestStep)
         .join(WorkflowStep, RequestStep.step_id == WorkflowStep.id)
         .join(WorkflowRequest, RequestStep.request_id == WorkflowRequest.id)
+        .options(
+            contains_eager(RequestStep.step),
+            contains_eager(RequestStep.request).joinedload(WorkflowRequest.workflow),
+        )
         .filter(
             RequestStep.status == StepStatus.PENDING,
             RequestStep.completed_at == None,
+            # Automatic steps are run by workers, not people
+            WorkflowStep.step_type == StepType.HUMAN,
         )
-        .all()
     )
-    
+    pending_steps = result.scalars().unique().all()
+
     # Filter by RBAC
     tasks = []
     for step in pending_steps:
         step_def = step.step
-        
-        # Admin Override: Bypass checks if user is admin
-        if not is_admin:
-            # Check if user has required role
-            if step_def.required_role_id and step_def.required_role_id not in user_role_ids:
-                continue
-            # Check if user has required permission
-            if step_def.required_permission_id and step_def.required_permission_id not in user_permission_ids:
-                continue
-        
+
+        # Admin Override: Bypass checks if user is admin; otherwise the
+        # user's own or one covered user's role/permission must suffice
+        if not principal["is_admin"] and (
+            WorkflowEngine._acting_as(principal, step, inbox=True) is None
+        ):
+            continue
+
         tasks.append({
             "request_id": str(step.request_id),
             "request_step_id": str(step.id),
             "workflow_name": step.request.workflow.name,
             "step_name": step_def.name,
             "step_description": step_def.description,
+            "assigned_to": str(step.assigned_to) if step.assigned_to else None,
             "deadline": step.deadline.isoformat() if step.deadline else None,
             "is_sla_breached": step.is_sla_breached,
             "request_data": step.request.request_data,
             "created_at": step.request.created_at.isoformat(),
         })
-    
+
     return tasks
 
 
 @router.get("/stats", response_model=Dict[str, int])
 def get_dashboard_stats(
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_read_db),
     current_user: User = Depends(deps.get_current_user),
 ) -> Any:
     """
@@ -139,6 +177,81 @@ def get_dashboard_stats(
     }
 
 
+@router.get("/at-risk", response_model=List[WorkflowRequestSchema])
+def read_at_risk_requests(
+    db: Session = Depends(deps.get_read_db),
+    within_hours: Optional[int] = None,
+    limit: int = 100,
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Open requests whose projected completion falls within `within_hours`
+    (default SLA_AT_RISK_HOURS) or has already passed, soonest first.
+    One range scan over (status, projected_completion_at).
+    """
+    from app.db.models.request import WorkflowRequest, RequestStatus
+
+    horizon = datetime.utcnow() + timedelta(
+        hours=settings.SLA_AT_RISK_HOURS if within_hours is None else within_hours
+    )
+    return (
+        db.query(WorkflowRequest)
+        .options(*WorkflowRequestSchema.loader_options())
+        .filter(
+            WorkflowRequest.status == RequestStatus.IN_PROGRESS,
+            WorkflowRequest.projected_completion_at <= horizon,
+        )
+        .order_by(WorkflowRequest.projected_completion_at)
+        .limit(limit)
+        .all()
+    )
+
+
+@router.get("/stream")
+async def stream_updates(
+    request: Request,
+    db: AsyncSession = Depends(deps.get_async_read_db),
+    current_user: User = Depends(deps.get_current_user_async),
+) -> StreamingResponse:
+    """
+    Server-sent events replacing polling of /my-tasks and /stats:
+    task_added / task_removed for the user's inbox, request_updated for
+    requests they started, and stats_delta for the dashboard counters.
+    The inbox includes that of anyone the user stands in for when they
+    connect. A "resync" event means updates were dropped; re-fetch and
+    carry on.
+    """
+    covered = await db.run_sync(DelegationService.covered, current_user.id)
+    topics = {
+        event_bus.user_topic(current_user.id),
+        event_bus.OPEN_TASKS,
+        event_bus.STATS,
+        *event_bus.inbox_topics(current_user),
+    }
+    for user in covered:
+        topics.update(event_bus.inbox_topics(user))
+    if any(role.name.lower() == "admin" for role in current_user.roles):
+        topics.add(event_bus.ALL_TASKS)
+
+    async def events() -> AsyncIterator[str]:
+        async with event_bus.bus.subscribe(topics) as subscription:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                message = await subscription.get(
+                    settings.EVENT_STREAM_HEARTBEAT_SECONDS
+                )
+                if message is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {message['type']}\ndata: {json.dumps(message)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/", response_model=WorkflowRequestSchema)
 def start_workflow(
     *,
@@ -157,6 +270,53 @@ def start_workflow(
     return request
 
 
+@router.post("/bulk", response_model=WorkflowRequestBulkResult)
+def start_workflows_bulk(
+    *,
+    db: Session = Depends(deps.get_db),
+    bulk_in: WorkflowRequestBulkCreate,
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Initiate many requests for one workflow in a single transaction.
+    """
+    request_ids = WorkflowEngine.start_workflows_bulk(
+        db,
+        bulk_in.workflow_id,
+        current_user.id,
+        [item.request_data or {} for item in bulk_in.items],
+    )
+    db.commit()
+    return {
+        "workflow_id": bulk_in.workflow_id,
+        "created": len(request_ids),
+        "request_ids": request_ids,
+    }
+
+
+@router.post("/bulk/process", response_model=BulkDecisionResult)
+def process_request_steps_bulk(
+    *,
+    db: Session = Depends(deps.get_db),
+    bulk_in: BulkDecisionCreate,
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Apply a batch of decisions on behalf of the current user in one commit.
+    Failed items are reported per request without aborting the others.
+    """
+    results = WorkflowEngine.process_steps_bulk(
+        db, current_user, [d.model_dump() for d in bulk_in.decisions]
+    )
+    db.commit()
+    failed = sum(1 for r in results if not r["success"])
+    return {
+        "processed": len(results) - failed,
+        "failed": failed,
+        "results": results,
+    }
+
+
 @router.post("/{id}/process", response_model=WorkflowRequestSchema)
 def process_request_step(
     *,
@@ -164,21 +324,56 @@ def process_request_step(
     id: UUID,
     outcome: str = Body(..., embed=True),
     context: Dict[str, Any] = Body(None, embed=True),
+    expected_version: Optional[int] = Body(None, embed=True),
+    request_step_id: Optional[UUID] = Body(None, embed=True),
     current_user: User = Depends(deps.get_current_user),
 ) -> Any:
     """
     Process the current step of a workflow request.
+    Returns 409 if another decision on the same request is in flight, or if
+    `expected_version` no longer matches. `request_step_id` picks the branch
+    to decide while parallel steps are open.
     """
-    request = WorkflowEngine.process_step(db, id, current_user, outcome, context)
+    request = WorkflowEngine.process_step(
+        db,
+        id,
+        current_user,
+        outcome,
+        context,
+        expected_version=expected_version,
+        request_step_id=request_step_id,
+    )
     db.commit()
     db.refresh(request)
     return request
 
 
+@router.get("/{id}/timeline", response_model=List[RequestEventSchema])
+def read_request_timeline(
+    *,
+    db: Session = Depends(deps.get_read_db),
+    id: UUID,
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Get the ordered event stream of a workflow request.
+    """
+    from app.db.models.request import WorkflowRequest
+
+    events = EventStore.timeline(db, id)
+    if not events and not db.query(
+        db.query(WorkflowRequest).filter(WorkflowRequest.id == id).exists()
+    ).scalar():
+        raise HTTPException(status_code=404, detail="Request not found")
+    return events
+
+
 @router.get("/{id}", response_model=WorkflowRequestSchema)
 def read_request(
     *,
-    db: Session = Depends(deps.get_db),
+    http_request: Request,
+    response: Response,
+    db: Session = Depends(deps.get_read_db),
     id: UUID,
     current_user: User = Depends(deps.get_current_user),
 ) -> Any:
@@ -187,7 +382,23 @@ def read_request(
     """
     from app.db.models.request import WorkflowRequest
 
-    request = db.query(WorkflowRequest).filter(WorkflowRequest.id == id).first()
+    version = (
+        db.query(WorkflowRequest.version).filter(WorkflowRequest.id == id).scalar()
+    )
+    if version is None:
+        raise HTTPException(status_code=404, detail="Request not found")
+    etag = make_etag("request", id, version)
+    if cached := not_modified(http_request, response, etag):
+        return cached
+
+    request = (
+        db.query(WorkflowRequest)
+        .options(*WorkflowRequestSchema.loader_options())
+        .filter(WorkflowRequest.id == id)
+        .first()
+    )
     if not request:
         raise HTTPException(status_code=404, detail="Request not found")
+    # Changed between the two reads: tag what is actually sent
+    response.headers["ETag"] = make_etag("request", id, request.version)
     return request
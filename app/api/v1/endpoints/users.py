@@ -1,13 +1,16 @@
 from typing import Any, List
-from fastapi import APIRouter, Body, Depends, HTTPException, status
+from uuid import UUID
+from fastapi import APIRouter, Body, Depends, HTTPException, Request, Response, status
 from fastapi.encoders import jsonable_encoder
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from pydantic import EmailStr
 
 from app.api import deps
+from app.api.etag import make_etag, not_modified
 from app.core import security
 from app.db.models.user import User, Role
-from app.schemas.user import UserCreate, UserUpdate, UserSchema, UserWithRolesSchema
+from app.schemas.user import UserCreate, UserUpdate, UserSchema, UserSkills, UserWithRolesSchema
 
 from app.services.rbac import check_permissions, check_role
 
@@ -16,6 +19,8 @@ router = APIRouter()
 
 @router.get("/", response_model=List[UserSchema])
 def read_users(
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
@@ -25,6 +30,10 @@ def read_users(
     Retrieve users. (Admin only)
     """
     check_role(current_user, "admin")
+    count, last_update = db.query(func.count(User.id), func.max(User.updated_at)).one()
+    etag = make_etag("users", count, last_update, skip, limit)
+    if cached := not_modified(request, response, etag):
+        return cached
     users = db.query(User).offset(skip).limit(limit).all()
     return users
 
@@ -64,12 +73,25 @@ def create_user(
 
 @router.get("/me", response_model=UserWithRolesSchema)
 def read_user_me(
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
 ) -> Any:
     """
     Get current user.
     """
+    # Role and permission changes don't touch users.updated_at, so the
+    # (already loaded) grants are part of the tag
+    grants = sorted(
+        (role.id.hex, role.name, role.description or "", sorted(
+            (p.id.hex, p.name, p.resource, p.action) for p in role.permissions
+        ))
+        for role in current_user.roles
+    )
+    etag = make_etag("me", current_user.id, current_user.updated_at, grants)
+    if cached := not_modified(request, response, etag):
+        return cached
     return current_user
 
 
@@ -135,6 +157,29 @@ def read_user_by_id(
     return user
 
 
+@router.put("/{user_id}/skills", response_model=UserSchema)
+def update_user_skills(
+    *,
+    db: Session = Depends(deps.get_db),
+    user_id: UUID,
+    skills: UserSkills,
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Replace a user's skill weights for skill-weighted assignment. (Admin only)
+    """
+    check_role(current_user, "admin")
+    if any(weight < 0 for weight in skills.values()):
+        raise HTTPException(status_code=422, detail="Skill weights must not be negative")
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    user.skills = skills
+    db.commit()
+    db.refresh(user)
+    return user
+
+
 # TODO: Add open registration endpoint if needed, or keep it admin-only.
 # For now, adding a non-protected creation endpoint for initial setup/testing in dev
 # might be useful, but let's stick to secure by default.
@@ -0,0 +1,129 @@
+from typing import Any, List, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.api import deps
+from app.db.models.user import User
+from app.db.models.webhook import WebhookSubscription, WebhookDelivery, DeliveryStatus
+from app.schemas.webhook import (
+    WebhookSubscriptionCreate,
+    WebhookSubscriptionUpdate,
+    WebhookSubscriptionSchema,
+    WebhookDeliverySchema,
+)
+from app.services.rbac import check_role
+from app.services.webhooks import WebhookService
+
+router = APIRouter()
+
+
+def _get_subscription(db: Session, subscription_id: UUID) -> WebhookSubscription:
+    subscription = (
+        db.query(WebhookSubscription)
+        .filter(WebhookSubscription.id == subscription_id)
+        .first()
+    )
+    if not subscription:
+        raise HTTPException(status_code=404, detail="Webhook subscription not found")
+    return subscription
+
+
+@router.get("/", response_model=List[WebhookSubscriptionSchema])
+def read_subscriptions(
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    List webhook subscriptions. (Admin only)
+    """
+    check_role(current_user, "admin")
+    return db.query(WebhookSubscription).order_by(WebhookSubscription.created_at).all()
+
+
+@router.post("/", response_model=WebhookSubscriptionSchema, status_code=201)
+def create_subscription(
+    *,
+    db: Session = Depends(deps.get_db),
+    subscription_in: WebhookSubscriptionCreate,
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Subscribe an endpoint to workflow events. (Admin only)
+    """
+    check_role(current_user, "admin")
+    subscription = WebhookSubscription(
+        **subscription_in.model_dump(), created_by=current_user.id
+    )
+    db.add(subscription)
+    db.commit()
+    db.refresh(subscription)
+    WebhookService.invalidate_cache()
+    return subscription
+
+
+@router.patch("/{subscription_id}", response_model=WebhookSubscriptionSchema)
+def update_subscription(
+    *,
+    db: Session = Depends(deps.get_db),
+    subscription_id: UUID,
+    subscription_in: WebhookSubscriptionUpdate,
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Update a webhook subscription. (Admin only)
+    """
+    check_role(current_user, "admin")
+    subscription = _get_subscription(db, subscription_id)
+    for field, value in subscription_in.model_dump(exclude_unset=True).items():
+        setattr(subscription, field, value)
+    db.commit()
+    db.refresh(subscription)
+    WebhookService.invalidate_cache()
+    return subscription
+
+
+@router.delete("/{subscription_id}", status_code=204)
+def delete_subscription(
+    *,
+    db: Session = Depends(deps.get_db),
+    subscription_id: UUID,
+    current_user: User = Depends(deps.get_current_user),
+) -> None:
+    """
+    Delete a webhook subscription and its delivery history. (Admin only)
+    """
+    check_role(current_user, "admin")
+    subscription = _get_subscription(db, subscription_id)
+    db.delete(subscription)
+    db.commit()
+    WebhookService.invalidate_cache()
+
+
+@router.get(
+    "/{subscription_id}/deliveries", response_model=List[WebhookDeliverySchema]
+)
+def read_deliveries(
+    subscription_id: UUID,
+    status: Optional[DeliveryStatus] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Recent deliveries to a subscription, newest first. (Admin only)
+    """
+    check_role(current_user, "admin")
+    _get_subscription(db, subscription_id)
+    query = db.query(WebhookDelivery).filter(
+        WebhookDelivery.subscription_id == subscription_id
+    )
+    if status is not None:
+        query = query.filter(WebhookDelivery.status == status)
+    return (
+        query.order_by(WebhookDelivery.created_at.desc())
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
@@ -7,7 +7,11 @@ from app.api import deps
 from app.db.models.user import User
 from app.services.workflow_engine import WorkflowEngine
 from app.schemas.request import WorkflowRequestSchema
-from app.core.exceptions import WorkflowEngineError, PermissionDeniedError
+from app.core.exceptions import (
+    ConcurrencyConflictError,
+    WorkflowEngineError,
+    PermissionDeniedError,
+)
 import logging
 
 logger = logging.getLogger(__name__)
@@ -25,7 +29,8 @@ def make_decision(
 ) -> Any:
     """
     Execute a decision on a workflow instance step.
-    Payload: { action: "approve" | "reject" | "execute", comment: string }
+    Payload: { action: "approve" | "reject" | "execute", comment: string,
+               request_step_id?: string (branch to decide when several are open) }
     """
     try:
         action = payload.get("action")
@@ -40,11 +45,22 @@ def make_decision(
         # Prepare context
         context = {"comment": comment, "action": action}
         
+        request_step_id = payload.get("request_step_id")
+        if request_step_id:
+            try:
+                request_step_id = UUID(str(request_step_id))
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid request_step_id")
+
         # process_step logic handles RBAC and state transitions
-        request = WorkflowEngine.process_step(db, id, current_user, outcome, context)
+        request = WorkflowEngine.process_step(
+            db, id, current_user, outcome, context, request_step_id=request_step_id or None
+        )
         db.commit()
         db.refresh(request)
         return request
+    except ConcurrencyConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except (WorkflowEngineError, PermissionDeniedError) as e:
         logger.warning(f"Workflow execution failed: {e}")
         raise HTTPException(status_code=400, detail=str(e))
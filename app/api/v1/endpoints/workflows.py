@@ -1,11 +1,22 @@
 from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status, Response
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Response
 from sqlalchemy.orm import Session
 from uuid import UUID
 
 from app.api import deps
+from app.api.etag import CACHE_CONTROL_IMMUTABLE, make_etag, not_modified, validators
 from app.db.models.user import User
-from app.schemas.workflow import WorkflowCreate, WorkflowSchema, WorkflowUpdate
+from app.db.models.workflow import Workflow, WorkflowVersion
+from app.schemas.workflow import (
+    WorkflowCreate,
+    WorkflowImport,
+    WorkflowImportResult,
+    WorkflowSchema,
+    WorkflowUpdate,
+    WorkflowVersionCreate,
+    WorkflowVersionSchema,
+    WorkflowVersionSummary,
+)
 from app.services.workflow_service import WorkflowService
 from app.services.rbac import check_role
 
@@ -14,6 +25,8 @@ router = APIRouter()
 
 @router.get("/", response_model=List[WorkflowSchema])
 def read_workflows(
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
@@ -21,9 +34,23 @@ def read_workflows(
 ) -> Any:
     """
     Retrieve workflows.
+    One (id, updated_at) query per call; the definitions themselves come
+    from the definition cache as pre-serialized JSON.
     """
-    workflows = WorkflowService.list_workflows(db, skip=skip, limit=limit)
-    return workflows
+    keys = WorkflowService.list_definition_keys(db, skip=skip, limit=limit)
+    etag = make_etag("workflows", skip, limit, *(part for key in keys for part in key))
+    if cached := not_modified(request, response, etag):
+        return cached
+
+    entries = WorkflowService.serialized_definitions(db, keys)
+    emitted = [key for key, _ in entries]
+    if emitted != keys:
+        # A workflow changed between the two reads; validate what is served
+        response.headers["ETag"] = make_etag(
+            "workflows", skip, limit, *(part for key in emitted for part in key)
+        )
+    body = b"[" + b",".join(body for _, body in entries) + b"]"
+    return Response(content=body, media_type="application/json", headers=validators(response))
 
 
 @router.post("/", response_model=WorkflowSchema)
@@ -43,17 +70,138 @@ def create_workflow(
     return workflow
 
 
+@router.post("/import", response_model=WorkflowImportResult)
+def import_workflows(
+    *,
+    db: Session = Depends(deps.get_db),
+    import_in: WorkflowImport,
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Create many workflows in a single transaction (Admin only).
+    """
+    check_role(current_user, "admin")
+    workflow_ids = WorkflowService.import_workflows(
+        db, [w.model_dump() for w in import_in.workflows], current_user.id
+    )
+    db.commit()
+    return {"created": len(workflow_ids), "workflow_ids": workflow_ids}
+
+
 @router.get("/{id}", response_model=WorkflowSchema)
 def read_workflow(
     *,
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
     id: UUID,
     current_user: User = Depends(deps.get_current_user),
 ) -> Any:
     """
     Get workflow by ID.
+    Revalidation costs one single-column lookup; steps and transitions are
+    only loaded when the definition is not in the definition cache.
+    """
+    last_update = (
+        db.query(Workflow.updated_at).filter(Workflow.id == id).scalar()
+    )
+    if last_update is not None:
+        etag = make_etag("workflow", id, last_update)
+        if cached := not_modified(request, response, etag):
+            return cached
+        entries = WorkflowService.serialized_definitions(db, [(id, last_update)])
+        if entries:
+            (_, updated_at), body = entries[0]
+            if updated_at != last_update:
+                response.headers["ETag"] = make_etag("workflow", id, updated_at)
+            return Response(
+                content=body, media_type="application/json", headers=validators(response)
+            )
+    return WorkflowService.get_workflow(db, id, WorkflowSchema.loader_options())
+
+
+@router.put("/{id}", response_model=WorkflowSchema)
+def update_workflow(
+    *,
+    db: Session = Depends(deps.get_db),
+    id: UUID,
+    workflow_in: WorkflowUpdate,
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Update a workflow's name, description or active flag (Admin only).
+    Steps and transitions change by publishing a new version.
+    """
+    check_role(current_user, "admin")
+    WorkflowService.update_workflow(db, id, workflow_in.model_dump(exclude_unset=True))
+    return WorkflowService.get_workflow(db, id, WorkflowSchema.loader_options())
+
+
+@router.post(
+    "/{id}/versions", response_model=WorkflowVersionSchema, status_code=201
+)
+def publish_version(
+    *,
+    db: Session = Depends(deps.get_db),
+    id: UUID,
+    version_in: WorkflowVersionCreate,
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Publish a new version of a workflow's steps and transitions (Admin only).
+    New requests start on it; running requests finish on their own version.
     """
-    return WorkflowService.get_workflow(db, id)
+    check_role(current_user, "admin")
+    version = WorkflowService.publish_version(
+        db, id, version_in.model_dump(), current_user.id
+    )
+    return WorkflowService.get_version(
+        db, id, version.version_number, WorkflowVersionSchema.loader_options()
+    )
+
+
+@router.get("/{id}/versions", response_model=List[WorkflowVersionSummary])
+def read_versions(
+    *,
+    db: Session = Depends(deps.get_db),
+    id: UUID,
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    List the published versions of a workflow, oldest first.
+    """
+    return WorkflowService.list_versions(db, id)
+
+
+@router.get("/{id}/versions/{version_number}", response_model=WorkflowVersionSchema)
+def read_version(
+    *,
+    request: Request,
+    response: Response,
+    db: Session = Depends(deps.get_db),
+    id: UUID,
+    version_number: int,
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Get one published version. Versions never change, so the response is
+    cacheable as immutable and revalidation only looks up its id.
+    """
+    version_id = (
+        db.query(WorkflowVersion.id)
+        .filter(
+            WorkflowVersion.workflow_id == id,
+            WorkflowVersion.version_number == version_number,
+        )
+        .scalar()
+    )
+    if version_id is not None:
+        etag = make_etag("workflow-version", version_id)
+        if cached := not_modified(request, response, etag, CACHE_CONTROL_IMMUTABLE):
+            return cached
+    return WorkflowService.get_version(
+        db, id, version_number, WorkflowVersionSchema.loader_options()
+    )
 
 
 @router.delete("/{id}", status_code=204, response_class=Response, response_model=None)
@@ -65,6 +213,7 @@ def delete_workflow(
 ) -> Any:
     """
     Delete a workflow (Admin only).
+    A workflow that already has requests is deactivated instead.
     """
     check_role(current_user, "admin")
     WorkflowService.delete_workflow(db, id)
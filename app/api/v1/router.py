@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import workflows, requests, users, roles, audit, admin, login, permissions, workflow_instances
+from app.api.v1.endpoints import workflows, requests, users, roles, audit, admin, login, permissions, workflow_instances, webhooks, calendars, delegations
 
 api_router = APIRouter()
 
@@ -11,4 +11,7 @@ api_router.include_router(roles.router, prefix="/roles", tags=["Roles"])
 api_router.include_router(permissions.router, prefix="/permissions", tags=["Permissions"])
 api_router.include_router(audit.router, prefix="/audit", tags=["Audit"])
 api_router.include_router(admin.router, prefix="/admin", tags=["Admin"])
+api_router.include_router(webhooks.router, prefix="/webhooks", tags=["Webhooks"])
+api_router.include_router(calendars.router, prefix="/calendars", tags=["Calendars"])
+api_router.include_router(delegations.router, prefix="/delegations", tags=["Delegations"])
 api_router.include_router(login.router, tags=["Login"])
@@ -13,13 +13,27 @@ celery_app = Celery(
     "workflow_platform",
     broker=settings.CELERY_BROKER_URL,
     backend=settings.CELERY_RESULT_BACKEND,
-    include=["app.tasks.sla", "app.tasks.notifications"]
+    include=[
+        "app.tasks.sla",
+        "app.tasks.notifications",
+        "app.tasks.automation",
+        "app.tasks.outbox",
+        "app.tasks.webhooks",
+        "app.tasks.stats",
+        "app.tasks.assignment",
+    ]
 )
 
 # Optional configuration
 # celery_app.conf.timezone = 'UTC'
 # celery_app.conf.task_track_started = True
 
+# Automatic steps get their own queue so they are not stuck behind e-mails.
+# Every queue here needs a worker: see docker-compose.yml and DEPLOYMENT.md
+celery_app.conf.task_routes = {
+    "app.tasks.automation.*": {"queue": "automation"},
+}
+
 # Automated discovery is kept as a backup for future modules following standard naming
 celery_app.autodiscover_tasks(["app.tasks"])
 
@@ -29,4 +43,25 @@ celery_app.conf.beat_schedule = {
         "task": "app.tasks.sla.check_all_slas",
         "schedule": 300.0,  # Every 5 minutes
     },
+    # Fallback relay; run scripts/run_outbox_relay.py for lower latency
+    "relay-outbox-every-2-seconds": {
+        "task": "app.tasks.outbox.relay_outbox",
+        "schedule": 2.0,
+    },
+    "deliver-webhooks-every-2-seconds": {
+        "task": "app.tasks.webhooks.deliver_webhooks",
+        "schedule": 2.0,
+    },
+    "purge-outbox-hourly": {
+        "task": "app.tasks.outbox.purge_outbox",
+        "schedule": 3600.0,
+    },
+    "reconcile-assignee-load-every-5-minutes": {
+        "task": "app.tasks.assignment.reconcile_assignee_load",
+        "schedule": 300.0,
+    },
+    "aggregate-step-durations-nightly": {
+        "task": "app.tasks.stats.aggregate_step_durations",
+        "schedule": crontab(hour=2, minute=0),
+    },
 }
@@ -1,9 +1,12 @@
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
+from sqlalchemy.orm.exc import StaleDataError
 from app.core.exceptions import (
+    ConcurrencyConflictError,
     InvalidStateTransitionError,
     PermissionDeniedError,
     ResourceNotFoundError,
+    WorkflowValidationError,
 )
 
 
@@ -52,6 +55,34 @@ def setup_exception_handlers(app: FastAPI):
             },
         )
 
+    @app.exception_handler(WorkflowValidationError)
+    async def workflow_validation_exception_handler(
+        request: Request, exc: WorkflowValidationError
+    ):
+        return JSONResponse(
+            status_code=422,
+            content={
+                "error": "INVALID_WORKFLOW_DEFINITION",
+                "detail": str(exc),
+                "issues": [issue._asdict() for issue in exc.issues],
+                "type": "validation_error",
+            },
+        )
+
+    @app.exception_handler(ConcurrencyConflictError)
+    @app.exception_handler(StaleDataError)
+    async def concurrency_conflict_exception_handler(request: Request, exc: Exception):
+        return JSONResponse(
+            status_code=409,
+            content={
+                "error": "CONCURRENT_MODIFICATION",
+                "detail": str(exc)
+                if isinstance(exc, ConcurrencyConflictError)
+                else "Resource was modified concurrently. Reload and retry.",
+                "type": "concurrency_error",
+            },
+        )
+
     @app.exception_handler(Exception)
     async def general_exception_handler(request: Request, exc: Exception):
         """
@@ -27,7 +27,21 @@ class WorkflowEngineError(Exception):
     pass
 
 
+class WorkflowValidationError(Exception):
+    """Raised when a workflow definition fails static graph validation"""
+
+    def __init__(self, message: str, issues: list = None):
+        super().__init__(message)
+        self.issues = issues or []
+
+
 class ConditionEvaluationError(Exception):
     """Raised when a branching condition cannot be evaluated"""
 
     pass
+
+
+class ConcurrencyConflictError(Exception):
+    """Raised when a resource is being modified by a concurrent operation"""
+
+    pass
@@ -8,9 +8,20 @@ from app.db.session import Base
 
 # Import all models so Alembic can detect them
 from app.db.models.user import User, Role, Permission, user_roles, role_permissions
-from app.db.models.workflow import Workflow, WorkflowStep, StepTransition
+from app.db.models.workflow import (
+    Workflow,
+    WorkflowVersion,
+    WorkflowStep,
+    StepTransition,
+)
 from app.db.models.request import WorkflowRequest, RequestStep, RequestStateHistory
 from app.db.models.audit import AuditLog, SLAEscalation
+from app.db.models.event import RequestEvent, RequestSnapshot
+from app.db.models.outbox import OutboxMessage
+from app.db.models.webhook import WebhookSubscription, WebhookDelivery
+from app.db.models.calendar import BusinessCalendar
+from app.db.models.stats import StepDurationStat
+from app.db.models.delegation import Delegation
 
 # This is required for Alembic to auto-generate migrations
 # All models must be imported before running: alembic revision --autogenerate
@@ -4,7 +4,12 @@ Exports all models for easy importing
 """
 
 from app.db.models.user import User, Role, Permission, user_roles, role_permissions
-from app.db.models.workflow import Workflow, WorkflowStep, StepTransition
+from app.db.models.workflow import (
+    Workflow,
+    WorkflowVersion,
+    WorkflowStep,
+    StepTransition,
+)
 from app.db.models.request import (
     WorkflowRequest,
     RequestStep,
@@ -13,6 +18,12 @@ from app.db.models.request import (
     StepStatus,
 )
 from app.db.models.audit import AuditLog, SLAEscalation
+from app.db.models.event import RequestEvent, RequestSnapshot
+from app.db.models.outbox import OutboxMessage
+from app.db.models.webhook import WebhookSubscription, WebhookDelivery, DeliveryStatus
+from app.db.models.calendar import BusinessCalendar
+from app.db.models.stats import StepDurationStat
+from app.db.models.delegation import Delegation
 
 __all__ = [
     # User/RBAC models
@@ -23,6 +34,7 @@ __all__ = [
     "role_permissions",
     # Workflow definition models
     "Workflow",
+    "WorkflowVersion",
     "WorkflowStep",
     "StepTransition",
     # Workflow execution models
@@ -34,4 +46,19 @@ __all__ = [
     # Audit models
     "AuditLog",
     "SLAEscalation",
+    # Event stream models
+    "RequestEvent",
+    "RequestSnapshot",
+    # Messaging models
+    "OutboxMessage",
+    # Webhook models
+    "WebhookSubscription",
+    "WebhookDelivery",
+    "DeliveryStatus",
+    # Calendar models
+    "BusinessCalendar",
+    # Statistics models
+    "StepDurationStat",
+    # Delegation models
+    "Delegation",
 ]
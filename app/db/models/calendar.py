@@ -0,0 +1,48 @@
+"""
+Business calendar models
+Responsibility: Define SQLAlchemy models for working-time calendars
+Tables: business_calendars
+"""
+
+from sqlalchemy import Column, String, DateTime, Uuid, JSON
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+import uuid
+from app.db.session import Base
+
+
+class BusinessCalendar(Base):
+    """
+    BusinessCalendar model - working hours, holidays and timezone that SLA
+    hours are counted in, for the workflows and roles (teams) using it.
+    """
+
+    __tablename__ = "business_calendars"
+
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    name = Column(String(255), unique=True, nullable=False)
+    timezone = Column(String(64), nullable=False, default="UTC")
+    # {"mon": [["09:00", "12:30"], ["13:30", "17:00"]], ...}, local time
+    working_hours = Column(JSON, nullable=False)
+    # ["2026-12-25", ...], local dates
+    holidays = Column(JSON, nullable=False, default=list)
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    # Relationships
+    roles = relationship("Role", back_populates="calendar")
+    workflows = relationship("Workflow", back_populates="calendar")
+
+    @property
+    def role_ids(self):
+        return [role.id for role in self.roles]
+
+    def __repr__(self):
+        return f"<BusinessCalendar(id={self.id}, name={self.name}, timezone={self.timezone})>"
@@ -0,0 +1,49 @@
+"""
+Delegation models
+Responsibility: Define SQLAlchemy models for out-of-office delegation
+Tables: delegations
+"""
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Text, Uuid
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+import uuid
+from app.db.session import Base
+
+
+class Delegation(Base):
+    """
+    Delegation model - while `starts_at <= now < ends_at`, the delegator's
+    new tasks go to the delegate, who also acts with the delegator's roles.
+    """
+
+    __tablename__ = "delegations"
+    __table_args__ = (
+        # Assignment and notification: is this user away, and to whom?
+        Index("ix_delegations_delegator_window", "delegator_id", "starts_at", "ends_at"),
+        # Authorization and inbox: whom is this user standing in for?
+        Index("ix_delegations_delegate_window", "delegate_id", "starts_at", "ends_at"),
+    )
+
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    delegator_id = Column(
+        Uuid(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    delegate_id = Column(
+        Uuid(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    starts_at = Column(DateTime(timezone=True), nullable=False)
+    ends_at = Column(DateTime(timezone=True), nullable=False)
+    reason = Column(Text, nullable=True)
+    created_by = Column(
+        Uuid(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True
+    )
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    delegator = relationship("User", foreign_keys=[delegator_id])
+    delegate = relationship("User", foreign_keys=[delegate_id])
+
+    def __repr__(self):
+        return f"<Delegation(delegator_id={self.delegator_id}, delegate_id={self.delegate_id}, ends_at={self.ends_at})>"
@@ -0,0 +1,83 @@
+"""
+Request event models
+Responsibility: Define SQLAlchemy models for the append-only request event
+stream and its periodic snapshots
+Tables: request_events, request_snapshots
+"""
+
+from sqlalchemy import (
+    Column,
+    String,
+    DateTime,
+    ForeignKey,
+    Integer,
+    Uuid,
+    JSON,
+    UniqueConstraint,
+)
+from sqlalchemy.sql import func
+import uuid
+from app.db.session import Base
+
+
+class RequestEvent(Base):
+    """
+    RequestEvent model - one immutable fact in a request's history
+    (created, step activated/completed/skipped, completed).
+
+    Events are numbered per request by `sequence`, so the whole timeline is a
+    single range scan of the (request_id, sequence) index.
+    """
+
+    __tablename__ = "request_events"
+    __table_args__ = (
+        UniqueConstraint("request_id", "sequence", name="uq_request_events_sequence"),
+    )
+
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    request_id = Column(
+        Uuid(as_uuid=True),
+        ForeignKey("workflow_requests.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    sequence = Column(Integer, nullable=False)
+    event_type = Column(String(50), nullable=False)
+    payload = Column(JSON, nullable=True)
+    actor_id = Column(
+        Uuid(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True
+    )  # Null for system events
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    def __repr__(self):
+        return f"<RequestEvent(request_id={self.request_id}, sequence={self.sequence}, event_type={self.event_type})>"
+
+
+class RequestSnapshot(Base):
+    """
+    RequestSnapshot model - folded request state as of `sequence`, so replays
+    start from the latest snapshot instead of the first event.
+    """
+
+    __tablename__ = "request_snapshots"
+    __table_args__ = (
+        UniqueConstraint(
+            "request_id", "sequence", name="uq_request_snapshots_sequence"
+        ),
+    )
+
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    request_id = Column(
+        Uuid(as_uuid=True),
+        ForeignKey("workflow_requests.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    sequence = Column(Integer, nullable=False)
+    state = Column(JSON, nullable=False)
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    def __repr__(self):
+        return f"<RequestSnapshot(request_id={self.request_id}, sequence={self.sequence})>"
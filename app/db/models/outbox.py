@@ -0,0 +1,37 @@
+"""
+Outbox model
+Responsibility: Define SQLAlchemy model for the transactional outbox
+Tables: outbox_messages
+"""
+
+from sqlalchemy import Column, String, DateTime, Index, Integer, Text, Uuid, JSON
+from sqlalchemy.sql import func
+import uuid
+from app.db.session import Base
+
+
+class OutboxMessage(Base):
+    """
+    OutboxMessage model - a Celery task call recorded in the same transaction
+    as the state change that caused it, and published by the outbox relay
+    after commit.
+    """
+
+    __tablename__ = "outbox_messages"
+    __table_args__ = (
+        # The relay scans undispatched messages oldest first
+        Index("ix_outbox_messages_pending", "dispatched_at", "created_at"),
+    )
+
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    task_name = Column(String(200), nullable=False)
+    payload = Column(JSON, nullable=False)  # Task keyword arguments
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    dispatched_at = Column(DateTime(timezone=True), nullable=True)
+    attempts = Column(Integer, default=0, nullable=False)
+    last_error = Column(Text, nullable=True)
+
+    def __repr__(self):
+        return f"<OutboxMessage(id={self.id}, task_name={self.task_name}, dispatched_at={self.dispatched_at})>"
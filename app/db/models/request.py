@@ -11,9 +11,11 @@ from sqlalchemy import (
     DateTime,
     ForeignKey,
     Enum as SQLEnum,
+    Integer,
     Text,
     Uuid,
     JSON,
+    Index,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -41,6 +43,7 @@ class StepStatus(str, enum.Enum):
     APPROVED = "APPROVED"
     REJECTED = "REJECTED"
     SKIPPED = "SKIPPED"
+    WAITING = "WAITING"  # Join step waiting for its parallel branches
 
 
 class WorkflowRequest(Base):
@@ -64,6 +67,13 @@ class WorkflowRequest(Base):
         nullable=False,
         index=True,
     )
+    # Definition version this request runs on (None: unversioned workflow)
+    workflow_version_id = Column(
+        Uuid(as_uuid=True),
+        ForeignKey("workflow_versions.id"),
+        nullable=True,
+        index=True,
+    )
     requester_id = Column(
         Uuid(as_uuid=True),
         ForeignKey("users.id", ondelete="SET NULL"),
@@ -94,9 +104,28 @@ class WorkflowRequest(Base):
         nullable=False,
     )
     completed_at = Column(DateTime(timezone=True), nullable=True)
+    # When the request completes if every remaining step on its likeliest
+    # path takes its full SLA; refreshed whenever a step is activated
+    projected_completion_at = Column(DateTime(timezone=True), nullable=True)
+    # Optimistic concurrency: every UPDATE checks and bumps this counter
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    # Sequence of the last event appended to this request's stream
+    last_event_seq = Column(Integer, nullable=False, default=0, server_default="0")
+
+    __mapper_args__ = {"version_id_col": version}
+    __table_args__ = (
+        # At-risk listing: open requests by projected completion
+        Index(
+            "ix_workflow_requests_status_projection",
+            "status",
+            "projected_completion_at",
+        ),
+    )
 
     # Relationships
     workflow = relationship("Workflow", back_populates="requests")
+    workflow_version = relationship("WorkflowVersion")
     requester = relationship(
         "User", back_populates="workflow_requests", foreign_keys=[requester_id]
     )
@@ -151,13 +180,18 @@ class RequestStep(Base):
         index=True,
     )
     started_at = Column(DateTime(timezone=True), nullable=True)
-    completed_at = Column(DateTime(timezone=True), nullable=True)
+    # Indexed for the step-duration statistics job's period scans
+    completed_at = Column(DateTime(timezone=True), nullable=True, index=True)
     deadline = Column(
         DateTime(timezone=True), nullable=True, index=True
     )  # Pre-calculated SLA deadline
     is_sla_breached = Column(Boolean, default=False, nullable=False, index=True)
     comments = Column(Text, nullable=True)
     decision_data = Column(JSON, nullable=True)  # Custom decision data
+    # Parallel branch this step runs in, e.g. "3f2a9c1d04be/77c0e1a2b9d3" for
+    # a branch nested in another; NULL on the main line of the request
+    branch_path = Column(String(255), nullable=True, index=True)
+    join_arrivals = Column(Integer, default=0, nullable=False)
 
     # Relationships
     request = relationship("WorkflowRequest", back_populates="request_steps")
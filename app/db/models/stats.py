@@ -0,0 +1,67 @@
+"""
+Statistics models
+Responsibility: Define SQLAlchemy models for aggregated execution statistics
+Tables: step_duration_stats
+"""
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    UniqueConstraint,
+    Uuid,
+    JSON,
+)
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+import uuid
+from app.db.session import Base
+
+
+class StepDurationStat(Base):
+    """
+    StepDurationStat model - durations and SLA breaches of one workflow step
+    over one aggregation period (steps completed in (period_start, period_end]).
+
+    The stored sketch lets consecutive periods be merged into percentiles
+    for any longer range without rereading request_steps.
+    """
+
+    __tablename__ = "step_duration_stats"
+    __table_args__ = (
+        # Trend reads: a step's periods, newest first
+        Index("ix_step_duration_stats_step_period", "step_id", "period_end"),
+        # A period is aggregated once, even if two runs overlap
+        UniqueConstraint(
+            "step_id", "period_start", name="uq_step_duration_stats_step_period_start"
+        ),
+    )
+
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    step_id = Column(
+        Uuid(as_uuid=True),
+        ForeignKey("workflow_steps.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    period_start = Column(DateTime(timezone=True), nullable=False)
+    period_end = Column(DateTime(timezone=True), nullable=False, index=True)
+    sample_count = Column(Integer, nullable=False)
+    breach_count = Column(Integer, nullable=False)
+    # Durations in hours, from started_at to completed_at
+    p50_hours = Column(Float, nullable=False)
+    p90_hours = Column(Float, nullable=False)
+    p99_hours = Column(Float, nullable=False)
+    mean_hours = Column(Float, nullable=False)
+    max_hours = Column(Float, nullable=False)
+    sketch = Column(JSON, nullable=False)  # QuantileSketch.to_dict(), hours
+    computed_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    step = relationship("WorkflowStep")
+
+    def __repr__(self):
+        return f"<StepDurationStat(step_id={self.step_id}, period_end={self.period_end}, p90_hours={self.p90_hours})>"
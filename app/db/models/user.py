@@ -4,7 +4,7 @@ Responsibility: Define SQLAlchemy models for RBAC
 Tables: users, roles, permissions, user_roles, role_permissions
 """
 
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Table, Text, Uuid
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Table, Text, Uuid, JSON
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import uuid
@@ -79,6 +79,8 @@ class User(Base):
     hashed_password = Column(String(255), nullable=False)
     full_name = Column(String(255), nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
+    # Skill weights for SKILL_WEIGHTED assignment, e.g. {"tax": 2.0}
+    skills = Column(JSON, nullable=True)
     created_at = Column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
@@ -121,11 +123,19 @@ class Role(Base):
     id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     name = Column(String(100), unique=True, nullable=False, index=True)
     description = Column(Text, nullable=True)
+    # Working-time calendar of the team holding this role; steps requiring
+    # the role count their SLA in it
+    calendar_id = Column(
+        Uuid(as_uuid=True),
+        ForeignKey("business_calendars.id", ondelete="SET NULL"),
+        nullable=True,
+    )
     created_at = Column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
 
     # Relationships
+    calendar = relationship("BusinessCalendar", back_populates="roles")
     users = relationship(
         "User",
         secondary=user_roles,
@@ -0,0 +1,112 @@
+"""
+Webhook models
+Responsibility: Define SQLAlchemy models for outbound webhooks
+Tables: webhook_subscriptions, webhook_deliveries
+"""
+
+from sqlalchemy import (
+    Column,
+    String,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Boolean,
+    Text,
+    Uuid,
+    JSON,
+    Enum as SQLEnum,
+)
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+import uuid
+import enum
+from app.db.session import Base
+
+
+class DeliveryStatus(str, enum.Enum):
+    """Delivery status enumeration"""
+
+    PENDING = "PENDING"
+    DELIVERED = "DELIVERED"
+    FAILED = "FAILED"  # Gave up after WEBHOOK_MAX_ATTEMPTS
+
+
+class WebhookSubscription(Base):
+    """
+    WebhookSubscription model - a downstream endpoint and the events it wants.
+    """
+
+    __tablename__ = "webhook_subscriptions"
+
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    name = Column(String(255), nullable=False)
+    url = Column(String(2048), nullable=False)
+    secret = Column(String(255), nullable=True)  # HMAC-SHA256 signing key
+    event_types = Column(JSON, nullable=False)  # e.g. ["STEP_COMPLETED"]
+    is_active = Column(Boolean, default=True, nullable=False)
+    # Requests in flight to this endpoint at once
+    max_concurrency = Column(Integer, default=2, nullable=False)
+    created_by = Column(
+        Uuid(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True
+    )
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    deliveries = relationship(
+        "WebhookDelivery",
+        back_populates="subscription",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+    def __repr__(self):
+        return f"<WebhookSubscription(id={self.id}, name={self.name}, url={self.url})>"
+
+
+class WebhookDelivery(Base):
+    """
+    WebhookDelivery model - one event owed to one subscription, written in the
+    transaction that produced the event and sent by the delivery worker.
+    """
+
+    __tablename__ = "webhook_deliveries"
+    __table_args__ = (
+        # The worker scans pending deliveries that are due
+        Index("ix_webhook_deliveries_due", "status", "next_attempt_at"),
+    )
+
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    subscription_id = Column(
+        Uuid(as_uuid=True),
+        ForeignKey("webhook_subscriptions.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    event_type = Column(String(50), nullable=False)
+    payload = Column(JSON, nullable=False)
+    status = Column(
+        SQLEnum(DeliveryStatus), default=DeliveryStatus.PENDING, nullable=False
+    )
+    attempts = Column(Integer, default=0, nullable=False)
+    # Earliest time of the next send; pushed forward while a worker holds the
+    # delivery and by the backoff after a failure
+    next_attempt_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    # Batch a worker is sending the delivery in; with next_attempt_at still
+    # ahead, the batch counts against the subscription's max_concurrency
+    lease_id = Column(Uuid(as_uuid=True), nullable=True)
+    last_status_code = Column(Integer, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    delivered_at = Column(DateTime(timezone=True), nullable=True)
+
+    subscription = relationship("WebhookSubscription", back_populates="deliveries")
+
+    def __repr__(self):
+        return f"<WebhookDelivery(id={self.id}, event_type={self.event_type}, status={self.status})>"
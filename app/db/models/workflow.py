@@ -1,7 +1,7 @@
 """
 Workflow definition models
 Responsibility: Define SQLAlchemy models for workflow templates
-Tables: workflows, workflow_steps, step_transitions
+Tables: workflows, workflow_versions, workflow_steps, step_transitions
 """
 
 from sqlalchemy import (
@@ -9,18 +9,43 @@ from sqlalchemy import (
     String,
     Boolean,
     DateTime,
+    Enum as SQLEnum,
     ForeignKey,
     Integer,
     Text,
+    UniqueConstraint,
     Uuid,
     JSON,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import uuid
+import enum
 from app.db.session import Base
 
 
+class StepType(str, enum.Enum):
+    """Enum for who completes a workflow step"""
+
+    HUMAN = "HUMAN"  # decided by an assignee through the API
+    AUTOMATIC = "AUTOMATIC"  # run by a worker (see app.services.automation)
+
+
+class JoinPolicy(str, enum.Enum):
+    """Enum for how a join step waits on the parallel branches reaching it"""
+
+    ALL = "ALL"  # every live branch must arrive
+    N_OF_M = "N_OF_M"  # join_threshold arrivals; remaining branches are skipped
+
+
+class AssignmentStrategy(str, enum.Enum):
+    """Enum for how a human step picks one assignee among its role's members"""
+
+    ROUND_ROBIN = "ROUND_ROBIN"  # members in turn
+    LEAST_LOADED = "LEAST_LOADED"  # fewest open assigned steps
+    SKILL_WEIGHTED = "SKILL_WEIGHTED"  # open steps per unit of assignment_skill
+
+
 class Workflow(Base):
     """
     Workflow model - represents workflow templates
@@ -32,6 +57,24 @@ class Workflow(Base):
     name = Column(String(255), unique=True, nullable=False, index=True)
     description = Column(Text, nullable=True)
     is_active = Column(Boolean, default=True, nullable=False, index=True)
+    # Version new requests start on; None for a definition whose steps were
+    # written without one (unversioned)
+    current_version_id = Column(
+        Uuid(as_uuid=True),
+        ForeignKey(
+            "workflow_versions.id",
+            ondelete="SET NULL",
+            use_alter=True,
+            name="fk_workflows_current_version_id",
+        ),
+        nullable=True,
+    )
+    # Working-time calendar for SLA hours of steps whose role has none
+    calendar_id = Column(
+        Uuid(as_uuid=True),
+        ForeignKey("business_calendars.id", ondelete="SET NULL"),
+        nullable=True,
+    )
     created_by = Column(
         Uuid(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True
     )
@@ -47,18 +90,81 @@ class Workflow(Base):
 
     # Relationships
     creator = relationship("User", foreign_keys=[created_by])
+    calendar = relationship("BusinessCalendar", back_populates="workflows")
+    # Steps of every version
     steps = relationship(
         "WorkflowStep",
         back_populates="workflow",
         cascade="all, delete-orphan",
         order_by="WorkflowStep.step_order",
     )
+    # Steps of an unversioned (pre-versioning) definition
+    unversioned_steps = relationship(
+        "WorkflowStep",
+        primaryjoin="and_(Workflow.id == WorkflowStep.workflow_id, "
+        "WorkflowStep.version_id == None)",
+        order_by="WorkflowStep.step_order",
+        viewonly=True,
+    )
+    versions = relationship(
+        "WorkflowVersion",
+        back_populates="workflow",
+        foreign_keys="WorkflowVersion.workflow_id",
+        cascade="all, delete-orphan",
+        order_by="WorkflowVersion.version_number",
+    )
+    current_version = relationship(
+        "WorkflowVersion", foreign_keys=[current_version_id], post_update=True
+    )
     requests = relationship("WorkflowRequest", back_populates="workflow")
 
     def __repr__(self):
         return f"<Workflow(id={self.id}, name={self.name}, is_active={self.is_active})>"
 
 
+class WorkflowVersion(Base):
+    """
+    WorkflowVersion model - an immutable, published set of steps and
+    transitions. Requests pin the version they started on.
+    """
+
+    __tablename__ = "workflow_versions"
+    __table_args__ = (
+        UniqueConstraint(
+            "workflow_id", "version_number", name="uq_workflow_versions_number"
+        ),
+    )
+
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    workflow_id = Column(
+        Uuid(as_uuid=True),
+        ForeignKey("workflows.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    version_number = Column(Integer, nullable=False)
+    notes = Column(Text, nullable=True)
+    published_by = Column(
+        Uuid(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True
+    )
+    published_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    # Relationships
+    workflow = relationship(
+        "Workflow", back_populates="versions", foreign_keys=[workflow_id]
+    )
+    steps = relationship(
+        "WorkflowStep",
+        back_populates="version",
+        order_by="WorkflowStep.step_order",
+    )
+
+    def __repr__(self):
+        return f"<WorkflowVersion(id={self.id}, workflow_id={self.workflow_id}, version_number={self.version_number})>"
+
+
 class StepTransition(Base):
     """
     StepTransition model - defines valid transitions between steps
@@ -81,6 +187,8 @@ class StepTransition(Base):
     )
     condition_config = Column(JSON, nullable=True)
     outcome = Column(String(50), nullable=False)
+    # Parallel transitions sharing a source and outcome fork into branches
+    is_parallel = Column(Boolean, default=False, nullable=False)
 
     # Relationships
     from_step = relationship(
@@ -108,6 +216,12 @@ class WorkflowStep(Base):
         nullable=False,
         index=True,
     )
+    version_id = Column(
+        Uuid(as_uuid=True),
+        ForeignKey("workflow_versions.id", ondelete="CASCADE"),
+        nullable=True,
+        index=True,
+    )
     step_order = Column(Integer, nullable=False)
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
@@ -122,12 +236,22 @@ class WorkflowStep(Base):
     sla_hours = Column(Integer, nullable=False, default=24)
     is_conditional = Column(Boolean, default=False, nullable=False)
     condition_config = Column(JSON, nullable=True)
+    step_type = Column(SQLEnum(StepType), default=StepType.HUMAN, nullable=False)
+    action_config = Column(JSON, nullable=True)  # e.g. {"action": "auto_approve", ...}
+    # Set on steps that merge parallel branches (join barrier)
+    join_policy = Column(SQLEnum(JoinPolicy), nullable=True)
+    join_threshold = Column(Integer, nullable=True)  # N for N_OF_M joins
+    # Assign each execution to one member of required_role; None leaves the
+    # task open to every member
+    assignment_strategy = Column(SQLEnum(AssignmentStrategy), nullable=True)
+    assignment_skill = Column(String(100), nullable=True)  # key into User.skills
     created_at = Column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
 
     # Relationships
     workflow = relationship("Workflow", back_populates="steps")
+    version = relationship("WorkflowVersion", back_populates="steps")
     required_role = relationship(
         "Role", back_populates="workflow_steps", foreign_keys=[required_role_id]
     )
@@ -0,0 +1,126 @@
+"""
+Connection pool metrics
+Responsibility: Measure checkout wait time and saturation of SQLAlchemy pools
+so workers can be sized against Postgres max_connections
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Type
+
+from sqlalchemy import exc
+from sqlalchemy.pool import Pool
+
+
+class PoolMetrics:
+    """
+    Thread-safe counters for a single connection pool.
+    """
+
+    def __init__(self, label: str, window: int = 1000):
+        self.label = label
+        self._lock = threading.Lock()
+        self._recent_waits: Deque[float] = deque(maxlen=window)
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.peak_checked_out = 0
+
+    def record_checkout(self, wait_seconds: float, checked_out: int) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+            self._recent_waits.append(wait_seconds)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.checkout_timeouts += 1
+
+    def snapshot(self, pool: Pool) -> Dict[str, Any]:
+        """
+        Current counters plus live pool occupancy.
+        """
+        size = pool.size() if hasattr(pool, "size") else None
+        checked_out = pool.checkedout() if hasattr(pool, "checkedout") else None
+        max_overflow = getattr(pool, "_max_overflow", 0)
+        capacity = (size or 0) + max(max_overflow, 0)
+
+        with self._lock:
+            waits = sorted(self._recent_waits)
+            p95 = waits[int(len(waits) * 0.95) - 1] if waits else 0.0
+            return {
+                "pool": self.label,
+                "size": size,
+                "max_overflow": max_overflow,
+                "checked_out": checked_out,
+                "peak_checked_out": self.peak_checked_out,
+                "saturation": round(checked_out / capacity, 4)
+                if capacity and checked_out is not None
+                else None,
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.checkout_timeouts,
+                "avg_wait_ms": round(
+                    self.total_wait_seconds / self.checkouts * 1000, 3
+                )
+                if self.checkouts
+                else 0.0,
+                "p95_wait_ms": round(p95 * 1000, 3),
+                "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+            }
+
+
+# Registry of metrics per engine label (e.g. "primary", "primary_async")
+_registry: Dict[str, PoolMetrics] = {}
+_pools: Dict[str, Pool] = {}
+
+
+def get_pool_metrics(label: str) -> PoolMetrics:
+    if label not in _registry:
+        _registry[label] = PoolMetrics(label)
+    return _registry[label]
+
+
+def pool_snapshots() -> Dict[str, Dict[str, Any]]:
+    """
+    Snapshot of every instrumented pool that has been created.
+    """
+    return {
+        label: get_pool_metrics(label).snapshot(pool) for label, pool in _pools.items()
+    }
+
+
+class _CheckoutTimingMixin:
+    """
+    Times Pool.connect(), i.e. how long a caller waited for a connection,
+    including queueing behind other checkouts and opening new connections.
+    """
+
+    metrics_label = "default"
+
+    def connect(self):
+        metrics = get_pool_metrics(self.metrics_label)
+        _pools[self.metrics_label] = self
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            metrics.record_timeout()
+            raise
+        metrics.record_checkout(time.perf_counter() - start, self.checkedout())
+        return connection
+
+
+def instrumented_pool_class(base: Type[Pool], label: str) -> Type[Pool]:
+    """
+    Build a subclass of `base` that reports into the metrics for `label`.
+    The label lives on the class so it survives Pool.recreate().
+    """
+    return type(
+        f"Instrumented{base.__name__}",
+        (_CheckoutTimingMixin, base),
+        {"metrics_label": label},
+    )
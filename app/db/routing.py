@@ -0,0 +1,97 @@
+"""
+Read/write session routing
+Responsibility: Send read-only sessions to the replica, keep writes on the
+primary, and pin users to the primary right after their own writes
+"""
+
+import threading
+import time
+from typing import Dict, Hashable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+
+class ReadYourWritesTracker:
+    """
+    Remembers when each user last committed a write, so their follow-up reads
+    are not served by a replica that has not caught up yet.
+
+    State is per process; with several workers a user may land on a worker
+    that has not seen the write, so keep the window above the replica lag.
+    """
+
+    def __init__(self, window_seconds: float, max_entries: int = 100_000):
+        self.window_seconds = window_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._last_write: Dict[Hashable, float] = {}
+
+    def mark(self, user_id: Hashable) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if len(self._last_write) >= self.max_entries:
+                self._prune(now)
+            self._last_write[user_id] = now
+
+    def is_recent(self, user_id: Optional[Hashable]) -> bool:
+        if user_id is None:
+            return False
+        with self._lock:
+            last = self._last_write.get(user_id)
+        return last is not None and time.monotonic() - last < self.window_seconds
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        self._last_write = {k: v for k, v in self._last_write.items() if v >= cutoff}
+
+
+class RoutingSession(Session):
+    """
+    Session that reads from the replica when marked read-only
+    (session.info["read_only"]), and always flushes to the primary, i.e. the
+    session's regular bind.
+    """
+
+    replica_bind: Optional[Engine] = None
+    tracker: Optional[ReadYourWritesTracker] = None
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if (
+            self.info.get("read_only")
+            and self.replica_bind is not None
+            and not self._flushing
+            and not isinstance(clause, UpdateBase)
+        ):
+            return self.replica_bind
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_flush_writes(session, flush_context):
+    session.info["has_writes"] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _mark_dml_writes(orm_execute_state):
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        orm_execute_state.session.info["has_writes"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _record_user_write(session):
+    wrote = session.info.pop("has_writes", False)
+    user_id = session.info.get("user_id")
+    if wrote and user_id is not None and session.tracker is not None:
+        session.tracker.mark(user_id)
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _clear_writes(session):
+    session.info.pop("has_writes", None)
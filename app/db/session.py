@@ -1,25 +1,113 @@
 """
 Database session management
-Responsibility: Create database engine, session factory, and base declarative class
+Responsibility: Create database engines, session factories, and base declarative class
 """
 
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.core.config import settings
+from app.db.pool_metrics import instrumented_pool_class
+from app.db.routing import ReadYourWritesTracker, RoutingSession
+
+
+def _async_database_url(url: str) -> str:
+    """
+    Derive the asyncpg/aiosqlite URL from a sync DATABASE_URL.
+    asyncpg takes `ssl` instead of libpq's `sslmode` query parameter.
+    """
+    if url.startswith("postgresql://"):
+        url = url.replace("postgresql://", "postgresql+asyncpg://", 1)
+        url = url.replace("sslmode=", "ssl=")
+    elif url.startswith("sqlite://"):
+        url = url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return url
+
+
+def _pool_kwargs(url: str, pool_class, label: str) -> dict:
+    """
+    Pool settings shared by every engine.
+    SQLite keeps SQLAlchemy's default pool, which does not take sizing options.
+    """
+    if url.startswith("sqlite"):
+        return {}
+    return {
+        "poolclass": instrumented_pool_class(pool_class, label),
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
 
 # Create database engine
-# pool_pre_ping=True ensures connections are valid before using them
+# Pool sizing and liveness strategy come from settings (see DB_POOL_*)
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,
     echo=settings.DEBUG,  # Log SQL queries in debug mode
+    **_pool_kwargs(settings.DATABASE_URL, QueuePool, "primary"),
+)
+
+# Async engine for non-blocking read paths (asyncpg in production)
+async_engine = create_async_engine(
+    _async_database_url(settings.DATABASE_URL),
+    echo=settings.DEBUG,
+    **_pool_kwargs(settings.DATABASE_URL, AsyncAdaptedQueuePool, "primary_async"),
 )
 
+# Optional read replica; without DATABASE_READ_URL reads stay on the primary
+if settings.DATABASE_READ_URL:
+    read_engine = create_engine(
+        settings.DATABASE_READ_URL,
+        echo=settings.DEBUG,
+        **_pool_kwargs(settings.DATABASE_READ_URL, QueuePool, "replica"),
+    )
+    async_read_engine = create_async_engine(
+        _async_database_url(settings.DATABASE_READ_URL),
+        echo=settings.DEBUG,
+        **_pool_kwargs(
+            settings.DATABASE_READ_URL, AsyncAdaptedQueuePool, "replica_async"
+        ),
+    )
+else:
+    read_engine = None
+    async_read_engine = None
+
+# Users who just wrote keep reading from the primary for a short window
+read_your_writes = ReadYourWritesTracker(settings.READ_YOUR_WRITES_SECONDS)
+
+
+class PrimaryReplicaSession(RoutingSession):
+    replica_bind = read_engine
+    tracker = read_your_writes
+
+
+class AsyncPrimaryReplicaSession(RoutingSession):
+    # AsyncSession drives a sync Session internally, which binds to sync_engine
+    replica_bind = async_read_engine.sync_engine if async_read_engine else None
+    tracker = read_your_writes
+
+
 # Create session factory
 # autocommit=False: Transactions must be explicitly committed
 # autoflush=False: Don't automatically flush changes to DB
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(
+    class_=PrimaryReplicaSession, autocommit=False, autoflush=False, bind=engine
+)
+
+# Async session factory
+# expire_on_commit=False: attributes stay loaded after commit, since lazy
+# loading is not available once the async session hands objects back
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    sync_session_class=AsyncPrimaryReplicaSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
 
 # Base class for all SQLAlchemy models
 Base = declarative_base()
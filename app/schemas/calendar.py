@@ -0,0 +1,94 @@
+from typing import Dict, List, Optional
+from uuid import UUID
+from datetime import date, datetime
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from pydantic import BaseModel, Field, field_validator
+
+from app.services.calendar import DEFAULT_WORKING_HOURS, WEEKDAYS, parse_minutes
+
+
+def _check_timezone(value: Optional[str]) -> Optional[str]:
+    if value is None:
+        return value
+    try:
+        ZoneInfo(value)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown timezone '{value}'")
+    return value
+
+
+def _check_working_hours(
+    value: Optional[Dict[str, List[List[str]]]]
+) -> Optional[Dict[str, List[List[str]]]]:
+    if value is None:
+        return value
+    unknown = sorted(set(value) - set(WEEKDAYS))
+    if unknown:
+        raise ValueError(f"Unknown weekdays {unknown}; expected any of {list(WEEKDAYS)}")
+    for day, intervals in value.items():
+        for interval in intervals:
+            if len(interval) != 2:
+                raise ValueError(f"{day}: intervals are [start, end] pairs")
+            start, end = (parse_minutes(t) for t in interval)
+            if start >= end:
+                raise ValueError(f"{day}: {interval[0]}-{interval[1]} ends before it starts")
+    if not any(value.values()):
+        raise ValueError("At least one working interval is required")
+    return value
+
+
+# Shared properties
+class BusinessCalendarBase(BaseModel):
+    name: str = Field(..., min_length=1, max_length=255)
+    timezone: str = "UTC"
+    # {"mon": [["09:00", "17:00"]], ...} in the calendar's timezone
+    working_hours: Dict[str, List[List[str]]] = Field(
+        default_factory=lambda: {k: [list(i) for i in v] for k, v in DEFAULT_WORKING_HOURS.items()}
+    )
+    holidays: List[date] = []
+
+    @field_validator("timezone")
+    @classmethod
+    def validate_timezone(cls, v):
+        return _check_timezone(v)
+
+    @field_validator("working_hours")
+    @classmethod
+    def validate_working_hours(cls, v):
+        return _check_working_hours(v)
+
+
+# Properties to receive on creation
+class BusinessCalendarCreate(BusinessCalendarBase):
+    # Roles (teams) whose steps count SLA hours in this calendar
+    role_ids: List[UUID] = []
+
+
+# Properties to receive on update
+class BusinessCalendarUpdate(BaseModel):
+    name: Optional[str] = Field(None, min_length=1, max_length=255)
+    timezone: Optional[str] = None
+    working_hours: Optional[Dict[str, List[List[str]]]] = None
+    holidays: Optional[List[date]] = None
+    role_ids: Optional[List[UUID]] = None
+
+    @field_validator("timezone")
+    @classmethod
+    def validate_timezone(cls, v):
+        return _check_timezone(v)
+
+    @field_validator("working_hours")
+    @classmethod
+    def validate_working_hours(cls, v):
+        return _check_working_hours(v)
+
+
+# Properties to return
+class BusinessCalendarSchema(BusinessCalendarBase):
+    id: UUID
+    role_ids: List[UUID] = []
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,45 @@
+from typing import Optional
+from uuid import UUID
+from datetime import datetime, timezone
+from pydantic import BaseModel, field_validator, model_validator
+
+
+def _to_utc(value: datetime) -> datetime:
+    # Stored and compared as naive UTC, like the engine's timestamps
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class DelegationCreate(BaseModel):
+    delegate_id: UUID
+    starts_at: datetime
+    ends_at: datetime
+    reason: Optional[str] = None
+    # Admins may set up a delegation for someone else; defaults to the caller
+    delegator_id: Optional[UUID] = None
+
+    @field_validator("starts_at", "ends_at")
+    @classmethod
+    def validate_utc(cls, v):
+        return _to_utc(v)
+
+    @model_validator(mode="after")
+    def validate_window(self):
+        if self.ends_at <= self.starts_at:
+            raise ValueError("ends_at must be after starts_at")
+        return self
+
+
+class DelegationSchema(BaseModel):
+    id: UUID
+    delegator_id: UUID
+    delegate_id: UUID
+    starts_at: datetime
+    ends_at: datetime
+    reason: Optional[str] = None
+    created_by: Optional[UUID] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
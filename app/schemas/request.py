@@ -1,9 +1,10 @@
-from typing import List, Optional, Any
+from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import AliasChoices, AliasPath, BaseModel, Field
 from enum import Enum
-from app.db.models.request import RequestStatus
+from sqlalchemy.orm import joinedload, selectinload
+from app.db.models.request import RequestStatus, WorkflowRequest, RequestStep
 
 
 # Schema for Request Step
@@ -18,17 +19,35 @@ class RequestStepSchema(BaseModel):
     deadline: Optional[datetime] = None
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
-    # Added for visual view
-    step_name: Optional[str] = None
-    step_order: Optional[int] = None
-
-    @classmethod
-    def model_validate(cls, obj: Any, **kwargs):
-        data = super().model_validate(obj, **kwargs)
-        if hasattr(obj, 'step') and obj.step:
-            data.step_name = obj.step.name
-            data.step_order = obj.step.step_order
-        return data
+    branch_path: Optional[str] = None
+    assigned_to: Optional[UUID] = None  # assignee, then whoever decided
+    # Added for visual view (read from the step definition, see loader_options)
+    step_name: Optional[str] = Field(
+        None, validation_alias=AliasChoices("step_name", AliasPath("step", "name"))
+    )
+    step_order: Optional[int] = Field(
+        None,
+        validation_alias=AliasChoices("step_order", AliasPath("step", "step_order")),
+    )
+
+    @staticmethod
+    def loader_options() -> tuple:
+        """
+        Loader options for RequestStep queries serialized with this schema.
+        """
+        return (joinedload(RequestStep.step),)
+
+    class Config:
+        from_attributes = True
+
+
+# Schema for a request timeline entry
+class RequestEventSchema(BaseModel):
+    sequence: int
+    event_type: str
+    payload: Optional[dict] = None
+    actor_id: Optional[UUID] = None
+    created_at: datetime
 
     class Config:
         from_attributes = True
@@ -44,14 +63,72 @@ class WorkflowRequestCreate(WorkflowRequestBase):
     pass
 
 
+class WorkflowRequestBulkItem(BaseModel):
+    request_data: Optional[dict] = None
+
+
+class WorkflowRequestBulkCreate(BaseModel):
+    workflow_id: UUID
+    items: List[WorkflowRequestBulkItem] = Field(..., min_length=1, max_length=5000)
+
+
+class WorkflowRequestBulkResult(BaseModel):
+    workflow_id: UUID
+    created: int
+    request_ids: List[UUID]
+
+
+class StepDecision(BaseModel):
+    request_id: UUID
+    outcome: str
+    context: Optional[dict] = None
+    request_step_id: Optional[UUID] = None  # which branch, when several are open
+
+
+class BulkDecisionCreate(BaseModel):
+    decisions: List[StepDecision] = Field(..., min_length=1, max_length=1000)
+
+
+class BulkDecisionItemResult(BaseModel):
+    request_id: UUID
+    success: bool
+    status: Optional[RequestStatus] = None
+    current_step_id: Optional[UUID] = None
+    error: Optional[str] = None
+    # CONCURRENT_MODIFICATION when the request was locked by another decision
+    error_code: Optional[str] = None
+
+
+class BulkDecisionResult(BaseModel):
+    processed: int
+    failed: int
+    results: List[BulkDecisionItemResult]
+
+
 class WorkflowRequestSchema(WorkflowRequestBase):
     id: UUID
+    workflow_version_id: Optional[UUID] = None
     requester_id: UUID
     status: RequestStatus
     current_step_id: Optional[UUID] = None
+    projected_completion_at: Optional[datetime] = None
+    version: int = 1
     created_at: datetime
     updated_at: datetime
-    steps: List[RequestStepSchema] = []
+    steps: List[RequestStepSchema] = Field(
+        [], validation_alias=AliasChoices("steps", "request_steps")
+    )
+
+    @staticmethod
+    def loader_options() -> tuple:
+        """
+        Loader options for WorkflowRequest queries serialized with this
+        schema: one extra statement for all steps and their definitions,
+        however many requests are returned.
+        """
+        return (
+            selectinload(WorkflowRequest.request_steps).joinedload(RequestStep.step),
+        )
 
     class Config:
         from_attributes = True
@@ -0,0 +1,37 @@
+from typing import Optional
+from uuid import UUID
+from datetime import datetime
+from pydantic import BaseModel
+
+
+# Shared properties: durations in hours
+class StepDurationFigures(BaseModel):
+    sample_count: int
+    breach_count: int
+    p50_hours: float
+    p90_hours: float
+    p99_hours: float
+    mean_hours: float
+    max_hours: float
+
+
+# One stored aggregation period of a step
+class StepDurationStatSchema(StepDurationFigures):
+    id: UUID
+    step_id: UUID
+    period_start: datetime
+    period_end: datetime
+    computed_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+# A step's periods merged over a range, next to its configured SLA
+class StepDurationSummary(StepDurationFigures):
+    step_id: UUID
+    workflow_id: UUID
+    step_name: str
+    sla_hours: int
+    breach_rate: float
+    periods: int
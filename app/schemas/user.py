@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 from datetime import datetime
 from pydantic import BaseModel, EmailStr, Field
@@ -26,9 +26,14 @@ class UserUpdate(BaseModel):
     is_active: Optional[bool] = None
 
 
+# Skill weights used by SKILL_WEIGHTED step assignment
+UserSkills = Dict[str, float]
+
+
 # Schema for reading a user (returned via API)
 class UserSchema(UserBase):
     id: UUID
+    skills: Optional[UserSkills] = None
     created_at: datetime
     updated_at: datetime
 
@@ -0,0 +1,96 @@
+from typing import List, Optional
+from uuid import UUID
+from datetime import datetime
+from pydantic import BaseModel, Field, field_validator
+
+from app.db.models.webhook import DeliveryStatus
+from app.services.webhooks import WEBHOOK_EVENTS
+
+
+def _check_event_types(value: Optional[List[str]]) -> Optional[List[str]]:
+    if value is None:
+        return value
+    unknown = sorted(set(value) - set(WEBHOOK_EVENTS))
+    if unknown:
+        raise ValueError(
+            f"Unknown event types {unknown}; expected any of {list(WEBHOOK_EVENTS)}"
+        )
+    return sorted(set(value))
+
+
+def _check_url(value: Optional[str]) -> Optional[str]:
+    if value is not None and not value.startswith(("http://", "https://")):
+        raise ValueError("url must be an http(s) URL")
+    return value
+
+
+# Shared properties
+class WebhookSubscriptionBase(BaseModel):
+    name: str
+    url: str
+    event_types: List[str] = Field(..., min_length=1)
+    is_active: bool = True
+    max_concurrency: int = Field(2, ge=1, le=32)
+
+    @field_validator("event_types")
+    @classmethod
+    def validate_event_types(cls, v):
+        return _check_event_types(v)
+
+    @field_validator("url")
+    @classmethod
+    def validate_url(cls, v):
+        return _check_url(v)
+
+
+# Properties to receive on creation
+class WebhookSubscriptionCreate(WebhookSubscriptionBase):
+    secret: Optional[str] = None
+
+
+# Properties to receive on update
+class WebhookSubscriptionUpdate(BaseModel):
+    name: Optional[str] = None
+    url: Optional[str] = None
+    secret: Optional[str] = None
+    event_types: Optional[List[str]] = Field(None, min_length=1)
+    is_active: Optional[bool] = None
+    max_concurrency: Optional[int] = Field(None, ge=1, le=32)
+
+    @field_validator("event_types")
+    @classmethod
+    def validate_event_types(cls, v):
+        return _check_event_types(v)
+
+    @field_validator("url")
+    @classmethod
+    def validate_url(cls, v):
+        return _check_url(v)
+
+
+# Properties to return (the secret is never echoed back)
+class WebhookSubscriptionSchema(WebhookSubscriptionBase):
+    id: UUID
+    created_by: Optional[UUID] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class WebhookDeliverySchema(BaseModel):
+    id: UUID
+    subscription_id: UUID
+    event_type: str
+    payload: dict
+    status: DeliveryStatus
+    attempts: int
+    next_attempt_at: datetime
+    last_status_code: Optional[int] = None
+    last_error: Optional[str] = None
+    created_at: datetime
+    delivered_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
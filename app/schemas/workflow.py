@@ -1,7 +1,16 @@
 from typing import List, Optional, Any
 from uuid import UUID
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import AliasChoices, AliasPath, BaseModel, Field
+from sqlalchemy.orm import selectinload
+from app.db.models.workflow import (
+    AssignmentStrategy,
+    JoinPolicy,
+    StepType,
+    Workflow,
+    WorkflowStep,
+    WorkflowVersion,
+)
 
 
 # Schema for Step Transition (Branching Logic)
@@ -10,6 +19,7 @@ class StepTransitionBase(BaseModel):
     to_step_id: Optional[UUID] = None  # None means terminal
     condition_config: Optional[dict] = None
     outcome: str  # e.g., "APPROVED", "REJECTED"
+    is_parallel: bool = False  # fork: all matching parallel transitions fire
 
 
 class StepTransitionSchema(StepTransitionBase):
@@ -29,6 +39,13 @@ class WorkflowStepBase(BaseModel):
     required_permission_id: Optional[UUID] = None
     is_conditional: bool = False
     condition_config: Optional[dict] = None
+    step_type: StepType = StepType.HUMAN
+    action_config: Optional[dict] = None  # action run by AUTOMATIC steps
+    join_policy: Optional[JoinPolicy] = None  # set on steps merging branches
+    join_threshold: Optional[int] = Field(None, ge=1)  # N for N_OF_M joins
+    # Assign each execution to one member of required_role; None: open to all
+    assignment_strategy: Optional[AssignmentStrategy] = None
+    assignment_skill: Optional[str] = Field(None, max_length=100)
 
 
 class WorkflowStepCreate(WorkflowStepBase):
@@ -50,6 +67,8 @@ class WorkflowBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=255)
     description: Optional[str] = None
     is_active: bool = True
+    # Business calendar for SLA hours; None counts round the clock
+    calendar_id: Optional[UUID] = None
 
 
 class StepTransitionCreate(BaseModel):
@@ -57,6 +76,7 @@ class StepTransitionCreate(BaseModel):
     to_step_order: Optional[int] = None
     outcome: str
     condition_config: Optional[dict] = None
+    is_parallel: bool = False
 
 
 class WorkflowCreate(WorkflowBase):
@@ -64,17 +84,80 @@ class WorkflowCreate(WorkflowBase):
     transitions: List[StepTransitionCreate] = []
 
 
+class WorkflowImport(BaseModel):
+    workflows: List[WorkflowCreate] = Field(..., min_length=1, max_length=1000)
+
+
+class WorkflowImportResult(BaseModel):
+    created: int
+    workflow_ids: List[UUID]
+
+
 class WorkflowUpdate(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
     is_active: Optional[bool] = None
+    calendar_id: Optional[UUID] = None
+
+
+# Definition published as a new version
+class WorkflowVersionCreate(BaseModel):
+    steps: List[WorkflowStepCreate] = Field(..., min_length=1)
+    transitions: List[StepTransitionCreate] = []
+    notes: Optional[str] = None
+
+
+class WorkflowVersionSummary(BaseModel):
+    id: UUID
+    workflow_id: UUID
+    version_number: int
+    notes: Optional[str] = None
+    published_by: Optional[UUID] = None
+    published_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class WorkflowVersionSchema(WorkflowVersionSummary):
+    steps: List[WorkflowStepSchema] = []
+
+    @staticmethod
+    def loader_options() -> tuple:
+        return (
+            selectinload(WorkflowVersion.steps).selectinload(
+                WorkflowStep.transitions_from
+            ),
+        )
 
 
 class WorkflowSchema(WorkflowBase):
     id: UUID
+    current_version_id: Optional[UUID] = None
     created_at: datetime
     updated_at: datetime
-    steps: List[WorkflowStepSchema] = []
+    # Steps of the current version (of the definition, if unversioned)
+    steps: List[WorkflowStepSchema] = Field(
+        [],
+        validation_alias=AliasChoices(
+            AliasPath("current_version", "steps"), "unversioned_steps", "steps"
+        ),
+    )
+
+    @staticmethod
+    def loader_options() -> tuple:
+        """
+        Loader options for Workflow queries serialized with this schema:
+        a fixed number of statements for any page size.
+        """
+        return (
+            selectinload(Workflow.current_version)
+            .selectinload(WorkflowVersion.steps)
+            .selectinload(WorkflowStep.transitions_from),
+            selectinload(Workflow.unversioned_steps).selectinload(
+                WorkflowStep.transitions_from
+            ),
+        )
 
     class Config:
         from_attributes = True
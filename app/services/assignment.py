@@ -0,0 +1,273 @@
+"""
+Assignment Service
+Responsibility: Pick one assignee for a human step among the members of its
+required role who hold its required permission, balancing on per-user load
+counters
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+import redis
+from sqlalchemy import event, func, inspect
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models.request import RequestStep, StepStatus
+from app.db.models.user import Permission, Role, User
+from app.db.models.workflow import AssignmentStrategy, StepType, WorkflowStep
+from app.services import post_commit
+from app.services.delegation import DelegationService
+
+logger = logging.getLogger("workflow-platform.assignment")
+
+# Statuses of a step that still sits in its assignee's queue
+_OPEN = (StepStatus.PENDING, StepStatus.IN_PROGRESS)
+
+# Attributes that decide who AssignmentService._role_members returns
+_MEMBER_ATTRS = {
+    User: ("is_active", "skills", "roles"),
+    Role: ("users", "permissions"),
+    Permission: ("roles",),
+}
+_MEMBERS_CHANGED_KEY = "assignment_members_changed"
+
+
+class LoadCounter:
+    """
+    Open assigned steps per user, kept in this process or in a Redis hash
+    shared by all API nodes and workers, so picking an assignee never counts
+    request_steps.
+
+    Counters are raised as soon as a step is assigned (a rolled-back
+    transaction leaves them one too high) and lowered after the step's
+    decision commits. reconcile() resets them from request_steps: the
+    process-local counters do so every ASSIGNMENT_LOAD_RESYNC_SECONDS, the
+    Redis hash from a periodic task. Redis errors degrade to local counters.
+    """
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        resync_seconds: float = 300,
+        prefix: str = "workflow-platform:assignee",
+    ):
+        self.resync_seconds = resync_seconds
+        self.prefix = prefix
+        self._redis = redis.Redis.from_url(redis_url) if redis_url else None
+        self._lock = threading.Lock()
+        self._loads: Dict[UUID, int] = {}
+        self._turns: Dict[str, int] = {}
+        self._synced_at: Optional[float] = None
+
+    def loads(self, db: Session, user_ids: List[UUID]) -> Dict[UUID, int]:
+        if self._redis is not None and user_ids:
+            try:
+                values = self._redis.hmget(
+                    f"{self.prefix}:load", [str(u) for u in user_ids]
+                )
+                return {u: int(v or 0) for u, v in zip(user_ids, values)}
+            except redis.RedisError as e:
+                logger.warning(f"Assignee load read from Redis failed: {e}")
+        self._resync(db)
+        with self._lock:
+            return {u: self._loads.get(u, 0) for u in user_ids}
+
+    def adjust(self, user_id: UUID, delta: int) -> None:
+        if self._redis is not None:
+            try:
+                self._redis.hincrby(f"{self.prefix}:load", str(user_id), delta)
+                return
+            except redis.RedisError as e:
+                logger.warning(f"Assignee load update in Redis failed: {e}")
+        with self._lock:
+            self._loads[user_id] = max(self._loads.get(user_id, 0) + delta, 0)
+
+    def next_turn(self, key: str) -> int:
+        """
+        Monotonic counter per key, the rotation of round-robin assignment.
+        """
+        if self._redis is not None:
+            try:
+                return int(self._redis.incr(f"{self.prefix}:turn:{key}"))
+            except redis.RedisError as e:
+                logger.warning(f"Assignment turn from Redis failed: {e}")
+        with self._lock:
+            self._turns[key] = self._turns.get(key, 0) + 1
+            return self._turns[key]
+
+    def reconcile(self, db: Session) -> Dict[UUID, int]:
+        """
+        Reset every counter to the user's open assigned steps.
+        """
+        counts = {
+            user_id: n
+            for user_id, n in db.query(RequestStep.assigned_to, func.count(RequestStep.id))
+            .filter(
+                RequestStep.assigned_to.isnot(None),
+                RequestStep.status.in_(_OPEN),
+                RequestStep.completed_at == None,
+            )
+            .group_by(RequestStep.assigned_to)
+        }
+        if self._redis is not None:
+            try:
+                pipe = self._redis.pipeline()
+                pipe.delete(f"{self.prefix}:load")
+                if counts:
+                    pipe.hset(
+                        f"{self.prefix}:load",
+                        mapping={str(u): n for u, n in counts.items()},
+                    )
+                pipe.execute()
+            except redis.RedisError as e:
+                logger.warning(f"Assignee load reconcile in Redis failed: {e}")
+        with self._lock:
+            self._loads = dict(counts)
+            self._synced_at = time.monotonic()
+        return counts
+
+    def _resync(self, db: Session) -> None:
+        synced_at = self._synced_at
+        if synced_at is None or time.monotonic() - synced_at >= self.resync_seconds:
+            self.reconcile(db)
+
+
+load_counter = LoadCounter(
+    settings.ASSIGNMENT_REDIS_URL, settings.ASSIGNMENT_LOAD_RESYNC_SECONDS
+)
+
+
+class AssignmentService:
+    # Active members of a role (holding a permission, if the step requires
+    # one) with their skills, reloaded after ASSIGNMENT_MEMBER_CACHE_SECONDS:
+    # (role_id, permission_id) -> (loaded_at, members)
+    _members: Dict[
+        Tuple[UUID, Optional[UUID]],
+        Tuple[float, List[Tuple[UUID, Dict[str, float]]]],
+    ] = {}
+    _members_lock = threading.Lock()
+
+    @staticmethod
+    def pick(db: Session, step: WorkflowStep) -> Optional[UUID]:
+        """
+        The member of the step's required role to assign an execution to, or
+        None when the step is open to the whole role (no strategy, an
+        automatic step, or no eligible member). When the step also requires
+        a permission, only members holding it are eligible. Members who are out of
+        office are passed over while anyone else is in; if everyone is away
+        the pick goes to its delegate. The pick is counted against the
+        assignee's load right away, so a batch of assignments in one
+        transaction spreads out.
+        """
+        strategy = step.assignment_strategy
+        if (
+            not isinstance(strategy, AssignmentStrategy)
+            or step.step_type == StepType.AUTOMATIC
+            or not step.required_role_id
+        ):
+            return None
+
+        members = AssignmentService._role_members(
+            db, step.required_role_id, step.required_permission_id
+        )
+        if strategy == AssignmentStrategy.SKILL_WEIGHTED and step.assignment_skill:
+            weights = {
+                user_id: float(skills.get(step.assignment_skill) or 0)
+                for user_id, skills in members
+            }
+            members = [m for m in members if weights[m[0]] > 0]
+        else:
+            weights = {user_id: 1.0 for user_id, _ in members}
+        if not members:
+            logger.info(f"No eligible assignee for step {step.id}; left open to the role")
+            return None
+        away = DelegationService.delegates(db, [user_id for user_id, _ in members])
+        members = [m for m in members if m[0] not in away] or members
+
+        # Rotate the candidates each time, so ties don't always go to the same
+        # member and round robin is just the head of the rotation
+        turn = load_counter.next_turn(str(step.id)) % len(members)
+        candidates = [user_id for user_id, _ in members[turn:] + members[:turn]]
+        if strategy == AssignmentStrategy.ROUND_ROBIN:
+            assignee = candidates[0]
+        else:
+            loads = load_counter.loads(db, candidates)
+            assignee = min(candidates, key=lambda u: (loads[u] + 1) / weights[u])
+        if assignee in away:
+            assignee = DelegationService.resolve(db, assignee)
+
+        load_counter.adjust(assignee, 1)
+        return assignee
+
+    @staticmethod
+    def release(db: Session, user_id: Optional[UUID]) -> None:
+        """
+        Lower the assignee's load once the transaction closing their step
+        commits.
+        """
+        if isinstance(user_id, UUID):
+            post_commit.on_commit(db, load_counter.adjust, user_id, -1)
+
+    @staticmethod
+    def invalidate_members() -> None:
+        with AssignmentService._members_lock:
+            AssignmentService._members.clear()
+
+    @staticmethod
+    def _role_members(
+        db: Session, role_id: UUID, permission_id: Optional[UUID] = None
+    ) -> List[Tuple[UUID, Dict[str, float]]]:
+        key = (role_id, permission_id)
+        now = time.monotonic()
+        cached = AssignmentService._members.get(key)
+        if cached and now - cached[0] < settings.ASSIGNMENT_MEMBER_CACHE_SECONDS:
+            return cached[1]
+        query = (
+            db.query(User)
+            .join(User.roles)
+            .filter(Role.id == role_id, User.is_active == True)
+        )
+        if permission_id:
+            # Through any of the user's roles, as in WorkflowEngine._authorize
+            query = query.filter(
+                User.roles.any(Role.permissions.any(Permission.id == permission_id))
+            )
+        members = [(user.id, user.skills or {}) for user in query.order_by(User.id)]
+        with AssignmentService._members_lock:
+            AssignmentService._members[key] = (now, members)
+        return members
+
+
+@event.listens_for(Session, "before_flush")
+def _track_member_changes(session, flush_context, instances):
+    if session.info.get(_MEMBERS_CHANGED_KEY):
+        return
+    for obj in (*session.new, *session.deleted):
+        if type(obj) in _MEMBER_ATTRS:
+            session.info[_MEMBERS_CHANGED_KEY] = True
+            return
+    for obj in session.dirty:
+        attrs = _MEMBER_ATTRS.get(type(obj), ())
+        state = inspect(obj)
+        if any(state.attrs[name].history.has_changes() for name in attrs):
+            session.info[_MEMBERS_CHANGED_KEY] = True
+            return
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_members(session):
+    # Role membership, permission grants, deactivation and skills may be
+    # written anywhere; drop cached members once such a change is visible
+    if session.info.pop(_MEMBERS_CHANGED_KEY, False):
+        AssignmentService.invalidate_members()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_member_changes(session, previous_transaction):
+    # A savepoint rollback keeps the flag: the outer changes may still commit
+    if not previous_transaction.nested:
+        session.info.pop(_MEMBERS_CHANGED_KEY, None)
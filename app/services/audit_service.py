@@ -8,6 +8,7 @@ from typing import Any, Dict, Optional
 from uuid import UUID
 from sqlalchemy.orm import Session
 from app.db.models.audit import AuditLog
+from app.services.webhooks import WebhookService, WEBHOOK_EVENTS
 
 logger = logging.getLogger("workflow-platform.audit_service")
 
@@ -50,4 +51,18 @@ class AuditService:
             db.rollback()
             raise
 
+        if action in WEBHOOK_EVENTS:
+            WebhookService.enqueue(
+                db,
+                action,
+                WebhookService.build_payload(
+                    action,
+                    resource_type,
+                    resource_id,
+                    actor_id=actor_id,
+                    request_id=request_id,
+                    meta_data=meta_data,
+                ),
+            )
+
         return audit_entry
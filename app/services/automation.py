@@ -0,0 +1,79 @@
+"""
+Automatic Step Actions
+Responsibility: Registry of the actions that automatic (system) steps run
+in place of a human decision
+"""
+
+import logging
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.core.exceptions import WorkflowEngineError
+
+logger = logging.getLogger("workflow-platform.automation")
+
+# An action receives the request, the step definition and the step's
+# action_config, and returns the outcome plus optional decision data.
+StepAction = Callable[[Any, Any, Dict[str, Any]], Tuple[str, Optional[Dict[str, Any]]]]
+
+_actions: Dict[str, StepAction] = {}
+
+
+def register_action(name: str) -> Callable[[StepAction], StepAction]:
+    """
+    Register an automatic step action under `name`.
+    Usage:
+        @register_action("notify_erp")
+        def notify_erp(request, step, config):
+            ...
+            return "APPROVED", {"erp_ref": ref}
+    """
+
+    def decorator(func: StepAction) -> StepAction:
+        _actions[name] = func
+        return func
+
+    return decorator
+
+
+def get_action(name: Optional[str]) -> StepAction:
+    if not name or name not in _actions:
+        raise WorkflowEngineError(f"Unknown automatic step action '{name}'")
+    return _actions[name]
+
+
+class AutomationService:
+    @staticmethod
+    def execute(request: Any, step: Any) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        Run the action configured on an automatic step.
+        """
+        config = step.action_config or {}
+        action = get_action(config.get("action"))
+        outcome, data = action(request, step, config)
+        logger.info(
+            f"Automatic step {step.name} on Request {request.id} returned {outcome}"
+        )
+        return outcome, data
+
+
+@register_action("auto_approve")
+def auto_approve(request, step, config):
+    """
+    Approve when `condition` holds for the request (e.g. amount below a
+    threshold), otherwise return `otherwise` (default REJECTED).
+    Config: {"action": "auto_approve", "condition": {...}, "otherwise": "..."}
+    """
+    from app.services.workflow_engine import ConditionEvaluator
+
+    context = {"request_data": request.request_data or {}}
+    if ConditionEvaluator.evaluate(config.get("condition"), context):
+        return "APPROVED", {"auto": True}
+    return config.get("otherwise", "REJECTED"), {"auto": True}
+
+
+@register_action("pass_through")
+def pass_through(request, step, config):
+    """
+    Complete the step with a fixed outcome (default APPROVED).
+    """
+    return config.get("outcome", "APPROVED"), {"auto": True}
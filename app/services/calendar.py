@@ -0,0 +1,239 @@
+"""
+Business Calendars
+Responsibility: Count SLA hours in working time (weekly hours, holidays,
+timezone) using precomputed working-interval tables, and resolve which
+calendar applies to a step
+"""
+
+import logging
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+from zoneinfo import ZoneInfo
+
+from sqlalchemy.orm import Session, selectinload
+
+from app.core.config import settings
+from app.db.models.calendar import BusinessCalendar
+
+logger = logging.getLogger("workflow-platform.calendar")
+
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+# Used when a calendar is created without working_hours
+DEFAULT_WORKING_HOURS = {day: [["09:00", "17:00"]] for day in WEEKDAYS[:5]}
+
+
+def parse_minutes(value: str) -> int:
+    """
+    "HH:MM" -> minutes after midnight; "24:00" is allowed as an end.
+    """
+    hours, minutes = value.split(":")
+    total = int(hours) * 60 + int(minutes)
+    if not 0 <= int(minutes) < 60 or not 0 <= total <= 24 * 60:
+        raise ValueError(f"Invalid time of day '{value}'")
+    return total
+
+
+class WorkingCalendar:
+    """
+    Working time as a sorted table of UTC intervals with the working seconds
+    accumulated before each one, so adding hours or testing a timestamp is
+    a binary search. The table covers `horizon_days` from an anchor date
+    and is rebuilt around a timestamp that falls outside it.
+
+    Takes and returns naive UTC datetimes, like the rest of the engine.
+    """
+
+    def __init__(
+        self,
+        tz: str,
+        working_hours: Dict[str, Sequence[Sequence[str]]],
+        holidays: Iterable[str] = (),
+        horizon_days: int = 400,
+    ):
+        self.tz = ZoneInfo(tz)
+        self.weekly: List[List[Tuple[int, int]]] = [
+            sorted(
+                (parse_minutes(start), parse_minutes(end))
+                for start, end in working_hours.get(day, [])
+            )
+            for day in WEEKDAYS
+        ]
+        if not any(self.weekly):
+            raise ValueError("A calendar needs at least one working interval")
+        self.holidays = {
+            d if isinstance(d, date) else date.fromisoformat(d) for d in holidays
+        }
+        self.horizon_days = horizon_days
+        self._lock = threading.Lock()
+        # (starts, ends, cumulative seconds before each interval + total)
+        self._table: Tuple[List[float], List[float], List[float]] = ([], [], [0.0])
+
+    def add_hours(self, start: datetime, hours: float) -> datetime:
+        """
+        The moment `hours` of working time after `start`.
+        """
+        t = _timestamp(start)
+        need = hours * 3600
+        starts, ends, cum = self._covering(t, need)
+        worked = self._worked_before(starts, ends, cum, t)
+        target = worked + need
+        # First interval whose end reaches the target
+        j = bisect_left(cum, target, lo=1) - 1
+        return _naive_utc(starts[j] + (target - cum[j]))
+
+    def is_working(self, moment: datetime) -> bool:
+        t = _timestamp(moment)
+        starts, ends, _ = self._covering(t, 0)
+        i = bisect_right(starts, t) - 1
+        return i >= 0 and t < ends[i]
+
+    def _worked_before(
+        self, starts: List[float], ends: List[float], cum: List[float], t: float
+    ) -> float:
+        i = bisect_right(starts, t) - 1
+        if i >= 0 and t < ends[i]:
+            return cum[i] + (t - starts[i])
+        return cum[i + 1]  # between intervals: count from the next one
+
+    def _covering(
+        self, t: float, need: float
+    ) -> Tuple[List[float], List[float], List[float]]:
+        starts, ends, cum = self._table
+        if starts and starts[0] <= t and self._worked_before(starts, ends, cum, t) + need < cum[-1]:
+            return self._table
+        with self._lock:
+            horizon = self.horizon_days
+            anchor = _naive_utc(t).date() - timedelta(days=1)
+            while True:
+                table = self._build(anchor, horizon)
+                starts, ends, cum = table
+                if starts and self._worked_before(starts, ends, cum, t) + need < cum[-1]:
+                    break
+                horizon *= 2
+            self._table = table
+            logger.debug(f"Built working-time table from {anchor} for {horizon} days")
+            return table
+
+    def _build(
+        self, anchor: date, days: int
+    ) -> Tuple[List[float], List[float], List[float]]:
+        starts: List[float] = []
+        ends: List[float] = []
+        cum = [0.0]
+        for offset in range(days):
+            day = anchor + timedelta(days=offset)
+            if day in self.holidays:
+                continue
+            for start_min, end_min in self.weekly[day.weekday()]:
+                start = self._local(day, start_min)
+                end = self._local(day, end_min)
+                if end <= start:
+                    continue
+                if ends and start <= ends[-1]:
+                    # Touching or overlapping intervals merge
+                    cum[-1] += max(end, ends[-1]) - ends[-1]
+                    ends[-1] = max(end, ends[-1])
+                    continue
+                starts.append(start)
+                ends.append(end)
+                cum.append(cum[-1] + end - start)
+        return starts, ends, cum
+
+    def _local(self, day: date, minutes: int) -> float:
+        local = datetime(day.year, day.month, day.day, tzinfo=self.tz) + timedelta(
+            minutes=minutes
+        )
+        return local.timestamp()
+
+
+def _timestamp(moment: datetime) -> float:
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def _naive_utc(t: float) -> datetime:
+    return datetime.fromtimestamp(t, tz=timezone.utc).replace(tzinfo=None)
+
+
+def add_sla_hours(
+    calendar: Optional[WorkingCalendar], start: datetime, hours: float
+) -> datetime:
+    """
+    Deadline `hours` after `start`: working hours on a calendar, wall-clock
+    hours without one.
+    """
+    if calendar is None:
+        return start + timedelta(hours=hours)
+    return calendar.add_hours(start, hours)
+
+
+class CalendarRegistry:
+    """
+    Compiled calendars and the role -> calendar assignments, reloaded in two
+    queries at most every CALENDAR_CACHE_SECONDS (calendars are few and
+    rarely edited). Edits through the API invalidate the local copy at once;
+    other processes pick them up on their next reload.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._loaded_at = 0.0
+        self._calendars: Dict[UUID, WorkingCalendar] = {}
+        self._role_calendars: Dict[UUID, UUID] = {}
+
+    def resolve(
+        self,
+        db: Session,
+        role_id: Optional[UUID] = None,
+        workflow_calendar_id: Optional[UUID] = None,
+    ) -> Optional[WorkingCalendar]:
+        """
+        The calendar of the step's team (its required role), else the
+        workflow's; None means hours are counted round the clock.
+        """
+        self._refresh(db)
+        calendar_id = self._role_calendars.get(role_id) if role_id else None
+        return self._calendars.get(calendar_id or workflow_calendar_id)
+
+    def get(self, db: Session, calendar_id: Optional[UUID]) -> Optional[WorkingCalendar]:
+        if calendar_id is None:
+            return None
+        self._refresh(db)
+        return self._calendars.get(calendar_id)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded_at = 0.0
+
+    def _refresh(self, db: Session) -> None:
+        if time.monotonic() - self._loaded_at < self.ttl_seconds:
+            return
+        calendars, role_calendars = {}, {}
+        for row in db.query(BusinessCalendar).options(
+            selectinload(BusinessCalendar.roles)
+        ):
+            try:
+                calendars[row.id] = WorkingCalendar(
+                    row.timezone,
+                    row.working_hours or {},
+                    row.holidays or [],
+                    settings.CALENDAR_HORIZON_DAYS,
+                )
+            except (ValueError, KeyError) as e:
+                logger.error(f"Skipping invalid calendar {row.id}: {e}")
+                continue
+            role_calendars.update((role.id, row.id) for role in row.roles)
+        with self._lock:
+            self._calendars = calendars
+            self._role_calendars = role_calendars
+            self._loaded_at = time.monotonic()
+
+
+calendars = CalendarRegistry(settings.CALENDAR_CACHE_SECONDS)
@@ -0,0 +1,123 @@
+"""
+Workflow Definition Cache
+Responsibility: Keep serialized workflow definitions (WorkflowSchema JSON)
+in an in-process LRU, optionally backed by Redis shared across nodes
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+import redis
+
+from app.core.config import settings
+
+logger = logging.getLogger("workflow-platform.definition_cache")
+
+
+class WorkflowDefinitionCache:
+    """
+    Entries are keyed by workflow id and updated_at, so a changed definition
+    is simply never looked up under its old key again; invalidate() only
+    frees the space early. Redis errors degrade to the local LRU.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        redis_url: Optional[str] = None,
+        ttl_seconds: int = 3600,
+        prefix: str = "workflow-platform:workflow-def",
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self._redis = redis.Redis.from_url(redis_url) if redis_url else None
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, workflow_id: UUID, updated_at: datetime) -> str:
+        return f"{workflow_id}:{updated_at.isoformat()}"
+
+    def get(self, workflow_id: UUID, updated_at: datetime) -> Optional[bytes]:
+        key = self._key(workflow_id, updated_at)
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return body
+
+        if self._redis is not None:
+            try:
+                body = self._redis.get(f"{self.prefix}:{key}")
+            except redis.RedisError as e:
+                logger.warning(f"Workflow cache read from Redis failed: {e}")
+                body = None
+            if body is not None:
+                self._store(key, body)
+                with self._lock:
+                    self.hits += 1
+                return body
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, workflow_id: UUID, updated_at: datetime, body: bytes) -> None:
+        key = self._key(workflow_id, updated_at)
+        self._store(key, body)
+        if self._redis is not None:
+            try:
+                self._redis.set(f"{self.prefix}:{key}", body, ex=self.ttl_seconds)
+            except redis.RedisError as e:
+                logger.warning(f"Workflow cache write to Redis failed: {e}")
+
+    def invalidate(self, workflow_id: UUID) -> None:
+        """
+        Drop every cached version of a workflow.
+        """
+        marker = f"{workflow_id}:"
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(marker)]:
+                del self._entries[key]
+        if self._redis is not None:
+            try:
+                stale = list(self._redis.scan_iter(f"{self.prefix}:{marker}*"))
+                if stale:
+                    self._redis.delete(*stale)
+            except redis.RedisError as e:
+                logger.warning(f"Workflow cache invalidation in Redis failed: {e}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "redis": self._redis is not None,
+            }
+
+    def _store(self, key: str, body: bytes) -> None:
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+definition_cache = WorkflowDefinitionCache(
+    settings.WORKFLOW_CACHE_SIZE,
+    settings.WORKFLOW_CACHE_REDIS_URL,
+    settings.WORKFLOW_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,114 @@
+"""
+Delegation Service
+Responsibility: Resolve out-of-office delegations at assignment,
+notification and authorization time
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from uuid import UUID
+
+from sqlalchemy.orm import Session, selectinload
+
+from app.core.config import settings
+from app.db.models.delegation import Delegation
+from app.db.models.user import Role, User
+
+logger = logging.getLogger("workflow-platform.delegation")
+
+
+class DelegationService:
+    @staticmethod
+    def delegates(
+        db: Session, user_ids: Iterable[UUID], at: Optional[datetime] = None
+    ) -> Dict[UUID, UUID]:
+        """
+        Direct delegate of each user with a delegation in effect at `at`
+        (default now); users who are not away are left out. One range scan
+        of ix_delegations_delegator_window. Of overlapping delegations the
+        one that started last wins.
+        """
+        user_ids = set(user_ids)
+        if not user_ids:
+            return {}
+        at = at or datetime.utcnow()
+        rows = (
+            db.query(Delegation)
+            .filter(
+                Delegation.delegator_id.in_(user_ids),
+                Delegation.starts_at <= at,
+                Delegation.ends_at > at,
+            )
+            .order_by(Delegation.starts_at)
+            .all()
+        )
+        return {row.delegator_id: row.delegate_id for row in rows}
+
+    @staticmethod
+    def resolve_many(
+        db: Session, user_ids: Iterable[UUID], at: Optional[datetime] = None
+    ) -> Dict[UUID, UUID]:
+        """
+        Who actually receives work meant for each user: the user, or the end
+        of their delegation chain (at most DELEGATION_MAX_HOPS, stopping
+        before a cycle). One query per hop.
+        """
+        resolved = {user_id: user_id for user_id in user_ids}
+        seen = {user_id: {user_id} for user_id in resolved}
+        pending = set(resolved)
+        for _ in range(settings.DELEGATION_MAX_HOPS):
+            hops = DelegationService.delegates(
+                db, {resolved[u] for u in pending}, at
+            )
+            moved = set()
+            for user_id in pending:
+                delegate = hops.get(resolved[user_id])
+                if delegate is None or delegate in seen[user_id]:
+                    continue
+                seen[user_id].add(delegate)
+                resolved[user_id] = delegate
+                moved.add(user_id)
+            if not moved:
+                break
+            pending = moved
+        return resolved
+
+    @staticmethod
+    def resolve(db: Session, user_id: UUID, at: Optional[datetime] = None) -> UUID:
+        return DelegationService.resolve_many(db, [user_id], at)[user_id]
+
+    @staticmethod
+    def covered(
+        db: Session, delegate_id: UUID, at: Optional[datetime] = None
+    ) -> List[User]:
+        """
+        Users `delegate_id` currently stands in for, directly or further up a
+        chain, with their roles and permissions loaded. One range scan of
+        ix_delegations_delegate_window per hop, plus one to load the users.
+        """
+        at = at or datetime.utcnow()
+        found = set()
+        frontier = {delegate_id}
+        for _ in range(settings.DELEGATION_MAX_HOPS):
+            rows = (
+                db.query(Delegation)
+                .filter(
+                    Delegation.delegate_id.in_(frontier),
+                    Delegation.starts_at <= at,
+                    Delegation.ends_at > at,
+                )
+                .all()
+            )
+            frontier = {row.delegator_id for row in rows} - found - {delegate_id}
+            if not frontier:
+                break
+            found |= frontier
+        if not found:
+            return []
+        return (
+            db.query(User)
+            .options(selectinload(User.roles).selectinload(Role.permissions))
+            .filter(User.id.in_(found), User.is_active == True)
+            .all()
+        )
@@ -0,0 +1,313 @@
+"""
+Event Bus
+Responsibility: Publish live inbox and request-status updates to connected
+clients (server-sent events), in process or across nodes over Redis pub/sub
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set
+
+import redis
+
+from app.core.config import settings
+from app.db.models.workflow import StepType
+from app.services import event_store, post_commit
+from app.services.serialization import to_jsonable
+
+logger = logging.getLogger("workflow-platform.event_bus")
+
+# Topics a connection listens on
+ALL_TASKS = "tasks:all"  # Admins see every task
+OPEN_TASKS = "tasks:open"  # Steps without a required role or permission
+STATS = "stats"
+
+
+def user_topic(user_id: Any) -> str:
+    return f"user:{user_id}"
+
+
+def assignee_topic(user_id: Any) -> str:
+    # Tasks assigned to the user; kept apart from user_topic so a delegate
+    # can follow someone's inbox without their request updates
+    return f"assignee:{user_id}"
+
+
+def role_topic(role_id: Any) -> str:
+    return f"role:{role_id}"
+
+
+def permission_topic(permission_id: Any) -> str:
+    return f"permission:{permission_id}"
+
+
+def role_permission_topic(role_id: Any, permission_id: Any) -> str:
+    # Steps requiring both: only holders of the pair subscribe to it
+    return f"role:{role_id}+permission:{permission_id}"
+
+
+def inbox_topics(user: Any) -> Set[str]:
+    """
+    Topics carrying a user's inbox updates, matching _task_topics.
+    """
+    role_ids = {role.id for role in user.roles}
+    permission_ids = {perm.id for role in user.roles for perm in role.permissions}
+    topics = {assignee_topic(user.id)}
+    topics.update(role_topic(role_id) for role_id in role_ids)
+    topics.update(permission_topic(perm_id) for perm_id in permission_ids)
+    topics.update(
+        role_permission_topic(role_id, perm_id)
+        for role_id in role_ids
+        for perm_id in permission_ids
+    )
+    return topics
+
+
+class Subscription:
+    """
+    One client connection: a bounded queue on the connection's event loop.
+    A client that falls too far behind gets a single "resync" message in
+    place of what it missed and should re-fetch its views.
+    """
+
+    def __init__(self, topics: Set[str], loop: asyncio.AbstractEventLoop, max_queue: int):
+        self.topics = topics
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max(max_queue, 1))
+        self.overflowed = False
+
+    def offer(self, message: Dict[str, Any]) -> None:
+        # Runs on self.loop
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"type": "resync"})
+
+    async def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        Next message, or None if nothing arrived within `timeout` seconds.
+        """
+        try:
+            message = await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if message.get("type") == "resync":
+            self.overflowed = False
+        return message
+
+
+class EventBus:
+    """
+    Topic-based fan-out to subscriptions on this node. With a Redis URL,
+    publish() goes through a Redis channel and a listener thread feeds every
+    node's local subscribers, this one included.
+    """
+
+    def __init__(self, redis_url: Optional[str] = None, channel: str = "events"):
+        self.redis_url = redis_url
+        self.channel = channel
+        self._subscribers: Dict[str, Set[Subscription]] = defaultdict(set)
+        self._lock = threading.Lock()
+        self._redis = None
+        self._listener: Optional[threading.Thread] = None
+
+    @asynccontextmanager
+    async def subscribe(
+        self, topics: Iterable[str], max_queue: Optional[int] = None
+    ) -> AsyncIterator[Subscription]:
+        subscription = Subscription(
+            set(topics),
+            asyncio.get_running_loop(),
+            max_queue or settings.EVENT_STREAM_QUEUE_SIZE,
+        )
+        with self._lock:
+            for topic in subscription.topics:
+                self._subscribers[topic].add(subscription)
+        if self.redis_url:
+            self._ensure_listener()
+        try:
+            yield subscription
+        finally:
+            with self._lock:
+                for topic in subscription.topics:
+                    self._subscribers[topic].discard(subscription)
+                    if not self._subscribers[topic]:
+                        del self._subscribers[topic]
+
+    def publish(self, topics: Iterable[str], message: Dict[str, Any]) -> None:
+        """
+        Send `message` to every subscriber of any of `topics`. Thread-safe.
+        """
+        topics = list(topics)
+        message = to_jsonable(message)
+        if self.redis_url:
+            try:
+                self._client().publish(
+                    self.channel, json.dumps({"topics": topics, "message": message})
+                )
+                return
+            except Exception as e:
+                # Keep this node's clients current even if Redis is down
+                logger.error(f"Redis publish failed, delivering locally only: {e}")
+        self.deliver(topics, message)
+
+    def deliver(self, topics: List[str], message: Dict[str, Any]) -> None:
+        """
+        Hand a message to this node's subscribers, each on its own loop.
+        A connection subscribed to several of the topics gets it once.
+        """
+        with self._lock:
+            targets = set()
+            for topic in topics:
+                targets.update(self._subscribers.get(topic, ()))
+        for subscription in targets:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, message)
+            except RuntimeError:
+                pass  # Loop already closed; the subscription is going away
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len({s for subs in self._subscribers.values() for s in subs})
+
+    def _client(self):
+        if self._redis is None:
+            self._redis = redis.Redis.from_url(self.redis_url)
+        return self._redis
+
+    def _ensure_listener(self) -> None:
+        with self._lock:
+            if self._listener is not None:
+                return
+            self._listener = threading.Thread(
+                target=self._listen, name="event-bus-redis", daemon=True
+            )
+            self._listener.start()
+
+    def _listen(self) -> None:
+        while True:
+            try:
+                pubsub = self._client().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                for item in pubsub.listen():
+                    data = json.loads(item["data"])
+                    self.deliver(data["topics"], data["message"])
+            except Exception as e:
+                logger.error(f"Redis event listener failed, reconnecting: {e}")
+                time.sleep(1)
+
+
+bus = EventBus(settings.EVENT_BUS_REDIS_URL, settings.EVENT_BUS_CHANNEL)
+
+
+def _task_topics(payload: Dict[str, Any]) -> List[str]:
+    """
+    Inbox topics of a step's task (matches the filter of my-tasks): its
+    assignee's, or those of the members it is open to.
+    """
+    topics = [ALL_TASKS]
+    if payload.get("assigned_to"):
+        topics.append(assignee_topic(payload["assigned_to"]))
+        return topics
+    role_id = payload.get("required_role_id")
+    permission_id = payload.get("required_permission_id")
+    if role_id and permission_id:
+        topics.append(role_permission_topic(role_id, permission_id))
+    elif role_id:
+        topics.append(role_topic(role_id))
+    elif permission_id:
+        topics.append(permission_topic(permission_id))
+    else:
+        topics.append(OPEN_TASKS)
+    return topics
+
+
+def _is_human(payload: Dict[str, Any]) -> bool:
+    return payload.get("step_type", StepType.HUMAN.value) == StepType.HUMAN.value
+
+
+def _request_update(payload: Dict[str, Any], **fields: Any) -> None:
+    if payload.get("requester_id"):
+        bus.publish(
+            [user_topic(payload["requester_id"])],
+            {
+                "type": "request_updated",
+                "request_id": payload["request_id"],
+                "workflow_id": payload.get("workflow_id"),
+                **fields,
+            },
+        )
+
+
+# Engine events, published once their transaction has committed
+
+@post_commit.handler(event_store.REQUEST_CREATED)
+def _on_request_created(payload: Dict[str, Any]) -> None:
+    _request_update(payload, status="IN_PROGRESS")
+    bus.publish([STATS], {"type": "stats_delta", "active": 1})
+
+
+@post_commit.handler(event_store.STEP_ACTIVATED)
+def _on_step_activated(payload: Dict[str, Any]) -> None:
+    _request_update(
+        payload,
+        current_step_id=payload["step_id"],
+        current_step_name=payload.get("step_name"),
+    )
+    bus.publish([STATS], {"type": "stats_delta", "pending": 1})
+    if _is_human(payload):
+        bus.publish(
+            _task_topics(payload),
+            {
+                "type": "task_added",
+                "request_id": payload["request_id"],
+                "request_step_id": payload["request_step_id"],
+                "workflow_id": payload.get("workflow_id"),
+                "step_id": payload["step_id"],
+                "step_name": payload.get("step_name"),
+                "deadline": payload.get("deadline"),
+            },
+        )
+
+
+def _task_closed(payload: Dict[str, Any], status: str) -> None:
+    if _is_human(payload):
+        bus.publish(
+            _task_topics(payload),
+            {
+                "type": "task_removed",
+                "request_id": payload["request_id"],
+                "request_step_id": payload["request_step_id"],
+                "status": status,
+            },
+        )
+
+
+@post_commit.handler(event_store.STEP_COMPLETED)
+def _on_step_completed(payload: Dict[str, Any]) -> None:
+    _task_closed(payload, payload["outcome"])
+    _request_update(payload, step_id=payload["step_id"], step_outcome=payload["outcome"])
+    bus.publish([STATS], {"type": "stats_delta", "pending": -1})
+
+
+@post_commit.handler(event_store.STEP_SKIPPED)
+def _on_step_skipped(payload: Dict[str, Any]) -> None:
+    _task_closed(payload, "SKIPPED")
+    if payload.get("previous_status") == "PENDING":
+        bus.publish([STATS], {"type": "stats_delta", "pending": -1})
+
+
+@post_commit.handler(event_store.REQUEST_COMPLETED)
+def _on_request_completed(payload: Dict[str, Any]) -> None:
+    _request_update(payload, status=payload["status"], outcome=payload.get("outcome"))
+    bus.publish([STATS], {"type": "stats_delta", "active": -1, "completed": 1})
@@ -0,0 +1,274 @@
+"""
+Event Store
+Responsibility: Append-only event stream per workflow request, snapshots,
+replay, and rebuilding the relational projections from the stream
+"""
+
+import logging
+from copy import deepcopy
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.exceptions import ResourceNotFoundError
+from app.db.models.event import RequestEvent, RequestSnapshot
+from app.db.models.request import (
+    WorkflowRequest,
+    RequestStep,
+    RequestStatus,
+    StepStatus,
+)
+from app.services import post_commit
+from app.services.serialization import to_jsonable
+
+logger = logging.getLogger("workflow-platform.event_store")
+
+# Event types emitted by WorkflowEngine
+REQUEST_CREATED = "REQUEST_CREATED"
+STEP_ACTIVATED = "STEP_ACTIVATED"
+STEP_WAITING = "STEP_WAITING"
+STEP_COMPLETED = "STEP_COMPLETED"
+STEP_SKIPPED = "STEP_SKIPPED"
+REQUEST_COMPLETED = "REQUEST_COMPLETED"
+
+
+def _parse_dt(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def apply_event(
+    state: Dict[str, Any], event_type: str, payload: Dict[str, Any], sequence: int
+) -> Dict[str, Any]:
+    """
+    Fold one event into the request state. `state` is modified and returned.
+    """
+    steps = state.setdefault("steps", {})
+    at = payload.get("at")
+
+    if event_type == REQUEST_CREATED:
+        state.update(
+            request_id=payload["request_id"],
+            workflow_id=payload["workflow_id"],
+            requester_id=payload.get("requester_id"),
+            request_data=payload.get("request_data"),
+            status=RequestStatus.IN_PROGRESS.value,
+            current_step_id=None,
+            created_at=at,
+            completed_at=None,
+        )
+    elif event_type in (STEP_ACTIVATED, STEP_WAITING):
+        step = steps.setdefault(payload["request_step_id"], {})
+        step.update(
+            step_id=payload["step_id"],
+            step_name=payload.get("step_name"),
+            branch_path=payload.get("branch_path"),
+        )
+        if event_type == STEP_ACTIVATED:
+            step.update(
+                status=StepStatus.PENDING.value,
+                started_at=at,
+                deadline=payload.get("deadline"),
+                assigned_to=payload.get("assigned_to"),
+            )
+            state["current_step_id"] = payload["step_id"]
+        else:
+            step.update(
+                status=StepStatus.WAITING.value,
+                join_arrivals=payload.get("join_arrivals"),
+            )
+    elif event_type == STEP_COMPLETED:
+        step = steps.setdefault(payload["request_step_id"], {})
+        step.update(
+            step_id=payload["step_id"],
+            status=payload["outcome"],
+            assigned_to=payload.get("actor_id"),
+            comments=payload.get("comment"),
+            completed_at=at,
+        )
+    elif event_type == STEP_SKIPPED:
+        steps.setdefault(payload["request_step_id"], {}).update(
+            status=StepStatus.SKIPPED.value, completed_at=at
+        )
+    elif event_type == REQUEST_COMPLETED:
+        state.update(
+            status=payload["status"],
+            outcome=payload.get("outcome"),
+            current_step_id=None,
+            completed_at=at,
+        )
+
+    state["sequence"] = sequence
+    return state
+
+
+class EventStore:
+    @staticmethod
+    def append(
+        db: Session,
+        request: WorkflowRequest,
+        event_type: str,
+        payload: Dict[str, Any],
+        actor_id: Optional[UUID] = None,
+    ) -> RequestEvent:
+        """
+        Append an event to the request's stream in the current transaction.
+        Callers hold the request row (created or locked), which serializes
+        sequence numbers; the unique (request_id, sequence) index backs it up.
+        """
+        sequence = (request.last_event_seq or 0) + 1
+        request.last_event_seq = sequence
+
+        payload = {"at": datetime.utcnow(), **payload}
+        event = RequestEvent(
+            request_id=request.id,
+            sequence=sequence,
+            event_type=event_type,
+            payload=to_jsonable(payload),
+            actor_id=actor_id,
+        )
+        db.add(event)
+        post_commit.emit(
+            db,
+            event_type,
+            **{
+                **event.payload,
+                "request_id": request.id,
+                "workflow_id": request.workflow_id,
+                "requester_id": request.requester_id,
+                "sequence": sequence,
+                "actor_id": actor_id,
+            },
+        )
+
+        if sequence % settings.EVENT_SNAPSHOT_INTERVAL == 0:
+            EventStore.snapshot(db, request.id)
+        return event
+
+    @staticmethod
+    def append_rows(
+        db: Session,
+        rows: List[Dict[str, Any]],
+        workflow_id: Optional[UUID] = None,
+        requester_id: Optional[UUID] = None,
+    ) -> None:
+        """
+        Insert pre-numbered events in one statement (bulk request creation).
+        Each row: request_id, sequence, event_type, payload, actor_id.
+        """
+        if not rows:
+            return
+        rows = [{**row, "payload": to_jsonable(row.get("payload"))} for row in rows]
+        db.execute(insert(RequestEvent), rows)
+        for row in rows:
+            post_commit.emit(
+                db,
+                row["event_type"],
+                **{
+                    **row["payload"],
+                    "request_id": row["request_id"],
+                    "workflow_id": workflow_id,
+                    "requester_id": requester_id,
+                    "sequence": row["sequence"],
+                    "actor_id": row.get("actor_id"),
+                },
+            )
+
+    @staticmethod
+    def timeline(db: Session, request_id: UUID) -> List[RequestEvent]:
+        """
+        The request's events in order, read with one index range scan.
+        """
+        return (
+            db.query(RequestEvent)
+            .filter(RequestEvent.request_id == request_id)
+            .order_by(RequestEvent.sequence)
+            .all()
+        )
+
+    @staticmethod
+    def replay(db: Session, request_id: UUID) -> Dict[str, Any]:
+        """
+        Current request state: the latest snapshot plus the events after it.
+        """
+        db.flush()
+        snapshot = (
+            db.query(RequestSnapshot)
+            .filter(RequestSnapshot.request_id == request_id)
+            .order_by(RequestSnapshot.sequence.desc())
+            .first()
+        )
+        state = deepcopy(snapshot.state) if snapshot else {}
+        after = snapshot.sequence if snapshot else 0
+
+        events = (
+            db.query(RequestEvent)
+            .filter(
+                RequestEvent.request_id == request_id,
+                RequestEvent.sequence > after,
+            )
+            .order_by(RequestEvent.sequence)
+            .all()
+        )
+        for event in events:
+            apply_event(state, event.event_type, event.payload or {}, event.sequence)
+
+        if not state:
+            raise ResourceNotFoundError(f"No events recorded for Request {request_id}")
+        return state
+
+    @staticmethod
+    def snapshot(db: Session, request_id: UUID) -> RequestSnapshot:
+        """
+        Store the folded state at the request's latest event.
+        """
+        state = EventStore.replay(db, request_id)
+        snapshot = RequestSnapshot(
+            request_id=request_id, sequence=state["sequence"], state=state
+        )
+        db.add(snapshot)
+        logger.debug(f"Snapshot of Request {request_id} at event {state['sequence']}")
+        return snapshot
+
+    @staticmethod
+    def rebuild_projection(db: Session, request_id: UUID) -> WorkflowRequest:
+        """
+        Rewrite the request's row and its request_steps from the event stream,
+        e.g. to repair a projection or backfill one after a schema change.
+        Does not commit.
+        """
+        state = EventStore.replay(db, request_id)
+        request = (
+            db.query(WorkflowRequest).filter(WorkflowRequest.id == request_id).first()
+        )
+        if not request:
+            raise ResourceNotFoundError(f"Request {request_id} not found")
+
+        request.status = RequestStatus(state["status"])
+        request.current_step_id = (
+            UUID(state["current_step_id"]) if state.get("current_step_id") else None
+        )
+        request.completed_at = _parse_dt(state.get("completed_at"))
+
+        existing = {e.id: e for e in request.request_steps}
+        for exec_id, step in state.get("steps", {}).items():
+            row = existing.get(UUID(exec_id))
+            if row is None:
+                row = RequestStep(id=UUID(exec_id), request_id=request.id)
+                db.add(row)
+            row.step_id = UUID(step["step_id"])
+            row.status = step["status"]
+            row.branch_path = step.get("branch_path")
+            row.started_at = _parse_dt(step.get("started_at"))
+            row.deadline = _parse_dt(step.get("deadline"))
+            row.completed_at = _parse_dt(step.get("completed_at"))
+            row.assigned_to = (
+                UUID(step["assigned_to"]) if step.get("assigned_to") else None
+            )
+            if step.get("join_arrivals") is not None:
+                row.join_arrivals = step["join_arrivals"]
+            if step.get("comments") is not None:
+                row.comments = step["comments"]
+        return request
@@ -0,0 +1,122 @@
+"""
+Outbox Service
+Responsibility: Record task calls in the caller's transaction and relay them
+to the Celery broker after commit, in batches
+"""
+
+import logging
+from datetime import datetime, timedelta
+from fnmatch import fnmatch
+from typing import Any, Dict, List, Optional
+from sqlalchemy.orm import Session
+
+from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.db.models.outbox import OutboxMessage
+from app.services.serialization import to_jsonable
+
+logger = logging.getLogger("workflow-platform.outbox")
+
+
+def _queue_for(task_name: str) -> Optional[str]:
+    """
+    Queue a task is routed to by celery_app.conf.task_routes (None = default).
+    """
+    for pattern, route in (celery_app.conf.task_routes or {}).items():
+        if fnmatch(task_name, pattern):
+            return route.get("queue")
+    return None
+
+
+class Outbox:
+    @staticmethod
+    def enqueue(db: Session, task_name: str, **kwargs: Any) -> OutboxMessage:
+        """
+        Record a task call to be published once the transaction commits.
+        Nothing reaches the broker if the transaction rolls back.
+        """
+        message = OutboxMessage(task_name=task_name, payload=to_jsonable(kwargs))
+        db.add(message)
+        return message
+
+    @staticmethod
+    def relay_batch(db: Session, batch_size: Optional[int] = None) -> int:
+        """
+        Publish up to `batch_size` pending messages and commit.
+        Messages are claimed with FOR UPDATE SKIP LOCKED, so several relays
+        can run side by side. Each target queue receives one broker message
+        carrying its whole share of the batch. Returns the number of messages
+        published.
+        """
+        batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+        messages = (
+            db.query(OutboxMessage)
+            .filter(OutboxMessage.dispatched_at == None)
+            .order_by(OutboxMessage.created_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        if not messages:
+            db.rollback()
+            return 0
+
+        # Imported here: the task module imports this service
+        from app.tasks.outbox import process_outbox_batch
+
+        by_queue: Dict[Optional[str], List[OutboxMessage]] = {}
+        for message in messages:
+            by_queue.setdefault(_queue_for(message.task_name), []).append(message)
+
+        published = 0
+        now = datetime.utcnow()
+        for queue, items in by_queue.items():
+            for message in items:
+                message.attempts += 1
+            try:
+                process_outbox_batch.apply_async(
+                    kwargs={
+                        "messages": [
+                            {
+                                "id": str(m.id),
+                                "task": m.task_name,
+                                "kwargs": m.payload,
+                            }
+                            for m in items
+                        ]
+                    },
+                    queue=queue,
+                )
+            except Exception as e:
+                logger.error(
+                    f"Failed to publish {len(items)} outbox messages to {queue or 'default'}: {e}"
+                )
+                for message in items:
+                    message.last_error = str(e)
+                continue
+
+            for message in items:
+                message.dispatched_at = now
+                message.last_error = None
+            published += len(items)
+
+        db.commit()
+        return published
+
+    @staticmethod
+    def purge(db: Session, older_than_hours: Optional[int] = None) -> int:
+        """
+        Delete dispatched messages past the retention window and commit.
+        """
+        hours = older_than_hours or settings.OUTBOX_RETENTION_HOURS
+        cutoff = datetime.utcnow() - timedelta(hours=hours)
+        deleted = (
+            db.query(OutboxMessage)
+            .filter(
+                OutboxMessage.dispatched_at != None,
+                OutboxMessage.dispatched_at < cutoff,
+            )
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+        return deleted
@@ -0,0 +1,210 @@
+"""
+Post-commit Dispatcher
+Responsibility: Collect side effects while a session's transaction is open
+and run them on a bounded background executor once it commits
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger("workflow-platform.post_commit")
+
+_INFO_KEY = "post_commit_effects"
+
+# Handlers for named side effects, e.g. "STEP_COMPLETED" -> [webhooks, ...]
+_handlers: Dict[str, List[Callable[[Dict[str, Any]], None]]] = defaultdict(list)
+
+
+def handler(name: str) -> Callable:
+    """
+    Register a side effect to run after commit whenever `name` is emitted.
+    Usage:
+        @handler("STEP_COMPLETED")
+        def invalidate_cache(payload):
+            ...
+    """
+
+    def decorator(func: Callable[[Dict[str, Any]], None]) -> Callable:
+        _handlers[name].append(func)
+        return func
+
+    return decorator
+
+
+class PostCommitExecutor:
+    """
+    Worker threads fed by a bounded queue.
+    When the queue is full the caller runs the task itself (caller-runs), so
+    a burst slows the producing request down instead of growing memory
+    without limit; every such fallback is counted as backpressure.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(max_queue, 1))
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.executed = 0
+        self.failed = 0
+        self.caller_runs = 0
+        self.peak_depth = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def submit(self, func: Callable, *args: Any, **kwargs: Any) -> None:
+        with self._lock:
+            self.submitted += 1
+        if self.workers <= 0:
+            self._run(func, args, kwargs, time.perf_counter())
+            return
+
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((func, args, kwargs, time.perf_counter()))
+        except queue.Full:
+            with self._lock:
+                self.caller_runs += 1
+            logger.warning("Post-commit queue full; running side effect inline")
+            self._run(func, args, kwargs, time.perf_counter())
+            return
+
+        with self._lock:
+            self.peak_depth = max(self.peak_depth, self._queue.qsize())
+
+    def drain(self, timeout: float = 5.0) -> bool:
+        """
+        Wait until every queued side effect has run (tests, shutdown).
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._queue.all_tasks_done:
+                if not self._queue.unfinished_tasks:
+                    return True
+            time.sleep(0.01)
+        return False
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            done = self.executed + self.failed
+            return {
+                "workers": self.workers,
+                "queue_depth": self._queue.qsize(),
+                "max_queue": self._queue.maxsize,
+                "peak_queue_depth": self.peak_depth,
+                "submitted": self.submitted,
+                "executed": self.executed,
+                "failed": self.failed,
+                "caller_runs": self.caller_runs,
+                "avg_queue_wait_ms": round(self.total_wait_seconds / done * 1000, 3)
+                if done
+                else 0.0,
+                "max_queue_wait_ms": round(self.max_wait_seconds * 1000, 3),
+            }
+
+    def _ensure_started(self) -> None:
+        if self._threads:
+            return
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(
+                    target=self._worker, name=f"post-commit-{i}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def _worker(self) -> None:
+        while True:
+            func, args, kwargs, queued_at = self._queue.get()
+            try:
+                self._run(func, args, kwargs, queued_at)
+            finally:
+                self._queue.task_done()
+
+    def _run(self, func: Callable, args: tuple, kwargs: dict, queued_at: float) -> None:
+        waited = time.perf_counter() - queued_at
+        try:
+            func(*args, **kwargs)
+            ok = True
+        except Exception as e:
+            ok = False
+            name = getattr(func, "__name__", func)
+            logger.error(f"Post-commit side effect {name} failed: {e}")
+        with self._lock:
+            if ok:
+                self.executed += 1
+            else:
+                self.failed += 1
+            self.total_wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+
+executor = PostCommitExecutor(
+    settings.POST_COMMIT_WORKERS, settings.POST_COMMIT_QUEUE_SIZE
+)
+
+
+def on_commit(db: Session, func: Callable, *args: Any, **kwargs: Any) -> None:
+    """
+    Run `func(*args, **kwargs)` in the background after `db` commits.
+    Dropped if the transaction (or the savepoint it was added in) rolls back.
+    """
+    if not db.in_transaction():
+        # Tie the effect to a transaction, so a rollback discards it
+        db.begin()
+    effects = db.info.setdefault(_INFO_KEY, [])
+    effects.append((db.get_nested_transaction(), func, args, kwargs))
+
+
+def emit(db: Session, name: str, **payload: Any) -> None:
+    """
+    Queue the handlers registered for `name` to run after commit.
+    """
+    if name in _handlers:
+        on_commit(db, _run_handlers, name, payload)
+
+
+def _run_handlers(name: str, payload: Dict[str, Any]) -> None:
+    for func in list(_handlers.get(name, ())):
+        try:
+            func(payload)
+        except Exception as e:
+            logger.error(f"Post-commit handler {func.__name__} for {name} failed: {e}")
+
+
+def _within(transaction: Any, ancestor: Any) -> bool:
+    while transaction is not None:
+        if transaction is ancestor:
+            return True
+        transaction = transaction.parent
+    return False
+
+
+@event.listens_for(Session, "after_commit")
+def _flush_effects(session):
+    for _, func, args, kwargs in session.info.pop(_INFO_KEY, ()):
+        executor.submit(func, *args, **kwargs)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_effects(session, previous_transaction):
+    if not previous_transaction.nested:
+        session.info.pop(_INFO_KEY, None)
+        return
+    # Savepoint rollback: drop only what was added inside it
+    effects = session.info.get(_INFO_KEY)
+    if effects:
+        session.info[_INFO_KEY] = [
+            e for e in effects if not _within(e[0], previous_transaction)
+        ]
@@ -0,0 +1,27 @@
+"""
+Serialization helpers
+Responsibility: Convert domain values into JSON-safe structures for JSON
+columns (event payloads, outbox messages)
+"""
+
+import enum
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+
+def to_jsonable(value: Any) -> Any:
+    """
+    Make a value JSON-safe (UUIDs, datetimes and enums as strings).
+    """
+    if isinstance(value, dict):
+        return {k: to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [to_jsonable(v) for v in value]
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
@@ -16,6 +16,7 @@ from app.db.models.request import (
 )
 from app.db.models.audit import SLAEscalation
 from app.services.audit_service import AuditService
+from app.services.calendar import calendars
 from app.tasks.notifications import send_sla_breach_email
 
 logger = logging.getLogger("workflow-platform.sla_monitor")
@@ -46,6 +47,12 @@ class SLAMonitor:
 
         breach_count = 0
         for step in overdue_steps:
+            calendar = calendars.resolve(
+                db, step.step.required_role_id, step.request.workflow.calendar_id
+            )
+            if calendar is not None and not calendar.is_working(now):
+                # Escalate when the team is back rather than overnight
+                continue
             try:
                 SLAMonitor._escalate_step(db, step)
                 breach_count += 1
@@ -0,0 +1,191 @@
+"""
+Step Statistics
+Responsibility: Aggregate step durations and SLA breaches per workflow step
+into stored periods, and summarize them for SLA tuning
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import func, insert, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models.request import RequestStep, StepStatus
+from app.db.models.stats import StepDurationStat
+from app.db.models.workflow import WorkflowStep
+from app.services.quantile_sketch import QuantileSketch
+
+logger = logging.getLogger("workflow-platform.step_stats")
+
+# Steps that were actually worked on; skipped branches have no duration
+_DECIDED = (StepStatus.APPROVED, StepStatus.REJECTED)
+
+# pg_advisory_xact_lock key serializing aggregation runs
+_AGGREGATE_LOCK_KEY = 0x57A75
+
+
+def _hours(value: Optional[float]) -> float:
+    return round(value or 0.0, 4)
+
+
+class StepStatistics:
+    @staticmethod
+    def aggregate(db: Session, until: Optional[datetime] = None) -> int:
+        """
+        Aggregate steps completed since the previous run's period_end (or the
+        backfill horizon) up to `until` into one StepDurationStat per step.
+        `until` defaults to STEP_STATS_SETTLE_SECONDS ago, so a step stamped
+        completed just before a run but committed after it is still ahead of
+        the watermark.
+
+        Rows are streamed in batches of STEP_STATS_BATCH_SIZE into a quantile
+        sketch per step, so memory depends on the number of steps, not on the
+        number of executions. Returns the number of rows written; does not
+        commit.
+
+        Runs are serialized (the periodic task and an admin refresh may
+        overlap): on PostgreSQL a transaction-level advisory lock is held
+        until the caller commits, so the next run reads the new period_end.
+        The unique (step_id, period_start) constraint rejects a duplicate
+        period on any backend.
+        """
+        if db.get_bind().dialect.name == "postgresql":
+            db.execute(
+                text("SELECT pg_advisory_xact_lock(:key)"),
+                {"key": _AGGREGATE_LOCK_KEY},
+            )
+        period_end = until or datetime.utcnow() - timedelta(
+            seconds=settings.STEP_STATS_SETTLE_SECONDS
+        )
+        period_start = db.query(func.max(StepDurationStat.period_end)).scalar()
+        if period_start is None:
+            period_start = period_end - timedelta(days=settings.STEP_STATS_BACKFILL_DAYS)
+        if period_start >= period_end:
+            return 0
+
+        rows = (
+            db.query(
+                RequestStep.step_id,
+                RequestStep.started_at,
+                RequestStep.completed_at,
+                RequestStep.deadline,
+                RequestStep.is_sla_breached,
+            )
+            .filter(
+                RequestStep.completed_at > period_start,
+                RequestStep.completed_at <= period_end,
+                RequestStep.started_at.isnot(None),
+                RequestStep.status.in_(_DECIDED),
+            )
+            .execution_options(yield_per=settings.STEP_STATS_BATCH_SIZE)
+        )
+        sketches: Dict[UUID, QuantileSketch] = {}
+        breaches: Dict[UUID, int] = {}
+        for step_id, started_at, completed_at, deadline, is_breached in rows:
+            sketch = sketches.get(step_id)
+            if sketch is None:
+                sketch = sketches[step_id] = QuantileSketch(
+                    settings.STEP_STATS_RELATIVE_ACCURACY
+                )
+                breaches[step_id] = 0
+            sketch.add((completed_at - started_at).total_seconds() / 3600)
+            if is_breached or (deadline is not None and completed_at > deadline):
+                breaches[step_id] += 1
+
+        stats = [
+            {
+                "step_id": step_id,
+                "period_start": period_start,
+                "period_end": period_end,
+                "breach_count": breaches[step_id],
+                **StepStatistics._figures(sketch),
+                "sketch": sketch.to_dict(),
+            }
+            for step_id, sketch in sketches.items()
+        ]
+        if stats:
+            db.execute(insert(StepDurationStat), stats)
+        logger.info(
+            f"Aggregated {sum(s.count for s in sketches.values())} step executions "
+            f"for {len(stats)} steps ({period_start} - {period_end})"
+        )
+        return len(stats)
+
+    @staticmethod
+    def summary(
+        db: Session,
+        workflow_id: Optional[UUID] = None,
+        days: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Percentiles and breach rate per step over the periods that ended in
+        the last `days` days, merged from the stored sketches.
+        """
+        since = datetime.utcnow() - timedelta(
+            days=days or settings.STEP_STATS_SUMMARY_DAYS
+        )
+        query = (
+            db.query(StepDurationStat, WorkflowStep)
+            .join(WorkflowStep, WorkflowStep.id == StepDurationStat.step_id)
+            .filter(StepDurationStat.period_end > since)
+            .order_by(WorkflowStep.workflow_id, WorkflowStep.step_order)
+        )
+        if workflow_id:
+            query = query.filter(WorkflowStep.workflow_id == workflow_id)
+
+        merged: Dict[UUID, Dict[str, Any]] = {}
+        for stat, step in query:
+            entry = merged.get(step.id)
+            if entry is None:
+                entry = merged[step.id] = {
+                    "step": step,
+                    "sketch": QuantileSketch(stat.sketch["relative_accuracy"]),
+                    "breach_count": 0,
+                    "periods": 0,
+                }
+            entry["sketch"].merge(QuantileSketch.from_dict(stat.sketch))
+            entry["breach_count"] += stat.breach_count
+            entry["periods"] += 1
+
+        return [
+            {
+                "step_id": entry["step"].id,
+                "workflow_id": entry["step"].workflow_id,
+                "step_name": entry["step"].name,
+                "sla_hours": entry["step"].sla_hours,
+                "breach_count": entry["breach_count"],
+                "breach_rate": round(
+                    entry["breach_count"] / entry["sketch"].count, 4
+                ),
+                "periods": entry["periods"],
+                **StepStatistics._figures(entry["sketch"]),
+            }
+            for entry in merged.values()
+        ]
+
+    @staticmethod
+    def history(db: Session, step_id: UUID, limit: int = 30) -> List[StepDurationStat]:
+        """
+        The step's stored periods, newest first, for trend comparisons.
+        """
+        return (
+            db.query(StepDurationStat)
+            .filter(StepDurationStat.step_id == step_id)
+            .order_by(StepDurationStat.period_end.desc())
+            .limit(limit)
+            .all()
+        )
+
+    @staticmethod
+    def _figures(sketch: QuantileSketch) -> Dict[str, Any]:
+        return {
+            "sample_count": sketch.count,
+            "p50_hours": _hours(sketch.quantile(0.5)),
+            "p90_hours": _hours(sketch.quantile(0.9)),
+            "p99_hours": _hours(sketch.quantile(0.99)),
+            "mean_hours": _hours(sketch.mean),
+            "max_hours": _hours(sketch.max),
+        }
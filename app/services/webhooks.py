@@ -0,0 +1,369 @@
+"""
+Webhook Service
+Responsibility: Record webhook deliveries for audited workflow events and
+send them to subscribed endpoints in batches, with retries
+"""
+
+import hashlib
+import hmac
+import json
+import logging
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from itertools import zip_longest
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from uuid import UUID
+
+import httpx
+from sqlalchemy import distinct, func, insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models.webhook import (
+    WebhookSubscription,
+    WebhookDelivery,
+    DeliveryStatus,
+)
+from app.services.serialization import to_jsonable
+
+logger = logging.getLogger("workflow-platform.webhooks")
+
+# Audit actions that are published to subscribers
+WEBHOOK_EVENTS = (
+    "WORKFLOW_STARTED",
+    "STEP_COMPLETED",
+    "WORKFLOW_COMPLETED",
+    "SLA_BREACH_DETECTED",
+)
+
+SIGNATURE_HEADER = "X-Webhook-Signature"
+TIMESTAMP_HEADER = "X-Webhook-Timestamp"
+
+# Active subscriptions as (id, event types), refreshed every
+# WEBHOOK_SUBSCRIPTION_CACHE_SECONDS so audited actions don't each query them
+_subscriptions: Optional[List[Tuple[UUID, frozenset]]] = None
+_subscriptions_loaded_at = 0.0
+_subscriptions_lock = threading.Lock()
+
+# Shared across delivery runs so connections to each endpoint are kept alive
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> httpx.Client:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = httpx.Client(
+                    timeout=settings.WEBHOOK_TIMEOUT_SECONDS,
+                    limits=httpx.Limits(
+                        max_connections=settings.WEBHOOK_MAX_CONNECTIONS,
+                        max_keepalive_connections=settings.WEBHOOK_MAX_CONNECTIONS,
+                    ),
+                )
+    return _client
+
+
+def sign(secret: str, timestamp: str, body: bytes) -> str:
+    """
+    Signature consumers recompute to verify a delivery:
+    HMAC-SHA256 of "<timestamp>.<body>" keyed with the subscription secret.
+    """
+    message = timestamp.encode() + b"." + body
+    digest = hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+    return f"sha256={digest}"
+
+
+def backoff_seconds(attempts: int) -> float:
+    """
+    Delay before retry number `attempts`: exponential, capped, with jitter so
+    deliveries that failed together don't retry together.
+    """
+    delay = min(
+        settings.WEBHOOK_BACKOFF_BASE_SECONDS * 2 ** max(attempts - 1, 0),
+        settings.WEBHOOK_BACKOFF_MAX_SECONDS,
+    )
+    return delay * random.uniform(0.5, 1.0)
+
+
+class WebhookService:
+    @staticmethod
+    def invalidate_cache() -> None:
+        global _subscriptions
+        with _subscriptions_lock:
+            _subscriptions = None
+
+    @staticmethod
+    def _subscribers(db: Session, event_type: str) -> List[UUID]:
+        global _subscriptions, _subscriptions_loaded_at
+        with _subscriptions_lock:
+            expired = (
+                time.monotonic() - _subscriptions_loaded_at
+                > settings.WEBHOOK_SUBSCRIPTION_CACHE_SECONDS
+            )
+            if _subscriptions is None or expired:
+                rows = (
+                    db.query(WebhookSubscription.id, WebhookSubscription.event_types)
+                    .filter(WebhookSubscription.is_active == True)
+                    .all()
+                )
+                _subscriptions = [(sub_id, frozenset(events or ())) for sub_id, events in rows]
+                _subscriptions_loaded_at = time.monotonic()
+            return [sub_id for sub_id, events in _subscriptions if event_type in events]
+
+    @staticmethod
+    def build_payload(
+        event_type: str,
+        resource_type: str,
+        resource_id: str,
+        actor_id: Optional[UUID] = None,
+        request_id: Optional[UUID] = None,
+        meta_data: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        return {
+            "event": event_type,
+            "occurred_at": datetime.utcnow(),
+            "resource_type": resource_type,
+            "resource_id": str(resource_id),
+            "request_id": request_id,
+            "actor_id": actor_id,
+            "data": meta_data or {},
+        }
+
+    @staticmethod
+    def enqueue(db: Session, event_type: str, payload: Dict[str, Any]) -> int:
+        """
+        Record a delivery per subscriber in the caller's transaction, so events
+        are only published if the change that caused them commits.
+        Returns the number of deliveries recorded.
+        """
+        return WebhookService.enqueue_many(db, event_type, [payload])
+
+    @staticmethod
+    def enqueue_many(
+        db: Session, event_type: str, payloads: List[Dict[str, Any]]
+    ) -> int:
+        if event_type not in WEBHOOK_EVENTS or not payloads:
+            return 0
+        subscribers = WebhookService._subscribers(db, event_type)
+        if not subscribers:
+            return 0
+
+        now = datetime.utcnow()
+        rows = []
+        for payload in payloads:
+            for subscription_id in subscribers:
+                delivery_id = uuid.uuid4()
+                rows.append(
+                    {
+                        "id": delivery_id,
+                        "subscription_id": subscription_id,
+                        "event_type": event_type,
+                        # The id lets consumers drop duplicates after a retry
+                        "payload": to_jsonable({"id": delivery_id, **payload}),
+                        "status": DeliveryStatus.PENDING,
+                        "attempts": 0,
+                        "next_attempt_at": now,
+                    }
+                )
+        db.execute(insert(WebhookDelivery), rows)
+        return len(rows)
+
+
+class WebhookDispatcher:
+    """
+    Sends due deliveries in batches of WEBHOOK_BATCH_SIZE events. A
+    subscription never has more than max_concurrency batches in flight,
+    counted across overlapping runs and workers, so a consumer with a backlog
+    or slow responses only ever ties up its own share of the senders.
+    """
+
+    @staticmethod
+    def claim(db: Session) -> List[Dict[str, Any]]:
+        """
+        Lease due deliveries in batches, each with its own lease_id, by pushing
+        their next_attempt_at past WEBHOOK_LEASE_SECONDS, and commit. Batches
+        still leased count against max_concurrency, so only the free slots
+        are claimed. Subscriptions are locked with SKIP LOCKED while claiming,
+        so concurrent workers never count the same free slots; a worker that
+        dies mid-run leaves its deliveries to be picked up once the lease ends.
+        """
+        now = datetime.utcnow()
+        lease_until = now + timedelta(seconds=settings.WEBHOOK_LEASE_SECONDS)
+        size = settings.WEBHOOK_BATCH_SIZE
+        subscriptions = (
+            db.query(WebhookSubscription)
+            .filter(
+                WebhookSubscription.is_active == True,
+                WebhookSubscription.deliveries.any(
+                    (WebhookDelivery.status == DeliveryStatus.PENDING)
+                    & (WebhookDelivery.next_attempt_at <= now)
+                ),
+            )
+            .with_for_update(skip_locked=True, of=WebhookSubscription)
+            .all()
+        )
+        in_flight = dict(
+            db.query(
+                WebhookDelivery.subscription_id,
+                func.count(distinct(WebhookDelivery.lease_id)),
+            )
+            .filter(
+                WebhookDelivery.subscription_id.in_([s.id for s in subscriptions]),
+                WebhookDelivery.status == DeliveryStatus.PENDING,
+                WebhookDelivery.lease_id.isnot(None),
+                WebhookDelivery.next_attempt_at > now,
+            )
+            .group_by(WebhookDelivery.subscription_id)
+            .all()
+        ) if subscriptions else {}
+
+        claimed = []
+        for subscription in subscriptions:
+            free = max(subscription.max_concurrency or 1, 1) - in_flight.get(
+                subscription.id, 0
+            )
+            if free <= 0:
+                continue
+            deliveries = (
+                db.query(WebhookDelivery)
+                .filter(
+                    WebhookDelivery.subscription_id == subscription.id,
+                    WebhookDelivery.status == DeliveryStatus.PENDING,
+                    WebhookDelivery.next_attempt_at <= now,
+                )
+                .order_by(WebhookDelivery.next_attempt_at, WebhookDelivery.created_at)
+                .limit(free * size)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+            if not deliveries:
+                continue
+            # send() splits the deliveries into the same batches
+            for i, delivery in enumerate(deliveries):
+                if i % size == 0:
+                    lease_id = uuid.uuid4()
+                delivery.lease_id = lease_id
+                delivery.next_attempt_at = lease_until
+            claimed.append(
+                {
+                    "subscription_id": subscription.id,
+                    "url": subscription.url,
+                    "secret": subscription.secret,
+                    "deliveries": [(d.id, d.payload) for d in deliveries],
+                }
+            )
+        db.commit()
+        return claimed
+
+    @staticmethod
+    def post_batch(
+        client: httpx.Client, url: str, secret: Optional[str], events: List[Dict[str, Any]]
+    ) -> Tuple[Optional[int], Optional[str]]:
+        """
+        POST one batch. Returns (status code, error); error is None on 2xx.
+        """
+        body = json.dumps({"events": events}, separators=(",", ":")).encode()
+        timestamp = str(int(time.time()))
+        headers = {"Content-Type": "application/json", TIMESTAMP_HEADER: timestamp}
+        if secret:
+            headers[SIGNATURE_HEADER] = sign(secret, timestamp, body)
+        try:
+            response = client.post(url, content=body, headers=headers)
+        except httpx.HTTPError as e:
+            return None, f"{type(e).__name__}: {e}"
+        if response.is_success:
+            return response.status_code, None
+        return response.status_code, f"HTTP {response.status_code}: {response.text[:500]}"
+
+    @staticmethod
+    def send(
+        claimed: List[Dict[str, Any]], client: Optional[httpx.Client] = None
+    ) -> Iterator[Tuple[List[UUID], Optional[int], Optional[str]]]:
+        """
+        Send the claimed deliveries, endpoints in parallel over the pooled
+        client. Yields (delivery ids, status code, error) per batch as each
+        one finishes, so a slow endpoint doesn't hold back the others.
+        """
+        client = client or get_client()
+        per_endpoint = []
+        for item in claimed:
+            deliveries = item["deliveries"]
+            size = settings.WEBHOOK_BATCH_SIZE
+            per_endpoint.append(
+                [(item, deliveries[i : i + size]) for i in range(0, len(deliveries), size)]
+            )
+        # Round-robin, so no endpoint's batches are all queued ahead of others
+        batches = [b for group in zip_longest(*per_endpoint) for b in group if b]
+        if not batches:
+            return
+
+        workers = min(len(batches), settings.WEBHOOK_MAX_CONNECTIONS)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="webhook") as pool:
+            futures = {
+                pool.submit(
+                    WebhookDispatcher.post_batch,
+                    client,
+                    item["url"],
+                    item["secret"],
+                    [payload for _, payload in chunk],
+                ): [delivery_id for delivery_id, _ in chunk]
+                for item, chunk in batches
+            }
+            for future in as_completed(futures):
+                yield (futures[future], *future.result())
+
+    @staticmethod
+    def record(
+        db: Session, results: List[Tuple[List[UUID], Optional[int], Optional[str]]]
+    ) -> int:
+        """
+        Mark sent batches delivered and schedule retries for failed ones,
+        then commit. Returns the number of deliveries that succeeded.
+        """
+        delivered = 0
+        now = datetime.utcnow()
+        for ids, status_code, error in results:
+            deliveries = db.query(WebhookDelivery).filter(WebhookDelivery.id.in_(ids)).all()
+            for delivery in deliveries:
+                delivery.lease_id = None
+                delivery.attempts += 1
+                delivery.last_status_code = status_code
+                delivery.last_error = error
+                if error is None:
+                    delivery.status = DeliveryStatus.DELIVERED
+                    delivery.delivered_at = now
+                    delivered += 1
+                elif delivery.attempts >= settings.WEBHOOK_MAX_ATTEMPTS:
+                    delivery.status = DeliveryStatus.FAILED
+                    logger.error(
+                        f"Webhook delivery {delivery.id} abandoned after {delivery.attempts} attempts: {error}"
+                    )
+                else:
+                    delivery.next_attempt_at = now + timedelta(
+                        seconds=backoff_seconds(delivery.attempts)
+                    )
+            if error is not None:
+                logger.warning(f"Webhook batch of {len(ids)} failed: {error}")
+        db.commit()
+        return delivered
+
+    @staticmethod
+    def run_once(db: Session, client: Optional[httpx.Client] = None) -> Tuple[int, int]:
+        """
+        One claim/send/record cycle. Each batch is recorded as soon as it
+        finishes, freeing its endpoint's slot for other runs. Returns
+        (claimed, delivered).
+        """
+        claimed = WebhookDispatcher.claim(db)
+        if not claimed:
+            return 0, 0
+        delivered = 0
+        for result in WebhookDispatcher.send(claimed, client):
+            delivered += WebhookDispatcher.record(db, [result])
+        return sum(len(item["deliveries"]) for item in claimed), delivered
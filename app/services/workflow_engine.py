@@ -4,13 +4,22 @@ Responsibility: Manage the lifecycle of workflow requests and step orchestration
 """
 
 import logging
-from typing import List, Optional, Any, Dict, Union
+import uuid
+from typing import Callable, FrozenSet, List, Optional, Any, Dict, Set, Union
 from uuid import UUID
-from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+from datetime import datetime
+from sqlalchemy import event, insert, or_
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, contains_eager, joinedload
 
 from app.db.models.user import User, Role, Permission
-from app.db.models.workflow import Workflow, WorkflowStep, StepTransition
+from app.db.models.workflow import (
+    Workflow,
+    WorkflowStep,
+    StepTransition,
+    StepType,
+    JoinPolicy,
+)
 from app.db.models.request import (
     WorkflowRequest,
     RequestStep,
@@ -19,14 +28,31 @@ from app.db.models.request import (
     RequestStateHistory,
 )
 from app.db.models.audit import AuditLog
+from app.services.assignment import AssignmentService, load_counter
 from app.services.state_machine import validate_transition
 from app.services.audit_service import AuditService
+from app.services.automation import AutomationService
+from app.services.delegation import DelegationService
+from app.services.calendar import WorkingCalendar, add_sla_hours, calendars
+from app.services import event_store
+from app.services.event_store import EventStore
+from app.services import event_bus  # noqa: F401  (live-update handlers)
+from app.services.outbox import Outbox
+from app.services.webhooks import WebhookService
+from app.services.workflow_graph import CompiledVersion, OutcomeTable, outcome_tables
+from app.core.config import settings
 from app.core.exceptions import (
+    ConcurrencyConflictError,
     WorkflowEngineError,
     ConditionEvaluationError,
+    InvalidStateTransitionError,
     PermissionDeniedError,
 )
-from app.tasks.notifications import notify_new_assignment
+from app.tasks.notifications import (
+    notify_new_assignment,
+    notify_new_assignments_batch,
+)
+from app.tasks.automation import run_automatic_steps
 
 logger = logging.getLogger("workflow-platform.workflow_engine")
 
@@ -124,19 +150,12 @@ class WorkflowEngine:
         """
         Initiate a workflow instance.
         """
-        workflow = (
-            db.query(Workflow)
-            .filter(Workflow.id == workflow_id, Workflow.is_active == True)
-            .first()
-        )
-        if not workflow:
-            raise WorkflowEngineError(
-                f"Workflow definition {workflow_id} not found or inactive"
-            )
+        workflow = WorkflowEngine._get_active_workflow(db, workflow_id)
 
         # Create the request instance
         request = WorkflowRequest(
             workflow_id=workflow_id,
+            workflow_version_id=workflow.current_version_id,
             requester_id=requester_id,
             request_data=data,
             status=RequestStatus.CREATED,
@@ -160,32 +179,47 @@ class WorkflowEngine:
         db.add(history)
 
         # Initialize first step
-        first_step = (
-            db.query(WorkflowStep)
-            .filter(
-                WorkflowStep.workflow_id == workflow_id, WorkflowStep.step_order == 1
-            )
-            .first()
-        )
-
-        if not first_step:
-            raise WorkflowEngineError(
-                "Workflow started but no first step (order=1) is defined"
-            )
+        first_step = WorkflowEngine._get_first_step(db, workflow)
 
         now = datetime.utcnow()
-        deadline = now + timedelta(hours=first_step.sla_hours)
+        calendar = calendars.resolve(db, first_step.required_role_id, workflow.calendar_id)
+        deadline = add_sla_hours(calendar, now, first_step.sla_hours)
+        request.projected_completion_at = WorkflowEngine._projected_completion(
+            db,
+            workflow.current_version_id,
+            first_step.id,
+            deadline,
+            data,
+            workflow.calendar_id,
+        )
 
         engine_step = RequestStep(
+            id=uuid.uuid4(),
             request_id=request.id,
             step_id=first_step.id,
             status=StepStatus.PENDING,
             started_at=now,
             deadline=deadline,
+            assigned_to=AssignmentService.pick(db, first_step),
         )
         db.add(engine_step)
         request.current_step_id = first_step.id
 
+        EventStore.append(
+            db,
+            request,
+            event_store.REQUEST_CREATED,
+            {
+                "request_id": request.id,
+                "workflow_id": workflow_id,
+                "workflow_version_id": workflow.current_version_id,
+                "requester_id": requester_id,
+                "request_data": data,
+            },
+            actor_id=requester_id,
+        )
+        WorkflowEngine._record_activation(db, request, engine_step, first_step)
+
         # System Audit
         AuditService.log_action(
             db,
@@ -197,18 +231,222 @@ class WorkflowEngine:
             meta_data={"workflow_id": str(workflow_id)},
         )
 
-        # Trigger notification
-        notify_new_assignment.delay(
-            step_id=first_step.id,
-            request_id=request.id,
-            workflow_name=workflow.name,
-            step_name=first_step.name,
-            deadline=deadline.isoformat(),
-        )
+        # Trigger notification, or hand the step to a worker (sent after commit)
+        if first_step.step_type == StepType.AUTOMATIC:
+            WorkflowEngine._queue_automatic(db, request.id)
+        else:
+            Outbox.enqueue(
+                db,
+                notify_new_assignment.name,
+                step_id=first_step.id,
+                request_id=request.id,
+                workflow_name=workflow.name,
+                step_name=first_step.name,
+                deadline=deadline.isoformat(),
+                assignee_id=engine_step.assigned_to,
+            )
 
         logger.info(f"Started WorkflowRequest {request.id} for Workflow {workflow_id}")
         return request
 
+    @staticmethod
+    def start_workflows_bulk(
+        db: Session,
+        workflow_id: UUID,
+        requester_id: UUID,
+        payloads: List[Dict[str, Any]],
+    ) -> List[UUID]:
+        """
+        Initiate many instances of one workflow in a single transaction.
+        The definition is resolved once, ids are generated client-side and every
+        table receives one multi-row INSERT. Notifications go out as one task.
+        """
+        workflow = WorkflowEngine._get_active_workflow(db, workflow_id)
+        first_step = WorkflowEngine._get_first_step(db, workflow)
+        validate_transition(RequestStatus.CREATED, RequestStatus.IN_PROGRESS)
+
+        now = datetime.utcnow()
+        calendar = calendars.resolve(db, first_step.required_role_id, workflow.calendar_id)
+        deadline = add_sla_hours(calendar, now, first_step.sla_hours)
+
+        request_rows, step_rows, history_rows, audit_rows = [], [], [], []
+        event_rows = []
+        for data in payloads:
+            request_id = uuid.uuid4()
+            request_step_id = uuid.uuid4()
+            assignee_id = AssignmentService.pick(db, first_step)
+            request_rows.append(
+                {
+                    "id": request_id,
+                    "workflow_id": workflow_id,
+                    "workflow_version_id": workflow.current_version_id,
+                    "requester_id": requester_id,
+                    "request_data": data or {},
+                    "status": RequestStatus.IN_PROGRESS,
+                    "current_step_id": first_step.id,
+                    "projected_completion_at": WorkflowEngine._projected_completion(
+                        db,
+                        workflow.current_version_id,
+                        first_step.id,
+                        deadline,
+                        data,
+                        workflow.calendar_id,
+                    ),
+                    "last_event_seq": 2,
+                }
+            )
+            step_rows.append(
+                {
+                    "id": request_step_id,
+                    "request_id": request_id,
+                    "step_id": first_step.id,
+                    "status": StepStatus.PENDING,
+                    "started_at": now,
+                    "deadline": deadline,
+                    "assigned_to": assignee_id,
+                }
+            )
+            event_rows.append(
+                {
+                    "request_id": request_id,
+                    "sequence": 1,
+                    "event_type": event_store.REQUEST_CREATED,
+                    "actor_id": requester_id,
+                    "payload": {
+                        "at": now,
+                        "request_id": request_id,
+                        "workflow_id": workflow_id,
+                        "workflow_version_id": workflow.current_version_id,
+                        "requester_id": requester_id,
+                        "request_data": data or {},
+                    },
+                }
+            )
+            event_rows.append(
+                {
+                    "request_id": request_id,
+                    "sequence": 2,
+                    "event_type": event_store.STEP_ACTIVATED,
+                    "actor_id": None,
+                    "payload": {
+                        "at": now,
+                        "request_step_id": request_step_id,
+                        "step_id": first_step.id,
+                        "step_name": first_step.name,
+                        "branch_path": None,
+                        "deadline": deadline,
+                        **WorkflowEngine._audience(first_step, assignee_id),
+                    },
+                }
+            )
+            history_rows.append(
+                {
+                    "id": uuid.uuid4(),
+                    "request_id": request_id,
+                    "from_status": RequestStatus.CREATED,
+                    "to_status": RequestStatus.IN_PROGRESS,
+                    "changed_by": requester_id,
+                    "reason": "Workflow initiation (bulk)",
+                }
+            )
+            audit_rows.append(
+                {
+                    "id": uuid.uuid4(),
+                    "action": "WORKFLOW_STARTED",
+                    "resource_type": "workflow_request",
+                    "resource_id": str(request_id),
+                    "actor_id": requester_id,
+                    "request_id": request_id,
+                    "meta_data": {"workflow_id": str(workflow_id), "bulk": True},
+                }
+            )
+
+        if not request_rows:
+            return []
+
+        db.execute(insert(WorkflowRequest), request_rows)
+        db.execute(insert(RequestStep), step_rows)
+        db.execute(insert(RequestStateHistory), history_rows)
+        db.execute(insert(AuditLog), audit_rows)
+        # The audit rows bypass AuditService, so publish them here
+        WebhookService.enqueue_many(
+            db,
+            "WORKFLOW_STARTED",
+            [
+                WebhookService.build_payload(
+                    row["action"],
+                    row["resource_type"],
+                    row["resource_id"],
+                    actor_id=row["actor_id"],
+                    request_id=row["request_id"],
+                    meta_data=row["meta_data"],
+                )
+                for row in audit_rows
+            ],
+        )
+        EventStore.append_rows(
+            db, event_rows, workflow_id=workflow_id, requester_id=requester_id
+        )
+
+        if first_step.step_type == StepType.AUTOMATIC:
+            for row in request_rows:
+                WorkflowEngine._queue_automatic(db, row["id"])
+        else:
+            Outbox.enqueue(
+                db,
+                notify_new_assignments_batch.name,
+                step_id=first_step.id,
+                workflow_name=workflow.name,
+                step_name=first_step.name,
+                assignments=[
+                    {
+                        "request_id": str(row["request_id"]),
+                        "deadline": deadline.isoformat(),
+                        "assignee_id": row["assigned_to"],
+                    }
+                    for row in step_rows
+                ],
+            )
+
+        logger.info(
+            f"Bulk started {len(request_rows)} WorkflowRequests for Workflow {workflow_id}"
+        )
+        return [row["id"] for row in request_rows]
+
+    @staticmethod
+    def _get_active_workflow(db: Session, workflow_id: UUID) -> Workflow:
+        workflow = (
+            db.query(Workflow)
+            .filter(Workflow.id == workflow_id, Workflow.is_active == True)
+            .first()
+        )
+        if not workflow:
+            raise WorkflowEngineError(
+                f"Workflow definition {workflow_id} not found or inactive"
+            )
+        return workflow
+
+    @staticmethod
+    def _get_first_step(db: Session, workflow: Workflow) -> WorkflowStep:
+        """
+        First step of the workflow's current version. Later steps are reached
+        through transitions, so a request stays on the version it started on.
+        """
+        first_step = (
+            db.query(WorkflowStep)
+            .filter(
+                WorkflowStep.workflow_id == workflow.id,
+                WorkflowStep.version_id == workflow.current_version_id,
+                WorkflowStep.step_order == 1,
+            )
+            .first()
+        )
+        if not first_step:
+            raise WorkflowEngineError(
+                "Workflow started but no first step (order=1) is defined"
+            )
+        return first_step
+
     @staticmethod
     def process_step(
         db: Session,
@@ -216,73 +454,429 @@ class WorkflowEngine:
         user: User,
         outcome: str,
         context: Dict[str, Any] = None,
+        expected_version: Optional[int] = None,
+        request_step_id: Optional[UUID] = None,
     ) -> WorkflowRequest:
         """
         Process a step completion and transition to the next state.
         Includes mandatory RBAC check for the current step.
+
+        The request row is locked with FOR UPDATE NOWAIT, so a concurrent
+        decision on the same request fails fast with ConcurrencyConflictError
+        instead of racing through the transition. `expected_version` lets the
+        caller compare-and-swap against the version it last read.
+
+        While parallel branches are open, `request_step_id` selects the step
+        to decide; without it the first open step the user may act on is used.
         """
-        request = (
-            db.query(WorkflowRequest).filter(WorkflowRequest.id == request_id).first()
-        )
+        request = WorkflowEngine._lock_request(db, request_id)
         if not request:
             raise WorkflowEngineError(f"Request {request_id} not found")
 
-        current_exec = (
+        if expected_version is not None and request.version != expected_version:
+            raise ConcurrencyConflictError(
+                f"Request {request_id} is at version {request.version}, expected {expected_version}"
+            )
+
+        open_execs = (
             db.query(RequestStep)
             .filter(
                 RequestStep.request_id == request_id,
-                RequestStep.step_id == request.current_step_id,
                 RequestStep.completed_at == None,
+                RequestStep.status != StepStatus.WAITING,
             )
-            .first()
+            .all()
+        )
+        current_exec = WorkflowEngine._pick_execution(
+            open_execs, WorkflowEngine._principal(user, db), request_step_id
+        )
+        WorkflowEngine._apply_decision(
+            db, request, current_exec, user.id, outcome, context
         )
+        return request
 
-        if not current_exec:
-            raise WorkflowEngineError(
-                "Logical Conflict: Request is active but has no pending execution step"
+    @staticmethod
+    def process_steps_bulk(
+        db: Session, user: User, decisions: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Apply many decisions for one principal without committing.
+        Requests and their open steps are loaded in one query and transitions
+        come from one graph lookup. Each decision runs in its own savepoint, so
+        a failing item is reported and rolled back without aborting the rest.
+        Requests locked by a concurrent decision are skipped (SKIP LOCKED) and
+        reported with a CONCURRENT_MODIFICATION error, so they can be retried.
+        """
+        request_ids = {d["request_id"] for d in decisions}
+        open_execs = (
+            db.query(RequestStep)
+            .join(WorkflowRequest, RequestStep.request_id == WorkflowRequest.id)
+            .options(
+                contains_eager(RequestStep.request).joinedload(
+                    WorkflowRequest.workflow
+                ),
+                joinedload(RequestStep.step),
             )
+            .filter(
+                WorkflowRequest.id.in_(request_ids),
+                RequestStep.completed_at == None,
+                RequestStep.status != StepStatus.WAITING,
+            )
+            .with_for_update(skip_locked=True, of=WorkflowRequest)
+            .all()
+        )
+        execs_by_request: Dict[UUID, List[RequestStep]] = {}
+        for e in open_execs:
+            execs_by_request.setdefault(e.request_id, []).append(e)
+        busy = WorkflowEngine._locked_elsewhere(
+            db, request_ids - execs_by_request.keys()
+        )
+        graph = WorkflowEngine._load_transition_graph(
+            db, {e.step_id for e in open_execs}
+        )
+        principal = WorkflowEngine._principal(user, db)
+        assignments: List[Dict[str, Any]] = []
 
-        # --- RBAC Enforcement ---
-        # Admin Bypass: Allow admins to execute any step
-        is_admin = any(r.name.lower() == "admin" for r in user.roles)
-        
-        if not is_admin:
-            step_def = current_exec.step
-            user_role_ids = [role.id for role in user.roles]
-            if step_def.required_role_id:
-                if step_def.required_role_id not in user_role_ids:
-                    logger.warning(
-                        f"User {user.id} lacks required role {step_def.required_role_id} for step {step_def.id}"
-                    )
-                    raise PermissionDeniedError(
-                        f"User lacks required role for this workflow step"
+        results = []
+        for decision in decisions:
+            request_id = decision["request_id"]
+            candidates = execs_by_request.get(request_id, [])
+            # Side effects collected outside the session are kept per item
+            # and only merged once its savepoint has been released
+            item_assignments: List[Dict[str, Any]] = []
+            queued = set(db.info.get("automatic_requests", ()))
+            try:
+                if request_id in busy:
+                    raise ConcurrencyConflictError(
+                        f"Request {request_id} is being processed by another user. Retry shortly."
                     )
-
-            if step_def.required_permission_id:
-                user_permission_ids = set()
-                for role in user.roles:
-                    for perm in role.permissions:
-                        user_permission_ids.add(perm.id)
-                if step_def.required_permission_id not in user_permission_ids:
-                    logger.warning(
-                        f"User {user.id} lacks required permission {step_def.required_permission_id} for step {step_def.id}"
+                if not any(e.completed_at is None for e in candidates):
+                    raise WorkflowEngineError(
+                        f"Request {request_id} not found or has no pending execution step"
                     )
-                    raise PermissionDeniedError(
-                        f"User lacks required permission for this workflow step"
+                current_exec = WorkflowEngine._pick_execution(
+                    candidates, principal, decision.get("request_step_id")
+                )
+                with db.begin_nested():
+                    WorkflowEngine._apply_decision(
+                        db,
+                        current_exec.request,
+                        current_exec,
+                        user.id,
+                        decision["outcome"],
+                        decision.get("context"),
+                        graph=graph,
+                        assignments=item_assignments,
                     )
-        # ------------------------
+            except (
+                WorkflowEngineError,
+                PermissionDeniedError,
+                InvalidStateTransitionError,
+                ConcurrencyConflictError,
+            ) as e:
+                logger.warning(f"Bulk decision failed for Request {request_id}: {e}")
+                db.info["automatic_requests"] = queued
+                for assignment in item_assignments:
+                    if assignment["assignee_id"] is not None:
+                        load_counter.adjust(assignment["assignee_id"], -1)
+                results.append(
+                    {
+                        "request_id": request_id,
+                        "success": False,
+                        "error": str(e),
+                        "error_code": "CONCURRENT_MODIFICATION"
+                        if isinstance(e, ConcurrencyConflictError)
+                        else None,
+                    }
+                )
+                continue
 
+            assignments.extend(item_assignments)
+            request = current_exec.request
+            results.append(
+                {
+                    "request_id": request_id,
+                    "success": True,
+                    "status": request.status,
+                    "current_step_id": request.current_step_id,
+                }
+            )
 
+        WorkflowEngine._notify_assignments(db, assignments)
+        return results
+
+    @staticmethod
+    def _locked_elsewhere(db: Session, request_ids: Set[UUID]) -> Set[UUID]:
+        """
+        Which of `request_ids`, left out of a SKIP LOCKED read, exist but are
+        locked by another transaction (the rest are missing or have no open
+        step).
+        """
+        if not request_ids:
+            return set()
+        existing = {
+            request_id
+            for (request_id,) in db.query(WorkflowRequest.id).filter(
+                WorkflowRequest.id.in_(request_ids)
+            )
+        }
+        if not existing:
+            return set()
+        lockable = {
+            request_id
+            for (request_id,) in db.query(WorkflowRequest.id)
+            .filter(WorkflowRequest.id.in_(existing))
+            .with_for_update(skip_locked=True)
+        }
+        return existing - lockable
+
+    @staticmethod
+    def _pick_execution(
+        open_execs: List[RequestStep],
+        principal: Dict[str, Any],
+        request_step_id: Optional[UUID] = None,
+    ) -> RequestStep:
+        """
+        Choose which open step a decision applies to.
+        An explicit `request_step_id` must be open; otherwise the lowest-order
+        open step the principal is authorized for is taken.
+        """
+        candidates = [e for e in open_execs if e.completed_at is None]
+        if request_step_id is not None:
+            candidates = [e for e in candidates if e.id == request_step_id]
+            if not candidates:
+                raise WorkflowEngineError(
+                    f"Request step {request_step_id} is not open on this request"
+                )
+
+        if not candidates:
+            raise WorkflowEngineError(
+                "Logical Conflict: Request is active but has no pending execution step"
+            )
+
+        denied = None
+        for current_exec in sorted(candidates, key=lambda e: e.step.step_order):
+            if WorkflowEngine._acting_as(principal, current_exec) is not None:
+                return current_exec
+            try:
+                # Raises with the reason the user's own rights fall short
+                WorkflowEngine._authorize(principal, current_exec.step)
+            except PermissionDeniedError as e:
+                denied = e
+        raise denied
+
+    @staticmethod
+    def run_automatic_steps(
+        db: Session, request_id: UUID, max_steps: Optional[int] = None
+    ) -> int:
+        """
+        Execute the automatic steps open on a request, and the automatic steps
+        they lead to, in a loop without committing. Stops once only human
+        steps (or none) remain, or after `max_steps` executions.
+        Returns the number of steps executed.
+        """
+        max_steps = max_steps or settings.AUTOMATION_MAX_CHAIN
+        request = WorkflowEngine._lock_request(db, request_id)
+        if not request or request.status != RequestStatus.IN_PROGRESS:
+            return 0
+
+        # This run follows the chain itself; don't queue the request again
+        db.info.setdefault("automatic_requests", set()).add(request.id)
+
+        executed = 0
+        while executed < max_steps and request.status == RequestStatus.IN_PROGRESS:
+            db.flush()
+            pending = [
+                e
+                for e in WorkflowEngine._open_steps(db, request.id, None)
+                if e.step.step_type == StepType.AUTOMATIC
+            ]
+            if not pending:
+                break
+
+            for current_exec in pending:
+                # A join released earlier in this pass may have skipped it
+                if current_exec.completed_at is not None:
+                    continue
+                outcome, data = AutomationService.execute(request, current_exec.step)
+                WorkflowEngine._apply_decision(
+                    db, request, current_exec, None, outcome, data
+                )
+                executed += 1
+                if (
+                    executed >= max_steps
+                    or request.status != RequestStatus.IN_PROGRESS
+                ):
+                    break
+
+        if executed >= max_steps:
+            logger.warning(
+                f"Request {request_id} hit the automatic step limit ({max_steps})"
+            )
+
+        return executed
+
+    @staticmethod
+    def _queue_automatic(db: Session, request_id: UUID) -> None:
+        """
+        Queue a worker run for a request's automatic steps, once per request
+        and transaction. It goes through the outbox, so it is only published
+        after commit and never runs ahead of the transaction.
+        """
+        queued = db.info.setdefault("automatic_requests", set())
+        if request_id in queued:
+            return
+        queued.add(request_id)
+        Outbox.enqueue(db, run_automatic_steps.name, request_id=request_id)
+
+    @staticmethod
+    def _lock_request(db: Session, request_id: UUID) -> Optional[WorkflowRequest]:
+        """
+        Load a request with a row lock, failing immediately if another
+        transaction holds it.
+        """
+        try:
+            return (
+                db.query(WorkflowRequest)
+                .filter(WorkflowRequest.id == request_id)
+                .with_for_update(nowait=True)
+                .first()
+            )
+        except OperationalError as e:
+            # 55P03 = lock_not_available (Postgres)
+            if getattr(e.orig, "pgcode", None) == "55P03":
+                raise ConcurrencyConflictError(
+                    f"Request {request_id} is being processed by another user. Retry shortly."
+                )
+            raise
+
+    @staticmethod
+    def _principal(user: User, db: Optional[Session] = None) -> Dict[str, Any]:
+        """
+        Snapshot of the user's roles and permissions for RBAC checks. With a
+        session, "acting_for" holds a snapshot of each user they currently
+        stand in for through a delegation; those are checked one at a time,
+        never merged with the user's own (admin rights are never delegated).
+        """
+        covered = DelegationService.covered(db, user.id) if db is not None else []
+        return {
+            "id": user.id,
+            "is_admin": any(r.name.lower() == "admin" for r in user.roles),
+            "role_ids": {role.id for role in user.roles},
+            "permission_ids": {
+                perm.id for role in user.roles for perm in role.permissions
+            },
+            "acting_for": [
+                {**WorkflowEngine._principal(u), "is_admin": False} for u in covered
+            ],
+        }
+
+    @staticmethod
+    def _acting_as(
+        principal: Dict[str, Any], execution: RequestStep, inbox: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        The identity whose rights let `principal` act on an open step: their
+        own, or else one user they stand in for, on a step assigned to that
+        user, to the principal or to nobody. Being assigned grants nothing by
+        itself, so a stale assignment or an ended delegation stops working.
+        With `inbox`, the user's own rights only count for steps assigned to
+        them or to nobody (the my-tasks view; acting is not restricted).
+        """
+        assigned_to = execution.assigned_to
+        if not inbox or assigned_to in (None, principal["id"]):
+            if WorkflowEngine._allowed(principal, execution.step):
+                return principal
+        for covered in principal.get("acting_for", ()):
+            if assigned_to in (None, covered["id"], principal["id"]) and (
+                WorkflowEngine._allowed(covered, execution.step)
+            ):
+                return covered
+        return None
+
+    @staticmethod
+    def _allowed(principal: Dict[str, Any], step_def: WorkflowStep) -> bool:
+        return principal["is_admin"] or (
+            (
+                not step_def.required_role_id
+                or step_def.required_role_id in principal["role_ids"]
+            )
+            and (
+                not step_def.required_permission_id
+                or step_def.required_permission_id in principal["permission_ids"]
+            )
+        )
+
+    @staticmethod
+    def _authorize(principal: Dict[str, Any], step_def: WorkflowStep) -> None:
+        """
+        RBAC enforcement for acting on a step.
+        Admin Bypass: Allow admins to execute any step.
+        """
+        if principal["is_admin"]:
+            return
+
+        if step_def.required_role_id:
+            if step_def.required_role_id not in principal["role_ids"]:
+                logger.warning(
+                    f"User {principal['id']} lacks required role {step_def.required_role_id} for step {step_def.id}"
+                )
+                raise PermissionDeniedError(
+                    f"User lacks required role for this workflow step"
+                )
+
+        if step_def.required_permission_id:
+            if step_def.required_permission_id not in principal["permission_ids"]:
+                logger.warning(
+                    f"User {principal['id']} lacks required permission {step_def.required_permission_id} for step {step_def.id}"
+                )
+                raise PermissionDeniedError(
+                    f"User lacks required permission for this workflow step"
+                )
+
+    @staticmethod
+    def _apply_decision(
+        db: Session,
+        request: WorkflowRequest,
+        current_exec: RequestStep,
+        actor_id: UUID,
+        outcome: str,
+        context: Optional[Dict[str, Any]],
+        graph: Optional[Dict[Any, List[StepTransition]]] = None,
+        assignments: Optional[List[Dict[str, Any]]] = None,
+    ) -> None:
+        """
+        Close the current step and move the request along its transitions.
+        When `assignments` is given, new-task notifications are collected there
+        for the caller to send in batches instead of one task per step.
+        """
         # 1. Close current step
-        current_exec.assigned_to = user.id
+        assignee = current_exec.assigned_to
+        AssignmentService.release(db, assignee)
+        current_exec.assigned_to = actor_id
         current_exec.status = outcome  # Typically maps to APPROVED, REJECTED
         current_exec.decision_data = context
         # Save comment explicitly to the column if provided
         if context and "comment" in context:
             current_exec.comments = context["comment"]
-            
+
         current_exec.completed_at = datetime.utcnow()
 
+        EventStore.append(
+            db,
+            request,
+            event_store.STEP_COMPLETED,
+            {
+                "request_step_id": current_exec.id,
+                "step_id": current_exec.step_id,
+                "outcome": outcome,
+                "actor_id": actor_id,
+                "comment": current_exec.comments,
+                **WorkflowEngine._audience(current_exec.step, assignee),
+            },
+            actor_id=actor_id,
+        )
+
         # 2. Resolve Next Path
         # Combine initial request data with step decision data for branching
         eval_context = {
@@ -290,83 +884,566 @@ class WorkflowEngine:
             "decision_data": context or {},
         }
 
-        next_step = WorkflowEngine._resolve_next(
-            db, request.current_step_id, outcome, eval_context
+        table = None
+        if graph is None and request.workflow_version_id is not None:
+            # Versions are immutable, so their outcome tables stay cached
+            table = outcome_tables.get(db, request.workflow_version_id)
+        next_steps = WorkflowEngine._resolve_next_steps(
+            db, current_exec.step_id, outcome, eval_context, graph=graph, table=table
         )
+        branch_path = current_exec.branch_path
 
-        if next_step:
-            now = datetime.utcnow()
-            deadline = now + timedelta(hours=next_step.sla_hours)
-
-            # Transition to next step
-            new_exec = RequestStep(
-                request_id=request.id,
-                step_id=next_step.id,
-                status=StepStatus.PENDING,
-                started_at=now,
-                deadline=deadline,
+        if len(next_steps) > 1:
+            # Fork: every target runs as its own branch, one level down
+            fork_path = WorkflowEngine._child_path(
+                branch_path, uuid.uuid4().hex[:12]
             )
-            db.add(new_exec)
-            request.current_step_id = next_step.id
-
-            # Trigger notification (Safe Mode)
-            try:
-                notify_new_assignment.delay(
-                    step_id=next_step.id,
-                    request_id=request.id,
-                    workflow_name=request.workflow.name,
-                    step_name=next_step.name,
-                    deadline=deadline.isoformat(),
+            for next_step in next_steps:
+                WorkflowEngine._enter_step(
+                    db, request, next_step, fork_path, assignments
                 )
-            except Exception as e:
-                logger.error(f"Failed to send notification for Request {request.id}: {e}")
-
-            logger.info(f"Request {request_id} moved to step: {next_step.name}")
+            logger.info(
+                f"Request {request.id} forked into {len(next_steps)} parallel branches"
+            )
+        elif next_steps:
+            WorkflowEngine._enter_step(
+                db, request, next_steps[0], branch_path, assignments
+            )
+        elif branch_path is None or outcome != "APPROVED":
+            # End of flow orchestration; a rejected branch ends the whole request
+            if branch_path is not None:
+                WorkflowEngine._skip_open_steps(db, request, None)
+            WorkflowEngine._finalize(db, request, outcome, actor_id)
+            logger.info(f"Workflow {request.id} finalized with outcome: {outcome}")
         else:
-            # End of flow orchestration
-            WorkflowEngine._finalize(db, request, outcome, user.id)
-            logger.info(f"Workflow {request_id} finalized with outcome: {outcome}")
+            # Branch finished without reaching a join
+            WorkflowEngine._settle_branch(
+                db, request, branch_path, actor_id, outcome, assignments
+            )
 
         AuditService.log_action(
             db,
             action="STEP_COMPLETED",
             resource_type="request_step",
             resource_id=str(current_exec.id),
-            actor_id=user.id,
+            actor_id=actor_id,
             request_id=request.id,
             meta_data={"outcome": outcome, "step_id": str(current_exec.step_id)},
         )
 
-        return request
+    @staticmethod
+    def _enter_step(
+        db: Session,
+        request: WorkflowRequest,
+        step: WorkflowStep,
+        branch_path: Optional[str],
+        assignments: Optional[List[Dict[str, Any]]],
+    ) -> None:
+        """
+        Move a branch onto `step`. Join steps reached from inside a fork
+        count the arrival and only open once their barrier is met.
+        """
+        if step.join_policy is None or branch_path is None:
+            new_exec = RequestStep(
+                request_id=request.id, step_id=step.id, branch_path=branch_path
+            )
+            WorkflowEngine._activate(db, request, new_exec, step, assignments)
+            return
+
+        # Make this decision visible to the branch queries below
+        db.flush()
+        join_exec = (
+            db.query(RequestStep)
+            .filter(
+                RequestStep.request_id == request.id,
+                RequestStep.step_id == step.id,
+                RequestStep.status == StepStatus.WAITING,
+                RequestStep.branch_path == branch_path,
+            )
+            .first()
+        )
+        if join_exec is None:
+            join_exec = RequestStep(
+                id=uuid.uuid4(),
+                request_id=request.id,
+                step_id=step.id,
+                status=StepStatus.WAITING,
+                branch_path=branch_path,
+                join_arrivals=0,
+            )
+            db.add(join_exec)
+        join_exec.join_arrivals += 1
+        EventStore.append(
+            db,
+            request,
+            event_store.STEP_WAITING,
+            {
+                "request_step_id": join_exec.id,
+                "step_id": step.id,
+                "step_name": step.name,
+                "branch_path": branch_path,
+                "join_arrivals": join_exec.join_arrivals,
+            },
+        )
+        WorkflowEngine._release_join(db, request, join_exec, step, assignments)
 
     @staticmethod
-    def _resolve_next(
-        db: Session, from_step_id: UUID, outcome: str, context: Dict[str, Any]
-    ) -> Optional[WorkflowStep]:
+    def _release_join(
+        db: Session,
+        request: WorkflowRequest,
+        join_exec: RequestStep,
+        join_step: WorkflowStep,
+        assignments: Optional[List[Dict[str, Any]]],
+    ) -> bool:
         """
-        Find the next step based on defined transitions and conditions.
+        Open a waiting join step once its barrier is met: every branch of the
+        fork has finished (ALL), or join_threshold branches arrived (N_OF_M),
+        in which case the branches still running are skipped.
         """
-        transitions = (
-            db.query(StepTransition)
+        db.flush()
+        running = WorkflowEngine._open_steps(db, request.id, join_exec.branch_path)
+        quorum = (
+            join_step.join_policy == JoinPolicy.N_OF_M
+            and join_exec.join_arrivals >= (join_step.join_threshold or 1)
+        )
+        if running and not quorum:
+            request.current_step_id = running[0].step_id
+            return False
+
+        WorkflowEngine._skip_open_steps(
+            db, request, join_exec.branch_path, keep=join_exec
+        )
+        join_exec.branch_path = WorkflowEngine._parent_path(join_exec.branch_path)
+        WorkflowEngine._activate(db, request, join_exec, join_step, assignments)
+        logger.info(
+            f"Request {request.id} joined {join_exec.join_arrivals} branches at step: {join_step.name}"
+        )
+        return True
+
+    @staticmethod
+    def _settle_branch(
+        db: Session,
+        request: WorkflowRequest,
+        branch_path: str,
+        actor_id: UUID,
+        outcome: str,
+        assignments: Optional[List[Dict[str, Any]]],
+    ) -> None:
+        """
+        Handle a branch that ended without a next step. A join waiting on its
+        fork may now be complete; if the fork has no join and no other work
+        left, the parent branch (or the request) is settled in turn.
+        """
+        db.flush()
+        join_exec = (
+            db.query(RequestStep)
             .filter(
-                StepTransition.from_step_id == from_step_id,
-                StepTransition.outcome == outcome,
+                RequestStep.request_id == request.id,
+                RequestStep.status == StepStatus.WAITING,
+                RequestStep.branch_path == branch_path,
             )
-            .all()
+            .first()
         )
+        if join_exec is not None:
+            WorkflowEngine._release_join(
+                db, request, join_exec, join_exec.step, assignments
+            )
+            return
 
-        if not transitions:
+        remaining = WorkflowEngine._open_steps(db, request.id, branch_path)
+        if remaining:
+            request.current_step_id = remaining[0].step_id
+            return
+
+        parent = WorkflowEngine._parent_path(branch_path)
+        if parent is not None:
+            WorkflowEngine._settle_branch(
+                db, request, parent, actor_id, outcome, assignments
+            )
+            return
+
+        remaining = WorkflowEngine._open_steps(db, request.id, None)
+        if remaining:
+            request.current_step_id = remaining[0].step_id
+            return
+
+        WorkflowEngine._finalize(db, request, outcome, actor_id)
+        logger.info(f"Workflow {request.id} finalized with outcome: {outcome}")
+
+    @staticmethod
+    def _activate(
+        db: Session,
+        request: WorkflowRequest,
+        new_exec: RequestStep,
+        step: WorkflowStep,
+        assignments: Optional[List[Dict[str, Any]]],
+    ) -> None:
+        """
+        Open a step execution for work and notify its assignees.
+        """
+        now = datetime.utcnow()
+        workflow_calendar_id = request.workflow.calendar_id
+        deadline = add_sla_hours(
+            calendars.resolve(db, step.required_role_id, workflow_calendar_id),
+            now,
+            step.sla_hours,
+        )
+
+        if new_exec.id is None:
+            new_exec.id = uuid.uuid4()
+        new_exec.status = StepStatus.PENDING
+        new_exec.started_at = now
+        new_exec.deadline = deadline
+        new_exec.assigned_to = AssignmentService.pick(db, step)
+        db.add(new_exec)
+        request.current_step_id = step.id
+        projected = WorkflowEngine._projected_completion(
+            db,
+            request.workflow_version_id,
+            step.id,
+            deadline,
+            request.request_data,
+            workflow_calendar_id,
+        )
+        if (
+            new_exec.branch_path is None
+            or request.projected_completion_at is None
+            or (projected and projected > request.projected_completion_at)
+        ):
+            # Inside a fork the slowest open branch sets the projection
+            request.projected_completion_at = projected
+        WorkflowEngine._record_activation(db, request, new_exec, step)
+
+        if step.step_type == StepType.AUTOMATIC:
+            WorkflowEngine._queue_automatic(db, request.id)
+        elif assignments is not None:
+            assignments.append(
+                {
+                    "step": step,
+                    "workflow_name": request.workflow.name,
+                    "request_id": request.id,
+                    "deadline": deadline.isoformat(),
+                    "assignee_id": new_exec.assigned_to,
+                }
+            )
+        else:
+            Outbox.enqueue(
+                db,
+                notify_new_assignment.name,
+                step_id=step.id,
+                request_id=request.id,
+                workflow_name=request.workflow.name,
+                step_name=step.name,
+                deadline=deadline.isoformat(),
+                assignee_id=new_exec.assigned_to,
+            )
+
+        logger.info(f"Request {request.id} moved to step: {step.name}")
+
+    @staticmethod
+    def _projected_completion(
+        db: Session,
+        version_id: Optional[UUID],
+        step_id: UUID,
+        deadline: datetime,
+        request_data: Optional[Dict[str, Any]],
+        workflow_calendar_id: Optional[UUID] = None,
+    ) -> Optional[datetime]:
+        """
+        Completion time if the step ends at its deadline and every later step
+        on the likeliest path takes its full SLA, each counted on its own
+        team's calendar (else the workflow's). None for unversioned
+        workflows, which have no cached outcome table.
+        """
+        if version_id is None:
             return None
+        compiled = outcome_tables.compiled(db, version_id)
+        context = {"request_data": request_data or {}, "decision_data": {}}
 
-        # Filter by conditions
+        def calendar_of(target: UUID) -> Optional[WorkingCalendar]:
+            return calendars.resolve(
+                db, compiled.required_role_id.get(target), workflow_calendar_id
+            )
+
+        return WorkflowEngine._completion_after(
+            compiled, step_id, deadline, context, calendar_of, frozenset()
+        )
+
+    @staticmethod
+    def _completion_after(
+        compiled: CompiledVersion,
+        step_id: UUID,
+        start: datetime,
+        context: Dict[str, Any],
+        calendar_of: Callable[[UUID], Optional[WorkingCalendar]],
+        path: FrozenSet[UUID],
+    ) -> datetime:
+        """
+        When the steps after `step_id` finish if it ends at `start`, along
+        the path an approval would take as _resolve_next_steps would pick it
+        with what is known now; a fork ends with its slowest branch (the
+        critical path). Working hours on different calendars don't add up,
+        so each step's SLA is laid out from the end of the one before.
+        """
+        path = path | {step_id}
+        routes = compiled.table.get(step_id, {}).get("APPROVED", [])
+        matching = [
+            r
+            for r in routes
+            if not r.condition_config
+            or ConditionEvaluator.evaluate(r.condition_config, context)
+        ]
+        targets = [r.to_step_id for r in matching if r.is_parallel and r.to_step_id]
+        if not targets:
+            targets = [r.to_step_id for r in matching[:1] if r.to_step_id]
+        return max(
+            (
+                WorkflowEngine._completion_after(
+                    compiled,
+                    target,
+                    add_sla_hours(
+                        calendar_of(target), start, compiled.sla_hours.get(target, 0)
+                    ),
+                    context,
+                    calendar_of,
+                    path,
+                )
+                for target in targets
+                if target not in path  # a loop back adds nothing
+            ),
+            default=start,
+        )
+
+    @staticmethod
+    def _record_activation(
+        db: Session, request: WorkflowRequest, new_exec: RequestStep, step: WorkflowStep
+    ) -> None:
+        EventStore.append(
+            db,
+            request,
+            event_store.STEP_ACTIVATED,
+            {
+                "request_step_id": new_exec.id,
+                "step_id": step.id,
+                "step_name": step.name,
+                "branch_path": new_exec.branch_path,
+                "deadline": new_exec.deadline,
+                **WorkflowEngine._audience(step, new_exec.assigned_to),
+            },
+        )
+
+    @staticmethod
+    def _audience(step: WorkflowStep, assigned_to: Optional[UUID]) -> Dict[str, Any]:
+        """
+        Who a step's task belongs to, recorded on its events so live inbox
+        updates can be routed without a lookup: its assignee, or else whoever
+        holds the required role and permission.
+        """
+        return {
+            "step_type": step.step_type,
+            "required_role_id": step.required_role_id,
+            "required_permission_id": step.required_permission_id,
+            "assigned_to": assigned_to,
+        }
+
+    @staticmethod
+    def _open_steps(
+        db: Session, request_id: UUID, branch_path: Optional[str]
+    ) -> List[RequestStep]:
+        """
+        Actionable steps of a request inside `branch_path` and the branches
+        nested under it (the whole request when `branch_path` is None).
+        """
+        query = db.query(RequestStep).filter(
+            RequestStep.request_id == request_id,
+            RequestStep.completed_at == None,
+            RequestStep.status != StepStatus.WAITING,
+        )
+        if branch_path is not None:
+            query = query.filter(
+                or_(
+                    RequestStep.branch_path == branch_path,
+                    RequestStep.branch_path.like(f"{branch_path}/%"),
+                )
+            )
+        return query.all()
+
+    @staticmethod
+    def _skip_open_steps(
+        db: Session,
+        request: WorkflowRequest,
+        branch_path: Optional[str],
+        keep: Optional[RequestStep] = None,
+    ) -> None:
+        """
+        Close the running and waiting steps inside `branch_path` (the whole
+        request when None) as SKIPPED, except `keep`.
+        """
+        db.flush()
+        query = db.query(RequestStep).filter(
+            RequestStep.request_id == request.id,
+            RequestStep.completed_at == None,
+        )
+        if branch_path is not None:
+            query = query.filter(
+                or_(
+                    RequestStep.branch_path == branch_path,
+                    RequestStep.branch_path.like(f"{branch_path}/%"),
+                )
+            )
+        if keep is not None:
+            query = query.filter(RequestStep.id != keep.id)
+
+        now = datetime.utcnow()
+        for stale in query.options(joinedload(RequestStep.step)).all():
+            previous_status = stale.status
+            AssignmentService.release(db, stale.assigned_to)
+            stale.status = StepStatus.SKIPPED
+            stale.completed_at = now
+            EventStore.append(
+                db,
+                request,
+                event_store.STEP_SKIPPED,
+                {
+                    "request_step_id": stale.id,
+                    "step_id": stale.step_id,
+                    "previous_status": previous_status,
+                    **WorkflowEngine._audience(stale.step, stale.assigned_to),
+                },
+            )
+
+    @staticmethod
+    def _child_path(branch_path: Optional[str], segment: str) -> str:
+        return f"{branch_path}/{segment}" if branch_path else segment
+
+    @staticmethod
+    def _parent_path(branch_path: Optional[str]) -> Optional[str]:
+        if not branch_path or "/" not in branch_path:
+            return None
+        return branch_path.rsplit("/", 1)[0]
+
+    @staticmethod
+    def _notify_assignments(db: Session, assignments: List[Dict[str, Any]]) -> None:
+        """
+        Queue collected new-task notifications, one batched task per step.
+        """
+        by_step: Dict[UUID, List[Dict[str, Any]]] = {}
+        for assignment in assignments:
+            by_step.setdefault(assignment["step"].id, []).append(assignment)
+
+        for step_id, items in by_step.items():
+            Outbox.enqueue(
+                db,
+                notify_new_assignments_batch.name,
+                step_id=step_id,
+                workflow_name=items[0]["workflow_name"],
+                step_name=items[0]["step"].name,
+                assignments=[
+                    {
+                        "request_id": a["request_id"],
+                        "deadline": a["deadline"],
+                        "assignee_id": a["assignee_id"],
+                    }
+                    for a in items
+                ],
+            )
+
+    @staticmethod
+    def _load_transition_graph(
+        db: Session, step_ids: Any
+    ) -> Dict[Any, List[StepTransition]]:
+        """
+        Load every outgoing transition of the given steps in one query,
+        keyed by (from_step_id, outcome), with the target step eagerly loaded.
+        """
+        graph: Dict[Any, List[StepTransition]] = {}
+        if not step_ids:
+            return graph
+        transitions = (
+            db.query(StepTransition)
+            .options(joinedload(StepTransition.to_step))
+            .filter(StepTransition.from_step_id.in_(step_ids))
+            .all()
+        )
         for trans in transitions:
-            if not trans.condition_config:
-                return trans.to_step
+            graph.setdefault((trans.from_step_id, trans.outcome), []).append(trans)
+        return graph
 
-            if ConditionEvaluator.evaluate(trans.condition_config, context):
-                return trans.to_step
+    @staticmethod
+    def _resolve_next(
+        db: Session,
+        from_step_id: UUID,
+        outcome: str,
+        context: Dict[str, Any],
+        graph: Optional[Dict[Any, List[StepTransition]]] = None,
+    ) -> Optional[WorkflowStep]:
+        """
+        Find the next step based on defined transitions and conditions.
+        Uses a preloaded transition graph when one is given.
+        """
+        next_steps = WorkflowEngine._resolve_next_steps(
+            db, from_step_id, outcome, context, graph=graph
+        )
+        return next_steps[0] if next_steps else None
 
-        return None
+    @staticmethod
+    def _resolve_next_steps(
+        db: Session,
+        from_step_id: UUID,
+        outcome: str,
+        context: Dict[str, Any],
+        graph: Optional[Dict[Any, List[StepTransition]]] = None,
+        table: Optional[OutcomeTable] = None,
+    ) -> List[WorkflowStep]:
+        """
+        Find the steps that follow an outcome.
+        Parallel transitions whose conditions hold all fire together (a fork);
+        otherwise the first matching transition wins. An empty list means the
+        path ends here. Routes come from the version's outcome `table`, a
+        preloaded `graph`, or a query, in that order.
+        """
+        if table is not None:
+            transitions = table.get(from_step_id, {}).get(outcome, [])
+        elif graph is not None:
+            transitions = graph.get((from_step_id, outcome), [])
+        else:
+            transitions = (
+                db.query(StepTransition)
+                .filter(
+                    StepTransition.from_step_id == from_step_id,
+                    StepTransition.outcome == outcome,
+                )
+                .all()
+            )
+
+        if not transitions:
+            return []
+
+        matching = [
+            trans
+            for trans in transitions
+            if not trans.condition_config
+            or ConditionEvaluator.evaluate(trans.condition_config, context)
+        ]
+
+        def target(trans: Any) -> Optional[WorkflowStep]:
+            if table is not None:
+                # Identity map first, so a definition is loaded at most once
+                return db.get(WorkflowStep, trans.to_step_id) if trans.to_step_id else None
+            return trans.to_step
+
+        fork = [
+            step for step in (target(t) for t in matching if t.is_parallel) if step
+        ]
+        if fork:
+            return fork
+
+        # Filter by conditions
+        for trans in matching:
+            step = target(trans)
+            return [step] if step else []
+
+        return []
 
     @staticmethod
     def _finalize(db: Session, request: WorkflowRequest, outcome: str, actor_id: UUID):
@@ -400,6 +1477,14 @@ class WorkflowEngine:
         request.current_step_id = None
         request.completed_at = datetime.utcnow()
 
+        EventStore.append(
+            db,
+            request,
+            event_store.REQUEST_COMPLETED,
+            {"outcome": outcome, "status": final_status},
+            actor_id=actor_id,
+        )
+
         db.add(
             RequestStateHistory(
                 request_id=request.id,
@@ -419,3 +1504,10 @@ class WorkflowEngine:
             request_id=request.id,
             meta_data={"final_outcome": outcome},
         )
+
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _reset_automatic_queue(session):
+    session.info.pop("automatic_requests", None)
@@ -0,0 +1,408 @@
+"""
+Workflow Graph Analysis
+Responsibility: Check a workflow definition's step graph before it is
+published (reachability, exits, overlapping conditions) and build the
+per-step outcome tables the engine routes decisions with
+"""
+
+import logging
+import math
+import threading
+from collections import Counter, OrderedDict, deque
+from typing import Any, Dict, Hashable, Iterable, List, NamedTuple, Optional, Set
+from uuid import UUID
+
+from sqlalchemy.orm import Session, selectinload
+
+from app.core.config import settings
+from app.core.exceptions import WorkflowEngineError, WorkflowValidationError
+from app.db.models.workflow import StepType, WorkflowStep
+from app.services.automation import get_action
+
+logger = logging.getLogger("workflow-platform.workflow_graph")
+
+# Outcomes every human step can be decided with, whether or not the
+# definition routes them anywhere
+STANDARD_OUTCOMES = ("APPROVED", "REJECTED")
+
+ERROR = "error"
+WARNING = "warning"
+
+
+class Issue(NamedTuple):
+    severity: str
+    code: str
+    step: Optional[Hashable]  # step_order in a definition, step id otherwise
+    message: str
+
+
+class Route(NamedTuple):
+    """
+    One outgoing transition of an outcome table; to_step_id None ends the path.
+    """
+
+    to_step_id: Optional[Hashable]
+    condition_config: Optional[Dict[str, Any]]
+    is_parallel: bool
+
+
+# step -> outcome -> routes, in the order the engine tries them
+OutcomeTable = Dict[Hashable, Dict[str, List[Route]]]
+
+
+class WorkflowGraphAnalyzer:
+    """
+    Static analysis of one definition. Steps are identified by any hashable
+    key: step_order for a definition being published, the step id for
+    stored steps. The entry step is the one with step_order 1.
+    """
+
+    def __init__(
+        self,
+        steps: Dict[Hashable, Dict[str, Any]],
+        transitions: List[Dict[str, Any]],
+        entry: Optional[Hashable],
+        duplicates: Iterable[Hashable] = (),
+    ):
+        self.steps = steps
+        self.transitions = transitions
+        self.entry = entry
+        self.duplicates = list(duplicates)
+
+    @classmethod
+    def from_definition(
+        cls, steps: List[Dict[str, Any]], transitions: List[Dict[str, Any]]
+    ) -> "WorkflowGraphAnalyzer":
+        """
+        Analyzer over WorkflowCreate/WorkflowVersionCreate style dicts.
+        """
+        step_map = {s["step_order"]: s for s in steps}
+        edges = [
+            {
+                "from": t["from_step_order"],
+                "to": t.get("to_step_order"),
+                "outcome": t["outcome"],
+                "condition_config": t.get("condition_config"),
+                "is_parallel": t.get("is_parallel", False),
+            }
+            for t in transitions
+        ]
+        counts = Counter(s["step_order"] for s in steps)
+        duplicates = [order for order, n in counts.items() if n > 1]
+        return cls(step_map, edges, 1 if 1 in step_map else None, duplicates)
+
+    @classmethod
+    def from_steps(cls, steps: Iterable[WorkflowStep]) -> "WorkflowGraphAnalyzer":
+        """
+        Analyzer over stored steps with transitions_from loaded.
+        """
+        steps = list(steps)
+        step_map = {
+            s.id: {
+                "name": s.name,
+                "step_order": s.step_order,
+                "step_type": s.step_type,
+                "action_config": s.action_config,
+            }
+            for s in steps
+        }
+        edges = [
+            {
+                "from": t.from_step_id,
+                "to": t.to_step_id,
+                "outcome": t.outcome,
+                "condition_config": t.condition_config,
+                "is_parallel": bool(t.is_parallel),
+            }
+            for s in steps
+            for t in s.transitions_from
+        ]
+        entry = next((s.id for s in steps if s.step_order == 1), None)
+        return cls(step_map, edges, entry)
+
+    def outcome_table(self) -> OutcomeTable:
+        table: OutcomeTable = {key: {} for key in self.steps}
+        for edge in self.transitions:
+            if edge["from"] not in table:
+                continue
+            table[edge["from"]].setdefault(edge["outcome"], []).append(
+                Route(edge["to"], edge["condition_config"], edge["is_parallel"])
+            )
+        return table
+
+    def reachable(self) -> Set[Hashable]:
+        """
+        Steps some path from the entry step leads to, conditions aside.
+        """
+        if self.entry is None:
+            return set()
+        table = self.outcome_table()
+        seen = {self.entry}
+        queue = deque([self.entry])
+        while queue:
+            for routes in table[queue.popleft()].values():
+                for route in routes:
+                    if route.to_step_id in table and route.to_step_id not in seen:
+                        seen.add(route.to_step_id)
+                        queue.append(route.to_step_id)
+        return seen
+
+    def analyze(self) -> List[Issue]:
+        if not self.steps:
+            return []
+        issues: List[Issue] = []
+        table = self.outcome_table()
+
+        if self.entry is None:
+            issues.append(
+                Issue(ERROR, "no_entry_step", None, "No step has step_order 1")
+            )
+        for key in self.duplicates:
+            issues.append(
+                Issue(ERROR, "duplicate_step_order", key, f"step_order {key} is used twice")
+            )
+
+        for edge in self.transitions:
+            for end in ("from", "to"):
+                if edge[end] is not None and edge[end] not in self.steps:
+                    issues.append(
+                        Issue(
+                            ERROR,
+                            "unknown_step",
+                            edge[end],
+                            f"Transition on {edge['outcome']} refers to a step "
+                            f"that is not part of the definition",
+                        )
+                    )
+
+        for key, step in self.steps.items():
+            if step.get("step_type") in (StepType.AUTOMATIC, StepType.AUTOMATIC.value):
+                action = (step.get("action_config") or {}).get("action")
+                try:
+                    get_action(action)
+                except WorkflowEngineError as e:
+                    issues.append(Issue(ERROR, "unknown_action", key, str(e)))
+
+        reachable = self.reachable()
+        for key in self.steps:
+            if self.entry is not None and key not in reachable:
+                issues.append(
+                    Issue(ERROR, "unreachable_step", key, "No path from the first step leads here")
+                )
+
+        trapped = reachable - self._can_finish(table)
+        for key in sorted(trapped, key=str):
+            issues.append(
+                Issue(
+                    ERROR,
+                    "no_exit",
+                    key,
+                    "Every outcome leads back into a cycle; requests here never finish",
+                )
+            )
+
+        for key, outcomes in table.items():
+            for outcome, routes in outcomes.items():
+                issues.extend(self._route_issues(key, outcome, routes))
+        return issues
+
+    def validate(self) -> List[Issue]:
+        """
+        Raise WorkflowValidationError on any error; return the warnings.
+        """
+        issues = self.analyze()
+        errors = [i for i in issues if i.severity == ERROR]
+        if errors:
+            raise WorkflowValidationError(
+                "; ".join(_describe(i) for i in errors), issues=issues
+            )
+        return issues
+
+    def _can_finish(self, table: OutcomeTable) -> Set[Hashable]:
+        """
+        Steps from which some sequence of outcomes ends the request.
+        """
+        successors: Dict[Hashable, Set[Hashable]] = {key: set() for key in table}
+        finish: Set[Hashable] = set()
+        for key, outcomes in table.items():
+            for outcome in set(STANDARD_OUTCOMES) | set(outcomes):
+                routes = outcomes.get(outcome, [])
+                if (
+                    not routes
+                    or any(r.to_step_id is None for r in routes)
+                    or all(r.condition_config for r in routes)
+                ):
+                    finish.add(key)
+                successors[key].update(r.to_step_id for r in routes if r.to_step_id in table)
+
+        changed = True
+        while changed:
+            changed = False
+            for key, nexts in successors.items():
+                if key not in finish and nexts & finish:
+                    finish.add(key)
+                    changed = True
+        return finish
+
+    @staticmethod
+    def _route_issues(key: Hashable, outcome: str, routes: List[Route]) -> List[Issue]:
+        issues = []
+        exclusive = [r for r in routes if not r.is_parallel]
+        if routes and all(r.condition_config for r in routes):
+            issues.append(
+                Issue(
+                    WARNING,
+                    "no_default_route",
+                    key,
+                    f"Every transition on {outcome} is conditional; the request "
+                    f"ends here when none matches",
+                )
+            )
+        for i, route in enumerate(exclusive):
+            later = exclusive[i + 1 :]
+            if not route.condition_config and later:
+                issues.append(
+                    Issue(
+                        WARNING,
+                        "shadowed_route",
+                        key,
+                        f"An unconditional transition on {outcome} precedes "
+                        f"{len(later)} other(s), which never fire",
+                    )
+                )
+                break
+            for other in later:
+                if conditions_overlap(route.condition_config, other.condition_config):
+                    issues.append(
+                        Issue(
+                            WARNING,
+                            "condition_overlap",
+                            key,
+                            f"Conditions on {outcome} overlap on "
+                            f"'{route.condition_config['field']}'; the first match wins",
+                        )
+                    )
+        return issues
+
+
+def _describe(issue: Issue) -> str:
+    return f"{issue.message} (step {issue.step})" if issue.step is not None else issue.message
+
+
+def _predicate(config: Dict[str, Any]) -> Optional[tuple]:
+    """
+    ("set", values) | ("range", lo, lo_incl, hi, hi_incl) | ("not", value),
+    or None for conditions that cannot be compared statically.
+    """
+    operator, value = config.get("operator", "=="), config.get("value")
+    if operator == "==":
+        return ("set", [value])
+    if operator == "in" and isinstance(value, (list, tuple)):
+        return ("set", list(value))
+    if operator == "!=":
+        return ("not", value)
+    if operator in (">", ">=", "<", "<="):
+        try:
+            bound = float(value)
+        except (TypeError, ValueError):
+            return None
+        if operator in (">", ">="):
+            return ("range", bound, operator == ">=", math.inf, False)
+        return ("range", -math.inf, False, bound, operator == "<=")
+    return None
+
+
+def _in_range(value: Any, lo: float, lo_incl: bool, hi: float, hi_incl: bool) -> bool:
+    try:
+        v = float(value)
+    except (TypeError, ValueError):
+        return False
+    return (v > lo or (lo_incl and v == lo)) and (v < hi or (hi_incl and v == hi))
+
+
+def conditions_overlap(
+    a: Optional[Dict[str, Any]], b: Optional[Dict[str, Any]]
+) -> bool:
+    """
+    True when some value of the shared field satisfies both conditions.
+    Conditions on different fields, or with operators that cannot be
+    compared statically, are not reported.
+    """
+    if not a or not b or not a.get("field") or a.get("field") != b.get("field"):
+        return False
+    pa, pb = _predicate(a), _predicate(b)
+    if pa is None or pb is None:
+        return False
+    if pa[0] == "not" and pb[0] == "not":
+        return True
+    if pb[0] == "not" or (pb[0] == "set" and pa[0] == "range"):
+        pa, pb = pb, pa
+
+    if pa[0] == "not":
+        if pb[0] == "set":
+            return any(v != pa[1] for v in pb[1])
+        return True
+    if pa[0] == "set":
+        if pb[0] == "set":
+            return any(v in pb[1] for v in pa[1])
+        return any(_in_range(v, *pb[1:]) for v in pa[1])
+    # range & range
+    _, lo_a, lo_a_incl, hi_a, hi_a_incl = pa
+    _, lo_b, lo_b_incl, hi_b, hi_b_incl = pb
+    lo, lo_incl = max((lo_a, lo_a_incl), (lo_b, lo_b_incl), key=lambda x: (x[0], not x[1]))
+    hi, hi_incl = min((hi_a, hi_a_incl), (hi_b, hi_b_incl), key=lambda x: (x[0], x[1]))
+    return lo < hi or (lo == hi and lo_incl and hi_incl)
+
+
+class CompiledVersion(NamedTuple):
+    table: OutcomeTable
+    sla_hours: Dict[Hashable, int]
+    # Picks the step's team calendar when projecting completion
+    required_role_id: Dict[Hashable, Optional[UUID]]
+
+
+class OutcomeTables:
+    """
+    Outcome tables, step SLAs and roles of published versions, keyed by version id.
+    Versions are immutable, so an entry never goes stale; the LRU only
+    bounds memory.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._compiled: "OrderedDict[UUID, CompiledVersion]" = OrderedDict()
+
+    def get(self, db: Session, version_id: UUID) -> OutcomeTable:
+        return self.compiled(db, version_id).table
+
+    def compiled(self, db: Session, version_id: UUID) -> CompiledVersion:
+        with self._lock:
+            compiled = self._compiled.get(version_id)
+            if compiled is not None:
+                self._compiled.move_to_end(version_id)
+                return compiled
+
+        steps = (
+            db.query(WorkflowStep)
+            .options(selectinload(WorkflowStep.transitions_from))
+            .filter(WorkflowStep.version_id == version_id)
+            .all()
+        )
+        compiled = CompiledVersion(
+            WorkflowGraphAnalyzer.from_steps(steps).outcome_table(),
+            {s.id: s.sla_hours for s in steps},
+            {s.id: s.required_role_id for s in steps},
+        )
+        with self._lock:
+            self._compiled[version_id] = compiled
+            while len(self._compiled) > self.max_entries:
+                self._compiled.popitem(last=False)
+        return compiled
+
+    def clear(self) -> None:
+        with self._lock:
+            self._compiled.clear()
+
+
+outcome_tables = OutcomeTables(settings.WORKFLOW_CACHE_SIZE)
@@ -4,15 +4,30 @@ Responsibility: Manage workflow definitions (Workflows, Steps, Transitions)
 """
 
 import logging
-from typing import List, Optional, Dict, Any
+import uuid
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Sequence, Tuple
 from uuid import UUID
+from sqlalchemy import func, insert, update
 from sqlalchemy.orm import Session
-from app.db.models.workflow import Workflow, WorkflowStep, StepTransition
+from app.db.models.calendar import BusinessCalendar
+from app.db.models.request import WorkflowRequest
+from app.db.models.workflow import (
+    Workflow,
+    WorkflowVersion,
+    WorkflowStep,
+    StepTransition,
+    StepType,
+)
 from app.schemas.workflow import (
     WorkflowCreate,
+    WorkflowSchema,
     WorkflowUpdate,
 )  # I'll need to ensure these exist
-from app.core.exceptions import ResourceNotFoundError
+from app.core.exceptions import ResourceNotFoundError, WorkflowValidationError
+from app.services import post_commit
+from app.services.definition_cache import definition_cache
+from app.services.workflow_graph import WorkflowGraphAnalyzer
 
 logger = logging.getLogger("workflow-platform.workflow_service")
 
@@ -23,73 +38,434 @@ class WorkflowService:
         db: Session, workflow_in: Dict[str, Any], creator_id: UUID
     ) -> Workflow:
         """
-        Create a new workflow with nested steps and transitions.
+        Create a new workflow; its steps and transitions become version 1.
         """
+        WorkflowService._validate_definition(
+            workflow_in["name"],
+            workflow_in.get("steps", []),
+            workflow_in.get("transitions", []),
+        )
+        WorkflowService._check_calendars(db, [workflow_in.get("calendar_id")])
         workflow = Workflow(
             name=workflow_in["name"],
             description=workflow_in.get("description"),
+            calendar_id=workflow_in.get("calendar_id"),
             created_by=creator_id,
             is_active=True,
         )
         db.add(workflow)
         db.flush()
 
-        steps_map = {}  # To link transitions to step IDs later
-
-        # Create steps
-        for step_data in workflow_in.get("steps", []):
-            step = WorkflowStep(
-                workflow_id=workflow.id,
-                name=step_data["name"],
-                description=step_data.get("description"),
-                step_order=step_data["step_order"],
-                sla_hours=step_data.get("sla_hours", 24),
-                required_role_id=step_data.get("required_role_id"),
-                required_permission_id=step_data.get("required_permission_id"),
-                is_conditional=step_data.get("is_conditional", False),
-                condition_config=step_data.get("condition_config"),
+        WorkflowService._publish(
+            db,
+            workflow,
+            workflow_in.get("steps", []),
+            workflow_in.get("transitions", []),
+            creator_id,
+        )
+
+        db.commit()
+        db.refresh(workflow)
+        return workflow
+
+    @staticmethod
+    def publish_version(
+        db: Session, workflow_id: UUID, version_in: Dict[str, Any], publisher_id: UUID
+    ) -> WorkflowVersion:
+        """
+        Publish a new definition of a workflow. New requests start on it;
+        running requests stay on the version they started on.
+        """
+        workflow = (
+            db.query(Workflow)
+            .filter(Workflow.id == workflow_id)
+            .with_for_update()  # serializes version numbers
+            .first()
+        )
+        if not workflow:
+            raise ResourceNotFoundError(f"Workflow {workflow_id} not found")
+        WorkflowService._validate_definition(
+            workflow.name, version_in["steps"], version_in.get("transitions", [])
+        )
+
+        version = WorkflowService._publish(
+            db,
+            workflow,
+            version_in["steps"],
+            version_in.get("transitions", []),
+            publisher_id,
+            notes=version_in.get("notes"),
+        )
+        WorkflowService._invalidate_definition(db, workflow.id)
+        db.commit()
+        db.refresh(version)
+        logger.info(
+            f"Published version {version.version_number} of Workflow {workflow.id}"
+        )
+        return version
+
+    @staticmethod
+    def _publish(
+        db: Session,
+        workflow: Workflow,
+        steps: List[Dict[str, Any]],
+        transitions: List[Dict[str, Any]],
+        publisher_id: Optional[UUID],
+        notes: Optional[str] = None,
+    ) -> WorkflowVersion:
+        """
+        Add a version holding `steps` and `transitions` and make it current.
+        Callers validate the definition first. Does not commit.
+        """
+        latest = (
+            db.query(func.max(WorkflowVersion.version_number))
+            .filter(WorkflowVersion.workflow_id == workflow.id)
+            .scalar()
+        )
+        version = WorkflowVersion(
+            id=uuid.uuid4(),
+            workflow_id=workflow.id,
+            version_number=(latest or 0) + 1,
+            notes=notes,
+            published_by=publisher_id,
+        )
+        db.add(version)
+        db.flush()
+
+        step_rows, transition_rows = WorkflowService._definition_rows(
+            workflow.id, version.id, steps, transitions
+        )
+        WorkflowService._insert_definition_rows(db, step_rows, transition_rows)
+
+        workflow.current_version_id = version.id
+        # Moves the definition's cache key and ETag even on the same clock tick
+        workflow.updated_at = datetime.utcnow()
+        return version
+
+    @staticmethod
+    def _validate_definition(
+        name: str, steps: List[Dict[str, Any]], transitions: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Reject a definition that would strand requests at runtime
+        (WorkflowValidationError); log its warnings.
+        """
+        try:
+            warnings = WorkflowGraphAnalyzer.from_definition(steps, transitions).validate()
+        except WorkflowValidationError as e:
+            raise WorkflowValidationError(f"Workflow '{name}': {e}", issues=e.issues)
+        for issue in warnings:
+            logger.warning(f"Workflow '{name}', step {issue.step}: {issue.message}")
+
+    @staticmethod
+    def _check_calendars(db: Session, calendar_ids: List[Optional[UUID]]) -> None:
+        wanted = {c for c in calendar_ids if c is not None}
+        if not wanted:
+            return
+        found = {
+            row.id
+            for row in db.query(BusinessCalendar.id).filter(
+                BusinessCalendar.id.in_(wanted)
+            )
+        }
+        if wanted - found:
+            raise ResourceNotFoundError(f"Calendar {sorted(wanted - found)[0]} not found")
+
+    @staticmethod
+    def _definition_rows(
+        workflow_id: UUID,
+        version_id: UUID,
+        steps: List[Dict[str, Any]],
+        transitions: List[Dict[str, Any]],
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Step and transition rows of one version, with ids generated here so
+        transitions can reference their steps without a flush per step.
+        """
+        step_rows = []
+        step_ids = {}  # step_order -> id, to link transitions
+
+        for step_data in steps:
+            step_id = uuid.uuid4()
+            step_ids[step_data["step_order"]] = step_id
+            step_rows.append(
+                {
+                    "id": step_id,
+                    "workflow_id": workflow_id,
+                    "version_id": version_id,
+                    "name": step_data["name"],
+                    "description": step_data.get("description"),
+                    "step_order": step_data["step_order"],
+                    "sla_hours": step_data.get("sla_hours", 24),
+                    "required_role_id": step_data.get("required_role_id"),
+                    "required_permission_id": step_data.get("required_permission_id"),
+                    "is_conditional": step_data.get("is_conditional", False),
+                    "condition_config": step_data.get("condition_config"),
+                    "step_type": step_data.get("step_type") or StepType.HUMAN,
+                    "action_config": step_data.get("action_config"),
+                    "join_policy": step_data.get("join_policy"),
+                    "join_threshold": step_data.get("join_threshold"),
+                    "assignment_strategy": step_data.get("assignment_strategy"),
+                    "assignment_skill": step_data.get("assignment_skill"),
+                }
             )
-            db.add(step)
-            db.flush()
-            steps_map[step.step_order] = step
 
-        # Create transitions
-        for trans_data in workflow_in.get("transitions", []):
-            from_step = steps_map.get(trans_data["from_step_order"])
+        transition_rows = []
+        for trans_data in transitions:
+            from_step_id = step_ids.get(trans_data["from_step_order"])
+            if not from_step_id:
+                continue
             # explicitly resolve to_step, or None if order is null/missing
             to_step_order = trans_data.get("to_step_order")
-            to_step = (
-                steps_map.get(to_step_order) if to_step_order is not None else None
+            transition_rows.append(
+                {
+                    "id": uuid.uuid4(),
+                    "from_step_id": from_step_id,
+                    "to_step_id": step_ids.get(to_step_order)
+                    if to_step_order is not None
+                    else None,
+                    "outcome": trans_data["outcome"],
+                    "condition_config": trans_data.get("condition_config"),
+                    "is_parallel": trans_data.get("is_parallel", False),
+                }
             )
+        return step_rows, transition_rows
 
-            if not from_step:
-                continue
+    @staticmethod
+    def _insert_definition_rows(
+        db: Session,
+        step_rows: List[Dict[str, Any]],
+        transition_rows: List[Dict[str, Any]],
+    ) -> None:
+        # render_nulls keeps rows with and without e.g. a to_step_id in one
+        # batch instead of one statement per run of equal key sets
+        for model, rows in ((WorkflowStep, step_rows), (StepTransition, transition_rows)):
+            if rows:
+                db.execute(
+                    insert(model).execution_options(render_nulls=True), rows
+                )
 
-            transition = StepTransition(
-                from_step_id=from_step.id,
-                to_step_id=to_step.id if to_step else None,
-                outcome=trans_data["outcome"],
-                condition_config=trans_data.get("condition_config"),
+    @staticmethod
+    def import_workflows(
+        db: Session, workflows_in: List[Dict[str, Any]], creator_id: UUID
+    ) -> List[UUID]:
+        """
+        Create many workflows, each with its definition as version 1, in one
+        transaction: one multi-row insert per table, whatever the count.
+        Returns the new workflow ids in input order. Does not commit.
+        """
+        WorkflowService._check_calendars(
+            db, [w.get("calendar_id") for w in workflows_in]
+        )
+        now = datetime.utcnow()
+        workflow_rows, version_rows, step_rows, transition_rows = [], [], [], []
+        for workflow_in in workflows_in:
+            WorkflowService._validate_definition(
+                workflow_in["name"],
+                workflow_in.get("steps", []),
+                workflow_in.get("transitions", []),
+            )
+            workflow_id, version_id = uuid.uuid4(), uuid.uuid4()
+            workflow_rows.append(
+                {
+                    "id": workflow_id,
+                    "name": workflow_in["name"],
+                    "description": workflow_in.get("description"),
+                    "calendar_id": workflow_in.get("calendar_id"),
+                    "created_by": creator_id,
+                    "is_active": True,
+                    "updated_at": now,
+                }
             )
-            db.add(transition)
+            version_rows.append(
+                {
+                    "id": version_id,
+                    "workflow_id": workflow_id,
+                    "version_number": 1,
+                    "published_by": creator_id,
+                }
+            )
+            steps, transitions = WorkflowService._definition_rows(
+                workflow_id,
+                version_id,
+                workflow_in.get("steps", []),
+                workflow_in.get("transitions", []),
+            )
+            step_rows.extend(steps)
+            transition_rows.extend(transitions)
+
+        if not workflow_rows:
+            return []
+        # workflows <-> workflow_versions reference each other: insert the
+        # workflows first and point them at their version afterwards
+        db.execute(insert(Workflow), workflow_rows)
+        db.execute(insert(WorkflowVersion), version_rows)
+        WorkflowService._insert_definition_rows(db, step_rows, transition_rows)
+        db.execute(
+            update(Workflow),
+            [
+                {"id": row["workflow_id"], "current_version_id": row["id"]}
+                for row in version_rows
+            ],
+        )
+        logger.info(
+            f"Imported {len(workflow_rows)} workflows with {len(step_rows)} steps"
+        )
+        return [row["id"] for row in workflow_rows]
 
+    @staticmethod
+    def update_workflow(
+        db: Session, workflow_id: UUID, workflow_in: Dict[str, Any]
+    ) -> Workflow:
+        """
+        Update a workflow's name, description, active flag or calendar
+        (an explicit null calendar_id clears it). Steps and transitions only
+        change by publishing a new version.
+        """
+        workflow = WorkflowService.get_workflow(db, workflow_id)
+        for field in ("name", "description", "is_active"):
+            if workflow_in.get(field) is not None:
+                setattr(workflow, field, workflow_in[field])
+        if "calendar_id" in workflow_in:
+            WorkflowService._check_calendars(db, [workflow_in["calendar_id"]])
+            workflow.calendar_id = workflow_in["calendar_id"]
+        workflow.updated_at = datetime.utcnow()
+        WorkflowService._invalidate_definition(db, workflow.id)
         db.commit()
         db.refresh(workflow)
         return workflow
 
     @staticmethod
-    def get_workflow(db: Session, workflow_id: UUID) -> Workflow:
-        workflow = db.query(Workflow).filter(Workflow.id == workflow_id).first()
+    def get_version(
+        db: Session, workflow_id: UUID, version_number: int, options: Sequence[Any] = ()
+    ) -> WorkflowVersion:
+        version = (
+            db.query(WorkflowVersion)
+            .options(*options)
+            .filter(
+                WorkflowVersion.workflow_id == workflow_id,
+                WorkflowVersion.version_number == version_number,
+            )
+            .first()
+        )
+        if not version:
+            raise ResourceNotFoundError(
+                f"Version {version_number} of Workflow {workflow_id} not found"
+            )
+        return version
+
+    @staticmethod
+    def list_versions(db: Session, workflow_id: UUID) -> List[WorkflowVersion]:
+        WorkflowService.get_workflow(db, workflow_id)
+        return (
+            db.query(WorkflowVersion)
+            .filter(WorkflowVersion.workflow_id == workflow_id)
+            .order_by(WorkflowVersion.version_number)
+            .all()
+        )
+
+    @staticmethod
+    def get_workflow(
+        db: Session, workflow_id: UUID, options: Sequence[Any] = ()
+    ) -> Workflow:
+        workflow = (
+            db.query(Workflow)
+            .options(*options)
+            .filter(Workflow.id == workflow_id)
+            .first()
+        )
         if not workflow:
             raise ResourceNotFoundError(f"Workflow {workflow_id} not found")
         return workflow
 
     @staticmethod
-    def list_workflows(db: Session, skip: int = 0, limit: int = 100) -> List[Workflow]:
-        return db.query(Workflow).offset(skip).limit(limit).all()
+    def list_workflows(
+        db: Session, skip: int = 0, limit: int = 100, options: Sequence[Any] = ()
+    ) -> List[Workflow]:
+        """
+        `options` are loader options, e.g. WorkflowSchema.loader_options()
+        when the result is serialized with nested steps.
+        """
+        return (
+            db.query(Workflow)
+            .options(*options)
+            .order_by(Workflow.created_at, Workflow.id)
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
 
     @staticmethod
-    def delete_workflow(db: Session, workflow_id: UUID) -> None:
+    def list_definition_keys(
+        db: Session, skip: int = 0, limit: int = 100
+    ) -> List[Tuple[UUID, datetime]]:
+        """
+        (id, updated_at) of a page of workflows, in list_workflows order.
+        """
+        return [
+            (row.id, row.updated_at)
+            for row in db.query(Workflow.id, Workflow.updated_at)
+            .order_by(Workflow.created_at, Workflow.id)
+            .offset(skip)
+            .limit(limit)
+        ]
+
+    @staticmethod
+    def serialized_definitions(
+        db: Session, keys: Sequence[Tuple[UUID, datetime]]
+    ) -> List[Tuple[Tuple[UUID, datetime], bytes]]:
+        """
+        (key, WorkflowSchema JSON) for each (id, updated_at) in `keys`, from
+        the definition cache; misses are loaded in one query and cached.
+        A workflow changed since `keys` were read is returned as reloaded,
+        under its new key, and one deleted since is left out, so callers
+        must build validators from the keys returned.
+        """
+        entries = {
+            workflow_id: (updated_at, definition_cache.get(workflow_id, updated_at))
+            for workflow_id, updated_at in keys
+        }
+        missing = [workflow_id for workflow_id, (_, body) in entries.items() if body is None]
+        if missing:
+            for workflow in (
+                db.query(Workflow)
+                .options(*WorkflowSchema.loader_options())
+                .filter(Workflow.id.in_(missing))
+            ):
+                body = WorkflowSchema.model_validate(workflow).model_dump_json().encode()
+                definition_cache.put(workflow.id, workflow.updated_at, body)
+                entries[workflow.id] = (workflow.updated_at, body)
+        return [
+            ((workflow_id, updated_at), body)
+            for workflow_id, (updated_at, body) in entries.items()
+            if body is not None
+        ]
+
+    @staticmethod
+    def _invalidate_definition(db: Session, workflow_id: UUID) -> None:
+        post_commit.on_commit(db, definition_cache.invalidate, workflow_id)
+
+    @staticmethod
+    def delete_workflow(db: Session, workflow_id: UUID) -> bool:
+        """
+        Delete a workflow that has never been used. One with requests is
+        deactivated instead, so their history and step records survive.
+        Returns True if the workflow was deleted.
+        """
         workflow = WorkflowService.get_workflow(db, workflow_id)
-        db.delete(workflow)
+        in_use = db.query(
+            db.query(WorkflowRequest)
+            .filter(WorkflowRequest.workflow_id == workflow_id)
+            .exists()
+        ).scalar()
+        if in_use:
+            workflow.is_active = False
+            workflow.updated_at = datetime.utcnow()
+            logger.info(f"Workflow {workflow_id} has requests; deactivated instead of deleted")
+        else:
+            workflow.current_version_id = None
+            db.flush()
+            db.delete(workflow)
+        WorkflowService._invalidate_definition(db, workflow_id)
         db.commit()
+        return not in_use
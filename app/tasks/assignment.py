@@ -0,0 +1,27 @@
+"""
+Assignment Tasks
+Responsibility: Periodic reset of the assignee load counters
+"""
+
+import logging
+from app.core.celery_app import celery_app
+from app.db.session import SessionLocal
+from app.services.assignment import load_counter
+
+logger = logging.getLogger("workflow-platform.tasks")
+
+
+@celery_app.task(name="app.tasks.assignment.reconcile_assignee_load")
+def reconcile_assignee_load():
+    """
+    Periodic task: reset the shared load counters from request_steps,
+    correcting drift from rolled-back assignments.
+    """
+    db = SessionLocal()
+    try:
+        return len(load_counter.reconcile(db))
+    except Exception as e:
+        logger.error(f"Assignee load reconcile failed: {e}")
+        return 0
+    finally:
+        db.close()
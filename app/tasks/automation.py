@@ -0,0 +1,43 @@
+"""
+Automation Tasks
+Responsibility: Execute automatic (system) workflow steps on workers
+"""
+
+import logging
+from uuid import UUID
+from app.core.celery_app import celery_app
+from app.core.exceptions import ConcurrencyConflictError
+from app.db.session import SessionLocal
+
+logger = logging.getLogger("workflow-platform.tasks")
+
+
+@celery_app.task(
+    bind=True,
+    name="app.tasks.automation.run_automatic_steps",
+    max_retries=5,
+    default_retry_delay=2,
+)
+def run_automatic_steps(self, request_id: str):
+    """
+    Run every automatic step that is open on a request, following chains of
+    automatic steps in one transaction.
+    """
+    # Imported here: the engine imports this module to enqueue the task
+    from app.services.workflow_engine import WorkflowEngine
+
+    db = SessionLocal()
+    try:
+        executed = WorkflowEngine.run_automatic_steps(db, UUID(str(request_id)))
+        db.commit()
+        return executed
+    except ConcurrencyConflictError as e:
+        db.rollback()
+        # A human decision holds the request lock; try again shortly
+        raise self.retry(exc=e)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Automatic steps failed for Request {request_id}: {e}")
+        raise
+    finally:
+        db.close()
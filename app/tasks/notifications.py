@@ -4,12 +4,13 @@ Responsibility: Asynchronous execution of notification logic
 """
 
 import logging
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 from app.core.celery_app import celery_app
 from app.db.session import SessionLocal
 from app.db.models.user import User, Role
 from app.db.models.workflow import WorkflowStep
+from app.services.delegation import DelegationService
 from app.services.notification import NotificationService
 
 logger = logging.getLogger("workflow-platform.tasks")
@@ -17,10 +18,17 @@ logger = logging.getLogger("workflow-platform.tasks")
 
 @celery_app.task(name="app.tasks.notifications.notify_new_assignment")
 def notify_new_assignment(
-    step_id: UUID, request_id: UUID, workflow_name: str, step_name: str, deadline: str
+    step_id: UUID,
+    request_id: UUID,
+    workflow_name: str,
+    step_name: str,
+    deadline: str,
+    assignee_id: Optional[UUID] = None,
 ):
     """
-    Find eligible assignees and notify them of a new task.
+    Notify the step's assignee of a new task, or every eligible member of
+    its role when it was not assigned to one person. Recipients who are out
+    of office are replaced by their delegates.
     """
     db = SessionLocal()
     try:
@@ -28,15 +36,11 @@ def notify_new_assignment(
         if not step_def:
             return
 
-        emails = []
-        if step_def.required_role_id:
-            users = (
-                db.query(User)
-                .join(User.roles)
-                .filter(Role.id == step_def.required_role_id)
-                .all()
-            )
-            emails = [u.email for u in users if u.is_active]
+        if assignee_id:
+            delegate_id = DelegationService.resolve(db, UUID(str(assignee_id)))
+            emails = list(_assignee_emails(db, [delegate_id]).values())
+        else:
+            emails = _eligible_emails(db, step_def)
 
         if not emails:
             logger.info(
@@ -57,6 +61,100 @@ def notify_new_assignment(
         db.close()
 
 
+@celery_app.task(name="app.tasks.notifications.notify_new_assignments_batch")
+def notify_new_assignments_batch(
+    step_id: str,
+    workflow_name: str,
+    step_name: str,
+    assignments: List[Dict[str, Any]],
+):
+    """
+    Notify eligible assignees of many new tasks on the same step.
+    Recipients are resolved once for the whole batch: the assignee of an
+    assigned task, the role's members otherwise.
+    assignments: [{"request_id": str, "deadline": str, "assignee_id": str|None}, ...]
+    """
+    db = SessionLocal()
+    try:
+        step_def = db.query(WorkflowStep).filter(WorkflowStep.id == step_id).first()
+        if not step_def:
+            return
+
+        delegates = DelegationService.resolve_many(
+            db, {UUID(str(a["assignee_id"])) for a in assignments if a.get("assignee_id")}
+        )
+        delegate_emails = _assignee_emails(db, list(set(delegates.values())))
+        assignee_emails = {
+            str(assignee_id): delegate_emails[str(delegate_id)]
+            for assignee_id, delegate_id in delegates.items()
+            if str(delegate_id) in delegate_emails
+        }
+        role_emails = (
+            _eligible_emails(db, step_def)
+            if any(not a.get("assignee_id") for a in assignments)
+            else []
+        )
+
+        if not assignee_emails and not role_emails:
+            logger.info(
+                f"No active users found for role in step {step_id}. Skipping {len(assignments)} notifications."
+            )
+            return
+
+        sent = 0
+        for assignment in assignments:
+            if assignment.get("assignee_id"):
+                email = assignee_emails.get(str(assignment["assignee_id"]))
+                emails = [email] if email else []
+            else:
+                emails = role_emails
+            for email in emails:
+                NotificationService.notify_task_assigned(
+                    email=email,
+                    workflow_name=workflow_name,
+                    step_name=step_name,
+                    request_id=str(assignment["request_id"]),
+                    deadline=assignment["deadline"],
+                )
+                sent += 1
+        return sent
+    finally:
+        db.close()
+
+
+def _eligible_emails(db, step_def: WorkflowStep) -> List[str]:
+    """
+    Emails of active users holding the step's required role, with members
+    who are out of office replaced by their delegates.
+    """
+    if not step_def.required_role_id:
+        return []
+    users = (
+        db.query(User)
+        .join(User.roles)
+        .filter(Role.id == step_def.required_role_id)
+        .all()
+    )
+    active = {u.id: u.email for u in users if u.is_active}
+    delegates = DelegationService.resolve_many(db, active)
+    away = {d for u, d in delegates.items() if d != u and d not in active}
+    delegate_emails = _assignee_emails(db, list(away))
+    emails = [
+        active.get(d) or delegate_emails.get(str(d)) for d in dict.fromkeys(delegates.values())
+    ]
+    return [e for e in emails if e]
+
+
+def _assignee_emails(db, user_ids: List[Any]) -> Dict[str, str]:
+    """
+    Emails of the given users that are active, keyed by user id.
+    """
+    if not user_ids:
+        return {}
+    users = db.query(User).filter(User.id.in_({UUID(str(u)) for u in user_ids})).all()
+    return {str(u.id): u.email for u in users if u.is_active}
+
+
 @celery_app.task(name="app.tasks.notifications.send_sla_breach_email")
 def send_sla_breach_email(
     emails: List[str],
@@ -0,0 +1,76 @@
+"""
+Outbox Tasks
+Responsibility: Relay the transactional outbox to the broker and execute
+the batches it publishes
+"""
+
+import logging
+import time
+from typing import Any, Dict, List
+from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.outbox import Outbox
+
+logger = logging.getLogger("workflow-platform.tasks")
+
+
+@celery_app.task(name="app.tasks.outbox.process_outbox_batch")
+def process_outbox_batch(messages: List[Dict[str, Any]]):
+    """
+    Run a batch of outbox messages in this worker.
+    A message whose task fails is re-sent on its own, so it follows the
+    task's normal retry path without holding up the rest of the batch.
+    """
+    executed = 0
+    for message in messages:
+        task = celery_app.tasks.get(message["task"])
+        if task is None:
+            logger.error(
+                f"Outbox message {message['id']} names unknown task {message['task']}"
+            )
+            continue
+        try:
+            task(**message["kwargs"])
+            executed += 1
+        except Exception as e:
+            logger.warning(
+                f"Outbox message {message['id']} ({message['task']}) failed, re-sending: {e}"
+            )
+            task.apply_async(kwargs=message["kwargs"])
+    return executed
+
+
+@celery_app.task(name="app.tasks.outbox.relay_outbox")
+def relay_outbox(max_seconds: float = 5.0):
+    """
+    Periodic task: drain the outbox batch by batch for up to `max_seconds`.
+    """
+    deadline = time.monotonic() + max_seconds
+    total = 0
+    db = SessionLocal()
+    try:
+        while time.monotonic() < deadline:
+            published = Outbox.relay_batch(db)
+            total += published
+            if published < settings.OUTBOX_BATCH_SIZE:
+                break
+        return total
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Outbox relay failed: {e}")
+        return total
+    finally:
+        db.close()
+
+
+@celery_app.task(name="app.tasks.outbox.purge_outbox")
+def purge_outbox():
+    """
+    Periodic task: delete dispatched outbox messages past retention.
+    """
+    db = SessionLocal()
+    try:
+        return Outbox.purge(db)
+    finally:
+        db.close()
@@ -0,0 +1,29 @@
+"""
+Statistics Tasks
+Responsibility: Periodic aggregation of step-duration statistics
+"""
+
+import logging
+from app.core.celery_app import celery_app
+from app.db.session import SessionLocal
+from app.services.step_stats import StepStatistics
+
+logger = logging.getLogger("workflow-platform.tasks")
+
+
+@celery_app.task(name="app.tasks.stats.aggregate_step_durations")
+def aggregate_step_durations():
+    """
+    Periodic task: aggregate the steps completed since the previous run.
+    """
+    db = SessionLocal()
+    try:
+        steps = StepStatistics.aggregate(db)
+        db.commit()
+        return steps
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Step-duration aggregation failed: {e}")
+        return 0
+    finally:
+        db.close()
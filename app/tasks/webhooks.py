@@ -0,0 +1,35 @@
+"""
+Webhook Tasks
+Responsibility: Deliver pending webhook events to subscribed endpoints
+"""
+
+import logging
+import time
+from app.core.celery_app import celery_app
+from app.db.session import SessionLocal
+from app.services.webhooks import WebhookDispatcher
+
+logger = logging.getLogger("workflow-platform.tasks")
+
+
+@celery_app.task(name="app.tasks.webhooks.deliver_webhooks")
+def deliver_webhooks(max_seconds: float = 5.0):
+    """
+    Periodic task: send due deliveries, run after run, for up to `max_seconds`.
+    """
+    deadline = time.monotonic() + max_seconds
+    total = 0
+    db = SessionLocal()
+    try:
+        while time.monotonic() < deadline:
+            claimed, delivered = WebhookDispatcher.run_once(db)
+            total += delivered
+            if not claimed:
+                break
+        return total
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Webhook delivery run failed: {e}")
+        return total
+    finally:
+        db.close()
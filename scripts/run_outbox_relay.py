@@ -0,0 +1,40 @@
+# Outbox relay startup script
+# Responsibility: Continuously publish the transactional outbox to the broker
+# Usage: python scripts/run_outbox_relay.py
+# Lower latency alternative to the relay_outbox beat task; several relays can
+# run side by side since batches are claimed with SKIP LOCKED.
+
+import logging
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.outbox import Outbox
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("workflow-platform.outbox_relay")
+
+
+def main() -> None:
+    logger.info("Outbox relay started")
+    while True:
+        db = SessionLocal()
+        try:
+            published = Outbox.relay_batch(db)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Outbox relay failed: {e}")
+            published = 0
+        finally:
+            db.close()
+
+        if published < settings.OUTBOX_BATCH_SIZE:
+            time.sleep(settings.OUTBOX_POLL_SECONDS)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,10 @@
-from typing import Generator
+from contextlib import contextmanager
+from typing import AsyncGenerator, Generator, List
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import NullPool
 from fastapi.testclient import TestClient
 import sys
 import os
@@ -30,6 +33,16 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async endpoints run on aiosqlite against the same database file.
+# NullPool: each TestClient runs its own event loop, so connections must not
+# be reused across loops.
+async_engine = create_async_engine(
+    "sqlite+aiosqlite:///./test.db", poolclass=NullPool
+)
+TestingAsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 
 @pytest.fixture(scope="session", autouse=True)
 def db_engine():
@@ -49,15 +62,18 @@ def db_engine():
 
 @pytest.fixture(scope="function")
 def db() -> Generator[Session, None, None]:
-    connection = engine.connect()
-    transaction = connection.begin()
-    session = TestingSessionLocal(bind=connection)
+    # Data is committed for real so that the separate aiosqlite connection used
+    # by async endpoints can see it; every table is emptied afterwards instead
+    # of rolling back an outer transaction.
+    session = TestingSessionLocal()
 
     yield session
 
+    session.rollback()
     session.close()
-    transaction.rollback()
-    connection.close()
+    with engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
 
 
 @pytest.fixture(scope="module")
@@ -71,6 +87,48 @@ def override_get_db(db: Session):
     def _override_get_db():
         yield db
 
+    async def _override_get_async_db() -> AsyncGenerator[AsyncSession, None]:
+        async with TestingAsyncSessionLocal() as async_db:
+            yield async_db
+
     app.dependency_overrides[deps.get_db] = _override_get_db
+    app.dependency_overrides[deps.get_async_db] = _override_get_async_db
     yield
     app.dependency_overrides.pop(deps.get_db)
+    app.dependency_overrides.pop(deps.get_async_db)
+
+
+class QueryCounter:
+    """
+    Records the SQL statements run on the test engines (sync and async).
+    Usage:
+        with query_counter.max(5):
+            client.get(...)
+    """
+
+    def __init__(self):
+        self.statements: List[str] = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @contextmanager
+    def max(self, limit: int):
+        self.statements = []
+        targets = (engine, async_engine.sync_engine)
+        for target in targets:
+            event.listen(target, "before_cursor_execute", self._record)
+        try:
+            yield self
+        finally:
+            for target in targets:
+                event.remove(target, "before_cursor_execute", self._record)
+        listing = "\n".join(self.statements)
+        assert len(self.statements) <= limit, (
+            f"{len(self.statements)} SQL statements, expected at most {limit}:\n{listing}"
+        )
+
+
+@pytest.fixture(scope="function")
+def query_counter() -> QueryCounter:
+    return QueryCounter()
@@ -8,6 +8,7 @@ from app.db.models.request import WorkflowRequest, RequestStatus, RequestStep, S
 from app.core import security
 import uuid
 import traceback
+from datetime import datetime
 
 def setup_orchestration_env(client: TestClient, db: Session):
     # 1. Create Roles
@@ -127,3 +128,715 @@ def test_request_rbac_enforcement(client: TestClient, db: Session, override_get_
     except Exception:
         traceback.print_exc()
         raise
+
+def test_read_requests_filters(client: TestClient, db: Session, override_get_db):
+    env = setup_orchestration_env(client, db)
+    headers = {"Authorization": f"Bearer {env['user_token']}"}
+
+    start_data = {"workflow_id": str(env["workflow_id"]), "request_data": {"amount": 10}}
+    r = client.post(f"{settings.API_V1_PREFIX}/requests/", json=start_data, headers=headers)
+    request_id = r.json()["id"]
+
+    r = client.get(f"{settings.API_V1_PREFIX}/requests/?status=in_progress", headers=headers)
+    assert r.status_code == 200
+    assert [req["id"] for req in r.json()] == [request_id]
+
+    r = client.get(f"{settings.API_V1_PREFIX}/requests/?status=completed", headers=headers)
+    assert r.status_code == 200
+    assert r.json() == []
+
+    r = client.get(
+        f"{settings.API_V1_PREFIX}/requests/?requester_id={env['admin_user_id']}",
+        headers=headers,
+    )
+    assert r.json() == []
+
+
+def test_bulk_start_workflow(client: TestClient, db: Session, override_get_db):
+    env = setup_orchestration_env(client, db)
+    headers = {"Authorization": f"Bearer {env['user_token']}"}
+
+    bulk_data = {
+        "workflow_id": str(env["workflow_id"]),
+        "items": [{"request_data": {"amount": i}} for i in range(25)],
+    }
+    r = client.post(f"{settings.API_V1_PREFIX}/requests/bulk", json=bulk_data, headers=headers)
+    assert r.status_code == 200
+    body = r.json()
+    assert body["created"] == 25
+    assert len(body["request_ids"]) == 25
+
+    requests = db.query(WorkflowRequest).filter(WorkflowRequest.workflow_id == env["workflow_id"]).all()
+    assert len(requests) == 25
+    assert all(req.status == RequestStatus.IN_PROGRESS for req in requests)
+    assert all(req.current_step_id == env["step1_id"] for req in requests)
+    assert {req.request_data["amount"] for req in requests} == set(range(25))
+
+    steps = db.query(RequestStep).filter(RequestStep.step_id == env["step1_id"]).all()
+    assert len(steps) == 25
+    assert all(s.status == StepStatus.PENDING and s.deadline is not None for s in steps)
+
+    # Bulk-started requests are processed like any other
+    proc_data = {"outcome": "APPROVED"}
+    r = client.post(
+        f"{settings.API_V1_PREFIX}/requests/{body['request_ids'][0]}/process",
+        json=proc_data,
+        headers=headers,
+    )
+    assert r.status_code == 200
+    assert r.json()["current_step_id"] == str(env["step2_id"])
+
+
+def test_bulk_process_reports_partial_failures(client: TestClient, db: Session, override_get_db):
+    env = setup_orchestration_env(client, db)
+    headers = {"Authorization": f"Bearer {env['user_token']}"}
+
+    bulk_data = {
+        "workflow_id": str(env["workflow_id"]),
+        "items": [{"request_data": {"amount": i}} for i in range(3)],
+    }
+    r = client.post(f"{settings.API_V1_PREFIX}/requests/bulk", json=bulk_data, headers=headers)
+    first, second, third = r.json()["request_ids"]
+    missing = str(uuid.uuid4())
+
+    decisions = {
+        "decisions": [
+            {"request_id": first, "outcome": "APPROVED", "context": {"comment": "ok"}},
+            {"request_id": missing, "outcome": "APPROVED"},
+            {"request_id": second, "outcome": "REJECTED"},
+            {"request_id": first, "outcome": "APPROVED"},
+        ]
+    }
+    r = client.post(f"{settings.API_V1_PREFIX}/requests/bulk/process", json=decisions, headers=headers)
+    assert r.status_code == 200
+    body = r.json()
+    assert body["processed"] == 2
+    assert body["failed"] == 2
+
+    results = body["results"]
+    assert results[0]["success"] and results[0]["current_step_id"] == str(env["step2_id"])
+    assert not results[1]["success"] and missing in results[1]["error"]
+    assert results[2]["success"] and results[2]["status"] == "COMPLETED"
+    assert not results[3]["success"]
+
+    db.expire_all()
+    untouched = db.query(WorkflowRequest).filter(WorkflowRequest.id == uuid.UUID(third)).one()
+    assert untouched.current_step_id == env["step1_id"]
+
+
+def test_bulk_process_drops_notifications_of_failed_items(
+    client: TestClient, db: Session, override_get_db, monkeypatch
+):
+    from app.core.exceptions import WorkflowEngineError
+    from app.db.models.outbox import OutboxMessage
+    from app.services.workflow_engine import WorkflowEngine
+
+    env = setup_orchestration_env(client, db)
+    headers = {"Authorization": f"Bearer {env['user_token']}"}
+    bulk_data = {
+        "workflow_id": str(env["workflow_id"]),
+        "items": [{"request_data": {"amount": i}} for i in range(2)],
+    }
+    r = client.post(f"{settings.API_V1_PREFIX}/requests/bulk", json=bulk_data, headers=headers)
+    first, second = r.json()["request_ids"]
+
+    # Fail the second decision after its next step was activated
+    activate = WorkflowEngine._activate
+
+    def failing_activate(db, request, new_exec, step, assignments):
+        activate(db, request, new_exec, step, assignments)
+        if str(request.id) == second:
+            raise WorkflowEngineError("activation failed")
+
+    monkeypatch.setattr(WorkflowEngine, "_activate", staticmethod(failing_activate))
+    decisions = {
+        "decisions": [
+            {"request_id": first, "outcome": "APPROVED"},
+            {"request_id": second, "outcome": "APPROVED"},
+        ]
+    }
+    r = client.post(f"{settings.API_V1_PREFIX}/requests/bulk/process", json=decisions, headers=headers)
+    assert [res["success"] for res in r.json()["results"]] == [True, False]
+
+    batches = db.query(OutboxMessage).filter(
+        OutboxMessage.task_name == "app.tasks.notifications.notify_new_assignments_batch",
+        OutboxMessage.payload["step_id"].as_string() == str(env["step2_id"]),
+    ).all()
+    notified = [a["request_id"] for m in batches for a in m.payload["assignments"]]
+    assert notified == [first]
+
+
+def test_process_with_stale_version_conflicts(client: TestClient, db: Session, override_get_db):
+    env = setup_orchestration_env(client, db)
+    headers = {"Authorization": f"Bearer {env['user_token']}"}
+
+    start_data = {"workflow_id": str(env["workflow_id"]), "request_data": {"amount": 5}}
+    r = client.post(f"{settings.API_V1_PREFIX}/requests/", json=start_data, headers=headers)
+    request_id = r.json()["id"]
+    version = r.json()["version"]
+
+    stale = {"outcome": "APPROVED", "expected_version": version + 1}
+    r = client.post(f"{settings.API_V1_PREFIX}/requests/{request_id}/process", json=stale, headers=headers)
+    assert r.status_code == 409
+    assert r.json()["error"] == "CONCURRENT_MODIFICATION"
+
+    current = {"outcome": "APPROVED", "expected_version": version}
+    r = client.post(f"{settings.API_V1_PREFIX}/requests/{request_id}/process", json=current, headers=headers)
+    assert r.status_code == 200
+    assert r.json()["version"] > version
+
+
+def _setup_parallel_workflow(db: Session, env: dict, join_policy, join_threshold=None, branches=2):
+    from app.db.models.workflow import JoinPolicy
+
+    workflow = Workflow(name=f"Parallel {join_policy}", created_by=env["admin_user_id"])
+    db.add(workflow)
+    db.flush()
+
+    submit = WorkflowStep(workflow_id=workflow.id, step_order=1, name="Submit", sla_hours=24)
+    reviews = [
+        WorkflowStep(workflow_id=workflow.id, step_order=2 + i, name=f"Review {i}", sla_hours=24)
+        for i in range(branches)
+    ]
+    signoff = WorkflowStep(
+        workflow_id=workflow.id, step_order=2 + branches, name="Sign-off", sla_hours=24,
+        join_policy=JoinPolicy(join_policy), join_threshold=join_threshold,
+    )
+    db.add_all([submit, *reviews, signoff])
+    db.flush()
+
+    for review in reviews:
+        db.add(StepTransition(from_step_id=submit.id, to_step_id=review.id, outcome="APPROVED", is_parallel=True))
+        db.add(StepTransition(from_step_id=review.id, to_step_id=signoff.id, outcome="APPROVED"))
+    db.commit()
+    return workflow, reviews, signoff
+
+
+def _open_steps(db: Session, request_id):
+    db.expire_all()
+    return db.query(RequestStep).filter(
+        RequestStep.request_id == uuid.UUID(request_id), RequestStep.completed_at == None
+    ).all()
+
+
+def test_parallel_branches_join_all(client: TestClient, db: Session, override_get_db):
+    env = setup_orchestration_env(client, db)
+    workflow, reviews, signoff = _setup_parallel_workflow(db, env, "ALL")
+    headers = {"Authorization": f"Bearer {env['admin_token']}"}
+    url = f"{settings.API_V1_PREFIX}/requests"
+
+    r = client.post(f"{url}/", json={"workflow_id": str(workflow.id), "request_data": {}}, headers=headers)
+    request_id = r.json()["id"]
+    r = client.post(f"{url}/{request_id}/process", json={"outcome": "APPROVED"}, headers=headers)
+    assert r.status_code == 200
+
+    # Both reviews are open at once, in the same branch group
+    open_steps = _open_steps(db, request_id)
+    assert {s.step_id for s in open_steps} == {rv.id for rv in reviews}
+    assert len({s.branch_path for s in open_steps}) == 1
+
+    first = next(s for s in open_steps if s.step_id == reviews[1].id)
+    r = client.post(
+        f"{url}/{request_id}/process",
+        json={"outcome": "APPROVED", "request_step_id": str(first.id)},
+        headers=headers,
+    )
+    assert r.status_code == 200
+    open_steps = _open_steps(db, request_id)
+    waiting = [s for s in open_steps if s.status == StepStatus.WAITING]
+    assert len(waiting) == 1 and waiting[0].join_arrivals == 1
+    assert [s.step_id for s in open_steps if s.status == StepStatus.PENDING] == [reviews[0].id]
+
+    r = client.post(f"{url}/{request_id}/process", json={"outcome": "APPROVED"}, headers=headers)
+    assert r.json()["current_step_id"] == str(signoff.id)
+    open_steps = _open_steps(db, request_id)
+    assert len(open_steps) == 1
+    assert open_steps[0].status == StepStatus.PENDING and open_steps[0].branch_path is None
+
+    r = client.post(f"{url}/{request_id}/process", json={"outcome": "APPROVED"}, headers=headers)
+    assert r.json()["status"] == "COMPLETED"
+
+
+def test_parallel_branches_join_n_of_m(client: TestClient, db: Session, override_get_db):
+    env = setup_orchestration_env(client, db)
+    workflow, reviews, signoff = _setup_parallel_workflow(db, env, "N_OF_M", join_threshold=2, branches=3)
+    headers = {"Authorization": f"Bearer {env['admin_token']}"}
+    url = f"{settings.API_V1_PREFIX}/requests"
+
+    r = client.post(f"{url}/", json={"workflow_id": str(workflow.id), "request_data": {}}, headers=headers)
+    request_id = r.json()["id"]
+    for _ in range(3):
+        r = client.post(f"{url}/{request_id}/process", json={"outcome": "APPROVED"}, headers=headers)
+        assert r.status_code == 200
+
+    # Two of three reviews reached the join; the third was skipped
+    assert r.json()["current_step_id"] == str(signoff.id)
+    db.expire_all()
+    steps = db.query(RequestStep).filter(RequestStep.request_id == uuid.UUID(request_id)).all()
+    by_step = {s.step_id: s for s in steps}
+    assert by_step[reviews[2].id].status == StepStatus.SKIPPED
+    assert by_step[signoff.id].status == StepStatus.PENDING
+    assert by_step[signoff.id].join_arrivals == 2
+
+
+def test_automatic_steps_run_as_one_chain(client: TestClient, db: Session, override_get_db):
+    from app.db.models.outbox import OutboxMessage
+    from app.db.models.workflow import StepType
+    from app.services.workflow_engine import WorkflowEngine
+
+    env = setup_orchestration_env(client, db)
+    workflow = Workflow(name="Automatic Chain", created_by=env["admin_user_id"])
+    db.add(workflow)
+    db.flush()
+    check = WorkflowStep(
+        workflow_id=workflow.id, step_order=1, name="Threshold check", sla_hours=1,
+        step_type=StepType.AUTOMATIC,
+        action_config={
+            "action": "auto_approve",
+            "condition": {"field": "request_data.amount", "operator": "<", "value": 1000},
+        },
+    )
+    book = WorkflowStep(
+        workflow_id=workflow.id, step_order=2, name="Book", sla_hours=1,
+        step_type=StepType.AUTOMATIC, action_config={"action": "pass_through"},
+    )
+    review = WorkflowStep(workflow_id=workflow.id, step_order=3, name="Review", sla_hours=24)
+    db.add_all([check, book, review])
+    db.flush()
+    db.add_all([
+        StepTransition(from_step_id=check.id, to_step_id=book.id, outcome="APPROVED"),
+        StepTransition(from_step_id=book.id, to_step_id=review.id, outcome="APPROVED"),
+    ])
+    db.commit()
+
+    headers = {"Authorization": f"Bearer {env['user_token']}"}
+    r = client.post(
+        f"{settings.API_V1_PREFIX}/requests/",
+        json={"workflow_id": str(workflow.id), "request_data": {"amount": 50}},
+        headers=headers,
+    )
+    request_id = r.json()["id"]
+    queued = db.query(OutboxMessage).filter(
+        OutboxMessage.task_name == "app.tasks.automation.run_automatic_steps"
+    ).all()
+    assert [m.payload for m in queued] == [{"request_id": request_id}]
+
+    # The worker runs both automatic steps in one go and stops at the human step
+    assert WorkflowEngine.run_automatic_steps(db, uuid.UUID(request_id)) == 2
+    db.commit()
+    assert db.query(OutboxMessage).filter(
+        OutboxMessage.task_name == "app.tasks.automation.run_automatic_steps"
+    ).count() == 1
+
+    request = db.query(WorkflowRequest).filter(WorkflowRequest.id == uuid.UUID(request_id)).one()
+    assert request.current_step_id == review.id
+    assert request.status == RequestStatus.IN_PROGRESS
+    r = client.get(f"{settings.API_V1_PREFIX}/requests/my-tasks", headers=headers)
+    assert [t["step_name"] for t in r.json() if t["request_id"] == request_id] == ["Review"]
+
+
+def test_request_timeline_and_replay(client: TestClient, db: Session, override_get_db, monkeypatch):
+    from app.db.models.event import RequestSnapshot
+    from app.services.event_store import EventStore
+
+    monkeypatch.setattr(settings, "EVENT_SNAPSHOT_INTERVAL", 3)
+    env = setup_orchestration_env(client, db)
+    db.commit()
+    headers = {"Authorization": f"Bearer {env['admin_token']}"}
+    url = f"{settings.API_V1_PREFIX}/requests"
+
+    r = client.post(f"{url}/", json={"workflow_id": str(env["workflow_id"]), "request_data": {"amount": 5}}, headers=headers)
+    request_id = r.json()["id"]
+    client.post(f"{url}/{request_id}/process", json={"outcome": "APPROVED"}, headers=headers)
+    client.post(f"{url}/{request_id}/process", json={"outcome": "APPROVED", "context": {"comment": "ok"}}, headers=headers)
+
+    r = client.get(f"{url}/{request_id}/timeline", headers=headers)
+    assert r.status_code == 200
+    events = r.json()
+    assert [e["sequence"] for e in events] == list(range(1, len(events) + 1))
+    assert [e["event_type"] for e in events] == [
+        "REQUEST_CREATED",
+        "STEP_ACTIVATED",
+        "STEP_COMPLETED",
+        "STEP_ACTIVATED",
+        "STEP_COMPLETED",
+        "REQUEST_COMPLETED",
+    ]
+
+    # Snapshots were taken every 3 events; replay starts from the latest one
+    db.expire_all()
+    rid = uuid.UUID(request_id)
+    snapshots = db.query(RequestSnapshot).filter(RequestSnapshot.request_id == rid).all()
+    assert sorted(s.sequence for s in snapshots) == [3, 6]
+    state = EventStore.replay(db, rid)
+    assert state["status"] == "COMPLETED"
+    assert state["current_step_id"] is None
+    assert sorted(s["status"] for s in state["steps"].values()) == ["APPROVED", "APPROVED"]
+
+    # The relational rows are a projection and can be rebuilt from the stream
+    request = db.query(WorkflowRequest).filter(WorkflowRequest.id == rid).one()
+    request.status = RequestStatus.IN_PROGRESS
+    request.completed_at = None
+    EventStore.rebuild_projection(db, rid)
+    db.commit()
+    assert request.status == RequestStatus.COMPLETED
+    assert request.completed_at is not None
+
+    r = client.get(f"{url}/{uuid.uuid4()}/timeline", headers=headers)
+    assert r.status_code == 404
+
+
+def test_engine_publishes_live_updates_after_commit(client: TestClient, db: Session, override_get_db):
+    import asyncio
+    from app.services import event_bus, post_commit
+
+    env = setup_orchestration_env(client, db)
+    headers = {"Authorization": f"Bearer {env['user_token']}"}
+    role_id = db.query(Role).filter(Role.name == "user").one().id
+
+    async def scenario():
+        topics = {event_bus.role_topic(role_id), event_bus.user_topic(env["standard_user_id"])}
+        async with event_bus.bus.subscribe(topics) as sub:
+            r = await asyncio.to_thread(
+                client.post,
+                f"{settings.API_V1_PREFIX}/requests/",
+                json={"workflow_id": str(env["workflow_id"]), "request_data": {}},
+                headers=headers,
+            )
+            assert r.status_code == 200
+            assert post_commit.executor.drain()
+            messages = []
+            while (message := await sub.get(timeout=0.2)) is not None:
+                messages.append(message)
+            return r.json()["id"], messages
+
+    request_id, messages = asyncio.run(scenario())
+    by_type = {m["type"]: m for m in messages}
+    assert by_type["task_added"]["request_id"] == request_id
+    assert by_type["task_added"]["step_name"] == "Step 1"
+    assert by_type["request_updated"]["request_id"] == request_id
+
+
+def test_projected_completion_and_at_risk(client: TestClient, db: Session, override_get_db):
+    env = setup_orchestration_env(client, db)
+    headers = {"Authorization": f"Bearer {env['admin_token']}"}
+
+    # Large amounts go through a 48h review, small ones through a 4h check
+    workflow_data = {
+        "name": "Projected",
+        "steps": [
+            {"name": "Intake", "step_order": 1, "sla_hours": 8},
+            {"name": "Review", "step_order": 2, "sla_hours": 48},
+            {"name": "Check", "step_order": 3, "sla_hours": 4},
+        ],
+        "transitions": [
+            {
+                "from_step_order": 1, "to_step_order": 2, "outcome": "APPROVED",
+                "condition_config": {"field": "request_data.amount", "operator": ">", "value": 1000},
+            },
+            {"from_step_order": 1, "to_step_order": 3, "outcome": "APPROVED"},
+        ],
+    }
+    workflow_id = client.post(
+        f"{settings.API_V1_PREFIX}/workflows/", json=workflow_data, headers=headers
+    ).json()["id"]
+
+    def start(amount):
+        r = client.post(
+            f"{settings.API_V1_PREFIX}/requests/",
+            json={"workflow_id": workflow_id, "request_data": {"amount": amount}},
+            headers=headers,
+        )
+        body = r.json()
+        started = datetime.fromisoformat(body["steps"][0]["started_at"])
+        projected = datetime.fromisoformat(body["projected_completion_at"])
+        return body["id"], (projected - started).total_seconds() / 3600
+
+    large_id, large_hours = start(5000)
+    small_id, small_hours = start(100)
+    assert round(large_hours) == 56
+    assert round(small_hours) == 12
+
+    r = client.get(f"{settings.API_V1_PREFIX}/requests/at-risk?within_hours=20", headers=headers)
+    assert r.status_code == 200
+    ids = [req["id"] for req in r.json()]
+    assert small_id in ids and large_id not in ids
+
+    # Once the review is under way the projection follows its deadline
+    client.post(
+        f"{settings.API_V1_PREFIX}/requests/{large_id}/process",
+        json={"outcome": "APPROVED"},
+        headers=headers,
+    )
+    r = client.get(f"{settings.API_V1_PREFIX}/requests/{large_id}", headers=headers)
+    review = next(s for s in r.json()["steps"] if s["step_name"] == "Review")
+    assert r.json()["projected_completion_at"] == review["deadline"]
+
+
+def test_business_calendar_deadlines(client: TestClient, db: Session, override_get_db):
+    env = setup_orchestration_env(client, db)
+    headers = {"Authorization": f"Bearer {env['admin_token']}"}
+
+    # One working hour a day: a 2h step always ends at 10:00 on a later day
+    every_day = {day: [["09:00", "10:00"]] for day in ("mon", "tue", "wed", "thu", "fri", "sat", "sun")}
+    r = client.post(
+        f"{settings.API_V1_PREFIX}/calendars/",
+        json={"name": "Short days", "timezone": "UTC", "working_hours": every_day},
+        headers=headers,
+    )
+    assert r.status_code == 201
+    calendar_id = r.json()["id"]
+
+    r = client.post(
+        f"{settings.API_V1_PREFIX}/calendars/",
+        json={"name": "Bad", "timezone": "Mars/Olympus"},
+        headers=headers,
+    )
+    assert r.status_code == 422
+
+    workflow_data = {
+        "name": "Calendared",
+        "calendar_id": calendar_id,
+        "steps": [{"name": "Review", "step_order": 1, "sla_hours": 2}],
+    }
+    r = client.post(f"{settings.API_V1_PREFIX}/workflows/", json=workflow_data, headers=headers)
+    assert r.status_code == 200
+    workflow_id = r.json()["id"]
+
+    r = client.post(
+        f"{settings.API_V1_PREFIX}/requests/",
+        json={"workflow_id": workflow_id, "request_data": {}},
+        headers=headers,
+    )
+    step = r.json()["steps"][0]
+    started = datetime.fromisoformat(step["started_at"])
+    deadline = datetime.fromisoformat(step["deadline"])
+    assert (deadline.hour, deadline.minute) == (10, 0)
+    assert (deadline - started).total_seconds() > 2 * 3600
+
+    # Calendars are assigned to roles only
+    r = client.patch(
+        f"{settings.API_V1_PREFIX}/calendars/{calendar_id}",
+        json={"role_ids": [str(env["admin_user_id"])]},
+        headers=headers,
+    )
+    assert r.status_code == 404
+
+    # Without its calendar the workflow counts hours round the clock
+    r = client.delete(f"{settings.API_V1_PREFIX}/calendars/{calendar_id}", headers=headers)
+    assert r.status_code == 204
+    r = client.post(
+        f"{settings.API_V1_PREFIX}/requests/",
+        json={"workflow_id": workflow_id, "request_data": {}},
+        headers=headers,
+    )
+    step = r.json()["steps"][0]
+    hours = (
+        datetime.fromisoformat(step["deadline"]) - datetime.fromisoformat(step["started_at"])
+    ).total_seconds() / 3600
+    assert round(hours) == 2
+
+
+
+def test_projection_counts_each_step_on_its_team_calendar(
+    client: TestClient, db: Session, override_get_db
+):
+    env = setup_orchestration_env(client, db)
+    headers = {"Authorization": f"Bearer {env['admin_token']}"}
+    user_role = db.query(Role).filter(Role.name == "user").first()
+
+    # Only the reviewing team works short days; the workflow has no calendar
+    every_day = {day: [["09:00", "10:00"]] for day in ("mon", "tue", "wed", "thu", "fri", "sat", "sun")}
+    r = client.post(
+        f"{settings.API_V1_PREFIX}/calendars/",
+        json={
+            "name": "Review team", "timezone": "UTC", "working_hours": every_day,
+            "role_ids": [str(user_role.id)],
+        },
+        headers=headers,
+    )
+    assert r.status_code == 201
+
+    workflow_data = {
+        "name": "Team calendars",
+        "steps": [
+            {"name": "Intake", "step_order": 1, "sla_hours": 1},
+            {
+                "name": "Review", "step_order": 2, "sla_hours": 2,
+                "required_role_id": str(user_role.id),
+            },
+        ],
+        "transitions": [{"from_step_order": 1, "to_step_order": 2, "outcome": "APPROVED"}],
+    }
+    workflow_id = client.post(
+        f"{settings.API_V1_PREFIX}/workflows/", json=workflow_data, headers=headers
+    ).json()["id"]
+
+    r = client.post(
+        f"{settings.API_V1_PREFIX}/requests/",
+        json={"workflow_id": workflow_id, "request_data": {}},
+        headers=headers,
+    )
+    body = r.json()
+    intake_deadline = datetime.fromisoformat(body["steps"][0]["deadline"])
+    projected = datetime.fromisoformat(body["projected_completion_at"])
+    assert (projected.hour, projected.minute) == (10, 0)
+    assert (projected - intake_deadline).total_seconds() > 2 * 3600
+
+def test_least_loaded_assignment(client: TestClient, db: Session, override_get_db):
+    from app.services import post_commit
+    from app.services.assignment import load_counter
+
+    env = setup_orchestration_env(client, db)
+    headers = {"Authorization": f"Bearer {env['admin_token']}"}
+    user_role = db.query(Role).filter(Role.name == "user").first()
+    members = [env["standard_user_id"]]
+    for i in range(2):
+        member = User(
+            email=f"member{i}@test.com", username=f"member{i}", full_name="Member",
+            hashed_password=security.get_password_hash("password123"), is_active=True,
+        )
+        member.roles = [user_role]
+        db.add(member)
+        db.flush()
+        members.append(member.id)
+
+    workflow_data = {
+        "name": "Balanced",
+        "steps": [
+            {
+                "name": "Review", "step_order": 1, "required_role_id": str(user_role.id),
+                "assignment_strategy": "LEAST_LOADED",
+            },
+        ],
+    }
+    workflow_id = client.post(
+        f"{settings.API_V1_PREFIX}/workflows/", json=workflow_data, headers=headers
+    ).json()["id"]
+
+    r = client.post(
+        f"{settings.API_V1_PREFIX}/requests/bulk",
+        json={"workflow_id": workflow_id, "items": [{"request_data": {}}] * 6},
+        headers=headers,
+    )
+    assert r.status_code == 200
+    steps = (
+        db.query(RequestStep)
+        .join(WorkflowRequest)
+        .filter(WorkflowRequest.workflow_id == uuid.UUID(workflow_id))
+        .all()
+    )
+    assert sorted(sum(s.assigned_to == m for s in steps) for m in members) == [2, 2, 2]
+
+    # Members only see the tasks assigned to them
+    user_headers = {"Authorization": f"Bearer {env['user_token']}"}
+    tasks = client.get(f"{settings.API_V1_PREFIX}/requests/my-tasks", headers=user_headers).json()
+    mine = [t for t in tasks if t["workflow_name"] == "Balanced"]
+    assert len(mine) == 2
+    assert {t["assigned_to"] for t in mine} == {str(env["standard_user_id"])}
+
+    # Deciding a task frees capacity once the decision commits
+    before = load_counter.loads(db, [env["standard_user_id"]])[env["standard_user_id"]]
+    r = client.post(
+        f"{settings.API_V1_PREFIX}/requests/{mine[0]['request_id']}/process",
+        json={"outcome": "APPROVED"},
+        headers=user_headers,
+    )
+    assert r.status_code == 200
+    assert post_commit.executor.drain()
+    after = load_counter.loads(db, [env["standard_user_id"]])[env["standard_user_id"]]
+    assert after == before - 1
+
+
+def test_assignment_requires_the_step_permission(client: TestClient, db: Session, override_get_db):
+    from app.db.models.user import Permission
+
+    env = setup_orchestration_env(client, db)
+    headers = {"Authorization": f"Bearer {env['admin_token']}"}
+    user_role = db.query(Role).filter(Role.name == "user").first()
+    # The permission comes from a second role only the standard user holds
+    sign_off = Permission(name="request:sign_off", resource="request", action="sign_off")
+    signer = Role(name="signer", permissions=[sign_off])
+    db.add_all([sign_off, signer])
+    db.flush()
+    standard_user = db.query(User).filter(User.id == env["standard_user_id"]).one()
+    standard_user.roles.append(signer)
+    member = User(
+        email="member@test.com", username="member", full_name="Member",
+        hashed_password=security.get_password_hash("password123"), is_active=True,
+    )
+    member.roles = [user_role]
+    db.add(member)
+    db.flush()
+
+    workflow_data = {
+        "name": "Signed",
+        "steps": [
+            {
+                "name": "Sign", "step_order": 1, "required_role_id": str(user_role.id),
+                "required_permission_id": str(sign_off.id), "assignment_strategy": "ROUND_ROBIN",
+            },
+        ],
+    }
+    workflow_id = client.post(
+        f"{settings.API_V1_PREFIX}/workflows/", json=workflow_data, headers=headers
+    ).json()["id"]
+    r = client.post(
+        f"{settings.API_V1_PREFIX}/requests/bulk",
+        json={"workflow_id": workflow_id, "items": [{"request_data": {}}] * 4},
+        headers=headers,
+    )
+    assert r.status_code == 200
+    steps = (
+        db.query(RequestStep)
+        .join(WorkflowRequest)
+        .filter(WorkflowRequest.workflow_id == uuid.UUID(workflow_id))
+        .all()
+    )
+    assert {s.assigned_to for s in steps} == {env["standard_user_id"]}
+
+
+def test_member_cache_follows_role_and_user_writes(client: TestClient, db: Session, override_get_db):
+    from app.db.models.user import Permission
+    from app.services.assignment import AssignmentService
+
+    env = setup_orchestration_env(client, db)
+    user_role = db.query(Role).filter(Role.name == "user").first()
+    sign_off = Permission(name="request:sign_off", resource="request", action="sign_off")
+    db.add(sign_off)
+    db.commit()
+
+    def members(permission_id=None):
+        return [m for m, _ in AssignmentService._role_members(db, user_role.id, permission_id)]
+
+    assert members() == [env["standard_user_id"]]
+    assert members(sign_off.id) == []
+
+    # Granting the role a permission
+    user_role.permissions.append(sign_off)
+    db.commit()
+    assert members(sign_off.id) == [env["standard_user_id"]]
+
+    # Adding a member to the role
+    newcomer = User(
+        email="newcomer@test.com", username="newcomer", full_name="Newcomer",
+        hashed_password=security.get_password_hash("password123"), is_active=True,
+    )
+    db.add(newcomer)
+    db.commit()
+    assert newcomer.id not in members()
+    newcomer.roles.append(user_role)
+    db.commit()
+    assert newcomer.id in members()
+
+    # Deactivating a member
+    newcomer.is_active = False
+    db.commit()
+    assert members() == [env["standard_user_id"]]
+
+    # A rolled-back change leaves the cache alone
+    members()
+    newcomer.is_active = True
+    db.flush()
+    db.rollback()
+    assert AssignmentService._members
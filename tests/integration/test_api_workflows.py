@@ -111,3 +111,130 @@ def test_delete_workflow(client: TestClient, db: Session, override_get_db):
     
     # Verify deletion
     assert db.query(Workflow).filter(Workflow.id == workflow.id).first() is None
+
+def test_workflow_versions(client: TestClient, db: Session, override_get_db):
+    token = get_admin_token(client, db)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    workflow_data = {
+        "name": "Versioned Workflow",
+        "steps": [
+            {"name": "Review", "step_order": 1},
+            {"name": "Sign-off", "step_order": 2},
+        ],
+        "transitions": [
+            {"from_step_order": 1, "to_step_order": 2, "outcome": "APPROVED"},
+        ],
+    }
+    r = client.post(f"{settings.API_V1_PREFIX}/workflows/", json=workflow_data, headers=headers)
+    assert r.status_code == 200
+    workflow_id = r.json()["id"]
+
+    start_data = {"workflow_id": workflow_id, "request_data": {}}
+    r = client.post(f"{settings.API_V1_PREFIX}/requests/", json=start_data, headers=headers)
+    v1_request = r.json()
+
+    # Publish v2 while the v1 request is running
+    version_data = {"steps": [{"name": "Fast track", "step_order": 1}], "notes": "Shorter"}
+    r = client.post(
+        f"{settings.API_V1_PREFIX}/workflows/{workflow_id}/versions",
+        json=version_data,
+        headers=headers,
+    )
+    assert r.status_code == 201
+    assert r.json()["version_number"] == 2
+    assert [s["name"] for s in r.json()["steps"]] == ["Fast track"]
+
+    r = client.get(f"{settings.API_V1_PREFIX}/workflows/{workflow_id}", headers=headers)
+    assert r.json()["current_version_id"] != v1_request["workflow_version_id"]
+    assert [s["name"] for s in r.json()["steps"]] == ["Fast track"]
+
+    # The running request finishes on v1
+    r = client.post(
+        f"{settings.API_V1_PREFIX}/requests/{v1_request['id']}/process",
+        json={"outcome": "APPROVED"},
+        headers=headers,
+    )
+    assert r.status_code == 200
+    assert r.json()["status"] == "IN_PROGRESS"
+    assert r.json()["steps"][-1]["step_name"] == "Sign-off"
+
+    # New requests start on v2
+    r = client.post(f"{settings.API_V1_PREFIX}/requests/", json=start_data, headers=headers)
+    assert r.json()["workflow_version_id"] != v1_request["workflow_version_id"]
+    assert r.json()["steps"][0]["step_name"] == "Fast track"
+
+    r = client.get(f"{settings.API_V1_PREFIX}/workflows/{workflow_id}/versions", headers=headers)
+    assert [v["version_number"] for v in r.json()] == [1, 2]
+
+    r = client.get(f"{settings.API_V1_PREFIX}/workflows/{workflow_id}/versions/1", headers=headers)
+    assert r.status_code == 200
+    assert [s["name"] for s in r.json()["steps"]] == ["Review", "Sign-off"]
+    assert "immutable" in r.headers["cache-control"]
+    r = client.get(
+        f"{settings.API_V1_PREFIX}/workflows/{workflow_id}/versions/1",
+        headers={**headers, "If-None-Match": r.headers["etag"]},
+    )
+    assert r.status_code == 304
+
+    r = client.get(f"{settings.API_V1_PREFIX}/workflows/{workflow_id}/versions/3", headers=headers)
+    assert r.status_code == 404
+
+    # A workflow with requests is deactivated rather than deleted
+    r = client.delete(f"{settings.API_V1_PREFIX}/workflows/{workflow_id}", headers=headers)
+    assert r.status_code == 204
+    db.expire_all()
+    assert db.get(Workflow, uuid.UUID(workflow_id)).is_active is False
+
+def test_import_workflows(client: TestClient, db: Session, override_get_db, query_counter):
+    token = get_admin_token(client, db)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    definitions = [
+        {
+            "name": f"Imported {i}",
+            "steps": [
+                {"name": f"Step {order}", "step_order": order} for order in range(1, 6)
+            ],
+            "transitions": [
+                {"from_step_order": order, "to_step_order": order + 1, "outcome": "APPROVED"}
+                for order in range(1, 5)
+            ]
+            + [{"from_step_order": 5, "outcome": "APPROVED"}],
+        }
+        for i in range(20)
+    ]
+    with query_counter.max(12):
+        r = client.post(
+            f"{settings.API_V1_PREFIX}/workflows/import",
+            json={"workflows": definitions},
+            headers=headers,
+        )
+    assert r.status_code == 200
+    assert r.json()["created"] == 20
+
+    workflow_id = r.json()["workflow_ids"][3]
+    r = client.get(f"{settings.API_V1_PREFIX}/workflows/{workflow_id}", headers=headers)
+    data = r.json()
+    assert data["name"] == "Imported 3"
+    assert data["current_version_id"] is not None
+    assert [s["name"] for s in data["steps"]] == [f"Step {order}" for order in range(1, 6)]
+    assert data["steps"][0]["transitions_from"][0]["to_step_id"] == data["steps"][1]["id"]
+    assert data["steps"][4]["transitions_from"][0]["to_step_id"] is None
+
+def test_invalid_definition_rejected(client: TestClient, db: Session, override_get_db):
+    token = get_admin_token(client, db)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    workflow_data = {
+        "name": "Broken Workflow",
+        "steps": [
+            {"name": "Review", "step_order": 1},
+            {"name": "Orphan", "step_order": 2},
+        ],
+    }
+    r = client.post(f"{settings.API_V1_PREFIX}/workflows/", json=workflow_data, headers=headers)
+    assert r.status_code == 422
+    assert r.json()["error"] == "INVALID_WORKFLOW_DEFINITION"
+    assert [i["code"] for i in r.json()["issues"]] == ["unreachable_step"]
+    assert db.query(Workflow).filter(Workflow.name == "Broken Workflow").first() is None
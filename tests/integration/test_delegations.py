@@ -0,0 +1,233 @@
+import uuid
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core import security
+from app.core.config import settings
+from app.db.models.request import RequestStep
+from app.db.models.user import Role, User
+from app.services.delegation import DelegationService
+from tests.integration.test_api_requests import setup_orchestration_env
+
+
+def _user(db: Session, name: str, roles):
+    user = User(
+        email=f"{name}@test.com", username=name, full_name=name.title(),
+        hashed_password=security.get_password_hash("password123"), is_active=True,
+    )
+    user.roles = roles
+    db.add(user)
+    db.flush()
+    return user, {"Authorization": f"Bearer {security.create_access_token(subject=str(user.id))}"}
+
+
+def _window(days: int = 1):
+    now = datetime.utcnow()
+    return {
+        "starts_at": (now - timedelta(hours=1)).isoformat(),
+        "ends_at": (now + timedelta(days=days)).isoformat(),
+    }
+
+
+def test_out_of_office_routing(client: TestClient, db: Session, override_get_db):
+    env = setup_orchestration_env(client, db)
+    admin_headers = {"Authorization": f"Bearer {env['admin_token']}"}
+    user_headers = {"Authorization": f"Bearer {env['user_token']}"}
+    user_role = db.query(Role).filter(Role.name == "user").first()
+    colleague, colleague_headers = _user(db, "colleague", [user_role])
+    cover, cover_headers = _user(db, "cover", [])
+
+    # The standard user is away and hands their work to someone outside the role
+    r = client.post(
+        f"{settings.API_V1_PREFIX}/delegations/",
+        json={"delegate_id": str(cover.id), "reason": "Leave", **_window()},
+        headers=user_headers,
+    )
+    assert r.status_code == 201
+    delegation_id = r.json()["id"]
+    assert DelegationService.resolve(db, env["standard_user_id"]) == cover.id
+
+    workflow_data = {
+        "name": "Routed",
+        "steps": [
+            {
+                "name": "Review", "step_order": 1, "required_role_id": str(user_role.id),
+                "assignment_strategy": "ROUND_ROBIN",
+            },
+        ],
+    }
+    workflow_id = client.post(
+        f"{settings.API_V1_PREFIX}/workflows/", json=workflow_data, headers=admin_headers
+    ).json()["id"]
+
+    def start(n):
+        r = client.post(
+            f"{settings.API_V1_PREFIX}/requests/bulk",
+            json={"workflow_id": workflow_id, "items": [{"request_data": {}}] * n},
+            headers=admin_headers,
+        )
+        return (
+            db.query(RequestStep)
+            .filter(RequestStep.request_id.in_([uuid.UUID(i) for i in r.json()["request_ids"]]))
+            .all()
+        )
+
+    # Round robin passes over the member who is away
+    assert {s.assigned_to for s in start(4)} == {colleague.id}
+
+    # With the whole role away, work goes to the delegates
+    r = client.post(
+        f"{settings.API_V1_PREFIX}/delegations/",
+        json={"delegate_id": str(cover.id), "delegator_id": str(colleague.id), **_window()},
+        headers=admin_headers,
+    )
+    assert r.status_code == 201
+    colleague_delegation_id = r.json()["id"]
+    [step] = start(1)
+    assert step.assigned_to == cover.id
+
+    # The delegate sees and decides the tasks of the people they cover for,
+    # including open-to-role tasks of the orchestration workflow
+    r = client.post(
+        f"{settings.API_V1_PREFIX}/requests/",
+        json={"workflow_id": str(env["workflow_id"]), "request_data": {}},
+        headers=user_headers,
+    )
+    open_request_id = r.json()["id"]
+    tasks = client.get(f"{settings.API_V1_PREFIX}/requests/my-tasks", headers=cover_headers).json()
+    task_requests = {t["request_id"] for t in tasks}
+    assert {str(step.request_id), open_request_id} <= task_requests
+    assert len(tasks) == 6
+
+    r = client.post(
+        f"{settings.API_V1_PREFIX}/requests/{open_request_id}/process",
+        json={"outcome": "APPROVED"},
+        headers=cover_headers,
+    )
+    assert r.status_code == 200
+
+    # Once the delegations are cancelled the cover loses the role's tasks
+    r = client.delete(f"{settings.API_V1_PREFIX}/delegations/{delegation_id}", headers=user_headers)
+    assert r.status_code == 204
+    r = client.delete(
+        f"{settings.API_V1_PREFIX}/delegations/{colleague_delegation_id}", headers=colleague_headers
+    )
+    assert r.status_code == 204
+    r = client.post(
+        f"{settings.API_V1_PREFIX}/requests/",
+        json={"workflow_id": str(env["workflow_id"]), "request_data": {}},
+        headers=user_headers,
+    )
+    r = client.post(
+        f"{settings.API_V1_PREFIX}/requests/{r.json()['id']}/process",
+        json={"outcome": "APPROVED"},
+        headers=cover_headers,
+    )
+    assert r.status_code == 403
+    # Nor can they decide work routed to them while the delegation ran
+    r = client.post(
+        f"{settings.API_V1_PREFIX}/requests/{step.request_id}/process",
+        json={"outcome": "APPROVED"},
+        headers=cover_headers,
+    )
+    assert r.status_code == 403
+
+
+def test_delegates_act_with_one_identity_at_a_time(client: TestClient, db: Session, override_get_db):
+    from app.db.models.user import Permission
+
+    env = setup_orchestration_env(client, db)
+    admin_headers = {"Authorization": f"Bearer {env['admin_token']}"}
+    user_headers = {"Authorization": f"Bearer {env['user_token']}"}
+    user_role = db.query(Role).filter(Role.name == "user").first()
+    sign_off = Permission(name="request:sign_off", resource="request", action="sign_off")
+    signer = Role(name="signer", permissions=[sign_off])
+    db.add_all([sign_off, signer])
+    db.flush()
+    # The delegator holds the role only, the delegate the permission only
+    cover, cover_headers = _user(db, "cover", [signer])
+    colleague, _ = _user(db, "colleague", [user_role])
+    r = client.post(
+        f"{settings.API_V1_PREFIX}/delegations/",
+        json={"delegate_id": str(cover.id), **_window()},
+        headers=user_headers,
+    )
+    assert r.status_code == 201
+
+    def start(name, **step):
+        workflow_data = {
+            "name": name,
+            "steps": [{"name": "Review", "step_order": 1, "required_role_id": str(user_role.id), **step}],
+        }
+        workflow_id = client.post(
+            f"{settings.API_V1_PREFIX}/workflows/", json=workflow_data, headers=admin_headers
+        ).json()["id"]
+        r = client.post(
+            f"{settings.API_V1_PREFIX}/requests/",
+            json={"workflow_id": workflow_id, "request_data": {}},
+            headers=admin_headers,
+        )
+        return r.json()["id"]
+
+    def decide(request_id):
+        return client.post(
+            f"{settings.API_V1_PREFIX}/requests/{request_id}/process",
+            json={"outcome": "APPROVED"},
+            headers=cover_headers,
+        ).status_code
+
+    # Neither the delegator nor the delegate alone may sign off
+    signed = start("Signed", required_permission_id=str(sign_off.id))
+    # The colleague is the only member in; the task is theirs, not the delegator's
+    assigned = start("Assigned", assignment_strategy="ROUND_ROBIN")
+    assert db.query(RequestStep).filter(
+        RequestStep.request_id == uuid.UUID(assigned)
+    ).one().assigned_to == colleague.id
+    open_to_role = start("Open")
+
+    tasks = client.get(f"{settings.API_V1_PREFIX}/requests/my-tasks", headers=cover_headers).json()
+    assert {t["request_id"] for t in tasks} == {open_to_role}
+    assert decide(signed) == 403
+    assert decide(assigned) == 403
+    assert decide(open_to_role) == 200
+
+
+def test_delegation_validation(client: TestClient, db: Session, override_get_db):
+    env = setup_orchestration_env(client, db)
+    user_headers = {"Authorization": f"Bearer {env['user_token']}"}
+
+    r = client.post(
+        f"{settings.API_V1_PREFIX}/delegations/",
+        json={"delegate_id": str(env["standard_user_id"]), **_window()},
+        headers=user_headers,
+    )
+    assert r.status_code == 422
+
+    window = _window()
+    r = client.post(
+        f"{settings.API_V1_PREFIX}/delegations/",
+        json={
+            "delegate_id": str(env["admin_user_id"]),
+            "starts_at": window["ends_at"],
+            "ends_at": window["starts_at"],
+        },
+        headers=user_headers,
+    )
+    assert r.status_code == 422
+
+    # Only admins act on behalf of others
+    r = client.post(
+        f"{settings.API_V1_PREFIX}/delegations/",
+        json={
+            "delegate_id": str(env["standard_user_id"]),
+            "delegator_id": str(env["admin_user_id"]),
+            **_window(),
+        },
+        headers=user_headers,
+    )
+    assert r.status_code == 403
+
+    r = client.get(f"{settings.API_V1_PREFIX}/delegations/", headers=user_headers)
+    assert r.status_code == 200 and r.json() == []
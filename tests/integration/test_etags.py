@@ -0,0 +1,74 @@
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from tests.integration.test_api_requests import setup_orchestration_env
+
+API = settings.API_V1_PREFIX
+
+
+def _revalidate(client, url, headers):
+    first = client.get(url, headers=headers)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "private, no-cache"
+    second = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["ETag"] == etag
+    return etag
+
+
+def test_read_endpoints_answer_304_until_changed(client: TestClient, db: Session, override_get_db):
+    env = setup_orchestration_env(client, db)
+    admin = {"Authorization": f"Bearer {env['admin_token']}"}
+    user = {"Authorization": f"Bearer {env['user_token']}"}
+
+    _revalidate(client, f"{API}/workflows/{env['workflow_id']}", admin)
+    _revalidate(client, f"{API}/users/me", user)
+    _revalidate(client, f"{API}/users/", admin)
+    workflows_tag = _revalidate(client, f"{API}/workflows/", admin)
+
+    r = client.post(f"{API}/requests/", json={"workflow_id": str(env["workflow_id"])}, headers=user)
+    request_id = r.json()["id"]
+    request_tag = _revalidate(client, f"{API}/requests/{request_id}", user)
+    list_tag = _revalidate(client, f"{API}/requests/", user)
+
+    # A decision bumps the request's version: both tags go stale
+    client.post(f"{API}/requests/{request_id}/process", json={"outcome": "APPROVED"}, headers=user)
+    r = client.get(f"{API}/requests/{request_id}", headers={**user, "If-None-Match": request_tag})
+    assert r.status_code == 200
+    assert r.headers["ETag"] != request_tag
+    r = client.get(f"{API}/requests/", headers={**user, "If-None-Match": f'W/{list_tag}, "other"'})
+    assert r.status_code == 200
+
+    # Unrelated changes leave the workflow list tag alone
+    r = client.get(f"{API}/workflows/", headers={**admin, "If-None-Match": workflows_tag})
+    assert r.status_code == 304
+
+
+def test_workflow_list_etag_follows_the_served_body(
+    client: TestClient, db: Session, override_get_db, monkeypatch
+):
+    from datetime import timedelta
+    from app.services.workflow_service import WorkflowService
+
+    env = setup_orchestration_env(client, db)
+    admin = {"Authorization": f"Bearer {env['admin_token']}"}
+    current = client.get(f"{API}/workflows/", headers=admin)
+
+    # The workflow is updated between the key read and the body load
+    list_keys = WorkflowService.list_definition_keys
+    monkeypatch.setattr(
+        WorkflowService,
+        "list_definition_keys",
+        staticmethod(
+            lambda db, skip=0, limit=100: [
+                (workflow_id, updated_at - timedelta(seconds=1))
+                for workflow_id, updated_at in list_keys(db, skip, limit)
+            ]
+        ),
+    )
+    r = client.get(f"{API}/workflows/", headers=admin)
+    assert r.json() == current.json()
+    assert r.headers["ETag"] == current.headers["ETag"]
@@ -0,0 +1,87 @@
+"""
+Statement budgets for read endpoints. The budgets do not grow with the
+number of rows returned, so an N+1 regression fails here.
+"""
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models.workflow import Workflow, WorkflowStep, StepTransition
+from app.services.workflow_engine import WorkflowEngine
+from tests.integration.test_api_requests import setup_orchestration_env
+
+API = settings.API_V1_PREFIX
+
+
+def _seed(db: Session, env, workflows: int = 5, requests: int = 30):
+    for n in range(workflows):
+        workflow = Workflow(name=f"Extra {n}", created_by=env["admin_user_id"])
+        db.add(workflow)
+        db.flush()
+        steps = [
+            WorkflowStep(workflow_id=workflow.id, step_order=i, name=f"S{i}")
+            for i in (1, 2, 3)
+        ]
+        db.add_all(steps)
+        db.flush()
+        db.add_all(
+            StepTransition(from_step_id=a.id, to_step_id=b.id, outcome="APPROVED")
+            for a, b in zip(steps, steps[1:])
+        )
+    WorkflowEngine.start_workflows_bulk(
+        db, env["workflow_id"], env["standard_user_id"], [{}] * requests
+    )
+    db.commit()
+
+
+def test_read_endpoints_stay_within_statement_budget(
+    client: TestClient, db: Session, override_get_db, query_counter
+):
+    env = setup_orchestration_env(client, db)
+    _seed(db, env)
+    admin = {"Authorization": f"Bearer {env['admin_token']}"}
+    db.expire_all()
+
+    # auth (user, roles, permissions) + summary + page + steps with definitions
+    with query_counter.max(6):
+        r = client.get(f"{API}/requests/", headers=admin)
+    assert r.status_code == 200
+    assert len(r.json()) == 30
+    assert all(req["steps"][0]["step_name"] == "Step 1" for req in r.json())
+    request_id = r.json()[0]["id"]
+
+    db.expire_all()
+    with query_counter.max(5):
+        r = client.get(f"{API}/requests/{request_id}", headers=admin)
+    assert r.json()["steps"][0]["step_order"] == 1
+
+    db.expire_all()
+    # auth + summary + page + steps + transitions
+    with query_counter.max(6):
+        r = client.get(f"{API}/workflows/", headers=admin)
+    assert len(r.json()) == 6
+    assert sum(len(s["transitions_from"]) for w in r.json() for s in w["steps"]) == 11
+
+    db.expire_all()
+    with query_counter.max(6):
+        r = client.get(f"{API}/workflows/{env['workflow_id']}", headers=admin)
+    assert [s["name"] for s in r.json()["steps"]] == ["Step 1", "Step 2"]
+
+
+def test_workflow_list_is_served_from_the_definition_cache(
+    client: TestClient, db: Session, override_get_db, query_counter
+):
+    env = setup_orchestration_env(client, db)
+    _seed(db, env, requests=0)
+    admin = {"Authorization": f"Bearer {env['admin_token']}"}
+    first = client.get(f"{API}/workflows/", headers=admin).json()
+
+    db.expire_all()
+    # auth + the (id, updated_at) page; no steps or transitions are loaded
+    with query_counter.max(4):
+        r = client.get(f"{API}/workflows/", headers=admin)
+    assert r.json() == first
+
+    client.delete(f"{API}/workflows/{first[-1]['id']}", headers=admin)
+    assert len(client.get(f"{API}/workflows/", headers=admin).json()) == len(first) - 1
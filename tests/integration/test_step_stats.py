@@ -0,0 +1,154 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models.request import WorkflowRequest, RequestStatus, RequestStep, StepStatus
+from tests.integration.test_api_requests import setup_orchestration_env
+
+
+def test_step_duration_stats(client: TestClient, db: Session, override_get_db):
+    env = setup_orchestration_env(client, db)
+    headers = {"Authorization": f"Bearer {env['admin_token']}"}
+
+    # Step 1 took 1..100 hours; the last 10 ran past their 90h deadline
+    now = datetime.utcnow()
+    request = WorkflowRequest(
+        workflow_id=env["workflow_id"],
+        requester_id=env["admin_user_id"],
+        status=RequestStatus.COMPLETED,
+    )
+    db.add(request)
+    db.flush()
+    for hours in range(1, 101):
+        started = now - timedelta(days=5, hours=hours)
+        db.add(
+            RequestStep(
+                request_id=request.id,
+                step_id=env["step1_id"],
+                status=StepStatus.APPROVED,
+                started_at=started,
+                completed_at=started + timedelta(hours=hours),
+                deadline=started + timedelta(hours=90),
+            )
+        )
+    db.add(RequestStep(request_id=request.id, step_id=env["step2_id"], status=StepStatus.SKIPPED))
+    db.flush()
+
+    r = client.post(f"{settings.API_V1_PREFIX}/admin/step-stats/refresh", headers=headers)
+    assert r.json() == {"steps": 1}
+    # Nothing completed since
+    r = client.post(f"{settings.API_V1_PREFIX}/admin/step-stats/refresh", headers=headers)
+    assert r.json() == {"steps": 0}
+
+    r = client.get(
+        f"{settings.API_V1_PREFIX}/admin/step-stats",
+        params={"workflow_id": str(env["workflow_id"])},
+        headers=headers,
+    )
+    assert r.status_code == 200
+    [stat] = r.json()
+    assert stat["step_id"] == str(env["step1_id"])
+    assert stat["sla_hours"] == 24
+    assert stat["sample_count"] == 100
+    assert stat["breach_rate"] == 0.1
+    assert stat["p50_hours"] == pytest.approx(50, rel=0.01)
+    assert stat["p90_hours"] == pytest.approx(90, rel=0.01)
+    assert stat["p99_hours"] == pytest.approx(99, rel=0.01)
+    assert stat["max_hours"] == pytest.approx(100)
+
+    r = client.get(
+        f"{settings.API_V1_PREFIX}/admin/step-stats/{env['step1_id']}", headers=headers
+    )
+    [period] = r.json()
+    assert period["sample_count"] == 100 and period["breach_count"] == 10
+
+    user_headers = {"Authorization": f"Bearer {env['user_token']}"}
+    r = client.get(f"{settings.API_V1_PREFIX}/admin/step-stats", headers=user_headers)
+    assert r.status_code == 403
+
+
+def test_step_stats_periods_are_stored_once(client: TestClient, db: Session, override_get_db):
+    from sqlalchemy.exc import IntegrityError
+    from app.db.models.stats import StepDurationStat
+    from app.services.step_stats import StepStatistics
+
+    env = setup_orchestration_env(client, db)
+    now = datetime.utcnow()
+    request = WorkflowRequest(
+        workflow_id=env["workflow_id"],
+        requester_id=env["admin_user_id"],
+        status=RequestStatus.COMPLETED,
+    )
+    db.add(request)
+    db.flush()
+    db.add(
+        RequestStep(
+            request_id=request.id,
+            step_id=env["step1_id"],
+            status=StepStatus.APPROVED,
+            started_at=now - timedelta(hours=3),
+            completed_at=now - timedelta(hours=1),
+        )
+    )
+    db.flush()
+    assert StepStatistics.aggregate(db, until=now) == 1
+    [stored] = db.query(StepDurationStat).all()
+
+    # A run that read the same watermark before the first committed
+    duplicate = {
+        column.name: getattr(stored, column.key)
+        for column in StepDurationStat.__table__.columns
+        if column.name not in ("id", "computed_at")
+    }
+    with pytest.raises(IntegrityError):
+        with db.begin_nested():
+            db.add(StepDurationStat(**duplicate))
+    assert db.query(StepDurationStat).count() == 1
+
+
+def test_step_committed_after_a_run_is_aggregated_by_the_next(
+    client: TestClient, db: Session, override_get_db, monkeypatch
+):
+    from app.db.models.stats import StepDurationStat
+    from app.services import step_stats
+    from app.services.step_stats import StepStatistics
+
+    class Clock(datetime):
+        at = datetime.utcnow()
+
+        @classmethod
+        def utcnow(cls):
+            return cls.at
+
+    monkeypatch.setattr(step_stats, "datetime", Clock)
+    env = setup_orchestration_env(client, db)
+    run_at = Clock.at
+    StepStatistics.aggregate(db)
+    db.commit()
+
+    # Decided just before that run, in a transaction committing after it
+    request = WorkflowRequest(
+        workflow_id=env["workflow_id"],
+        requester_id=env["admin_user_id"],
+        status=RequestStatus.COMPLETED,
+    )
+    db.add(request)
+    db.flush()
+    db.add(
+        RequestStep(
+            request_id=request.id,
+            step_id=env["step1_id"],
+            status=StepStatus.APPROVED,
+            started_at=run_at - timedelta(hours=2),
+            completed_at=run_at - timedelta(seconds=1),
+        )
+    )
+    db.commit()
+
+    Clock.at = run_at + timedelta(seconds=settings.STEP_STATS_SETTLE_SECONDS + 60)
+    assert StepStatistics.aggregate(db) == 1
+    assert db.query(func.sum(StepDurationStat.sample_count)).scalar() == 1
@@ -0,0 +1,197 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models.webhook import WebhookDelivery, DeliveryStatus
+from app.services.webhooks import WebhookDispatcher, WebhookService, sign
+from tests.integration.test_api_requests import setup_orchestration_env
+
+
+class StubEndpoint:
+    """Local HTTP server that records webhook POSTs."""
+
+    def __init__(self, status: int = 200):
+        self.status = status
+        self.received = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                stub.received.append((dict(self.headers), body))
+                self.send_response(stub.status)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/hook"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub():
+    endpoint = StubEndpoint()
+    yield endpoint
+    endpoint.close()
+    WebhookService.invalidate_cache()
+
+
+@pytest.fixture
+def http_client():
+    with httpx.Client(timeout=5) as c:
+        yield c
+
+
+def _subscribe(client, env, url, **extra):
+    WebhookService.invalidate_cache()
+    headers = {"Authorization": f"Bearer {env['admin_token']}"}
+    body = {
+        "name": "Downstream",
+        "url": url,
+        "secret": "s3cret",
+        "event_types": ["WORKFLOW_STARTED", "STEP_COMPLETED"],
+        **extra,
+    }
+    r = client.post(f"{settings.API_V1_PREFIX}/webhooks/", json=body, headers=headers)
+    assert r.status_code == 201, r.text
+    assert "secret" not in r.json()
+    return r.json()["id"]
+
+
+def _start_and_approve(client, env):
+    headers = {"Authorization": f"Bearer {env['user_token']}"}
+    r = client.post(
+        f"{settings.API_V1_PREFIX}/requests/",
+        json={"workflow_id": str(env["workflow_id"]), "request_data": {}},
+        headers=headers,
+    )
+    assert r.status_code == 200
+    request_id = r.json()["id"]
+    r = client.post(
+        f"{settings.API_V1_PREFIX}/requests/{request_id}/process",
+        json={"outcome": "APPROVED"},
+        headers=headers,
+    )
+    assert r.status_code == 200
+    return request_id
+
+
+def test_events_are_batched_and_signed(
+    client: TestClient, db: Session, override_get_db, stub, http_client
+):
+    env = setup_orchestration_env(client, db)
+    subscription_id = _subscribe(client, env, stub.url)
+    request_id = _start_and_approve(client, env)
+
+    assert db.query(WebhookDelivery).count() == 2
+    claimed, delivered = WebhookDispatcher.run_once(db, http_client)
+    assert (claimed, delivered) == (2, 2)
+
+    # Both events reach the endpoint in one signed POST
+    assert len(stub.received) == 1
+    headers, body = stub.received[0]
+    assert headers["X-Webhook-Signature"] == sign(
+        "s3cret", headers["X-Webhook-Timestamp"], body
+    )
+    events = json.loads(body)["events"]
+    assert [e["event"] for e in events] == ["WORKFLOW_STARTED", "STEP_COMPLETED"]
+    assert all(e["request_id"] == request_id for e in events)
+
+    r = client.get(
+        f"{settings.API_V1_PREFIX}/webhooks/{subscription_id}/deliveries",
+        headers={"Authorization": f"Bearer {env['admin_token']}"},
+    )
+    assert r.status_code == 200
+    assert {d["status"] for d in r.json()} == {"DELIVERED"}
+    assert WebhookDispatcher.run_once(db, http_client) == (0, 0)
+
+
+def test_failed_delivery_backs_off_then_gives_up(
+    client: TestClient, db: Session, override_get_db, stub, http_client, monkeypatch
+):
+    stub.status = 503
+    env = setup_orchestration_env(client, db)
+    _subscribe(client, env, stub.url, event_types=["WORKFLOW_STARTED"])
+    _start_and_approve(client, env)
+
+    assert WebhookDispatcher.run_once(db, http_client) == (1, 0)
+    delivery = db.query(WebhookDelivery).one()
+    db.refresh(delivery)
+    assert delivery.status == DeliveryStatus.PENDING
+    assert delivery.attempts == 1
+    assert delivery.last_status_code == 503
+
+    # Not due again until the backoff has passed
+    assert WebhookDispatcher.run_once(db, http_client) == (0, 0)
+
+    monkeypatch.setattr(settings, "WEBHOOK_MAX_ATTEMPTS", 2)
+    monkeypatch.setattr(settings, "WEBHOOK_BACKOFF_BASE_SECONDS", 0)
+    delivery.next_attempt_at = delivery.created_at
+    db.commit()
+    assert WebhookDispatcher.run_once(db, http_client) == (1, 0)
+    db.refresh(delivery)
+    assert delivery.status == DeliveryStatus.FAILED
+    assert len(stub.received) == 2
+
+
+def test_claim_caps_each_endpoint(
+    client: TestClient, db: Session, override_get_db, stub, monkeypatch
+):
+    monkeypatch.setattr(settings, "WEBHOOK_BATCH_SIZE", 2)
+    env = setup_orchestration_env(client, db)
+    _subscribe(client, env, stub.url, max_concurrency=1)
+    for _ in range(3):
+        _start_and_approve(client, env)
+
+    # 6 pending, but one batch of 2 at a time for a max_concurrency=1 endpoint
+    claimed = WebhookDispatcher.claim(db)
+    assert len(claimed) == 1
+    assert len(claimed[0]["deliveries"]) == 2
+
+    # Another run finds the endpoint's only slot taken
+    assert WebhookDispatcher.claim(db) == []
+
+    # Once the batch is recorded the next one can go
+    ids = [delivery_id for delivery_id, _ in claimed[0]["deliveries"]]
+    assert WebhookDispatcher.record(db, [(ids, 200, None)]) == 2
+    [item] = WebhookDispatcher.claim(db)
+    assert {d for d, _ in item["deliveries"]}.isdisjoint(ids)
+
+
+def test_slow_endpoint_does_not_hold_back_others(
+    client: TestClient, db: Session, override_get_db, stub, monkeypatch
+):
+    env = setup_orchestration_env(client, db)
+    _subscribe(client, env, stub.url)
+    _subscribe(client, env, "http://slow.invalid/hook")
+    _start_and_approve(client, env)
+    claimed = WebhookDispatcher.claim(db)
+    assert len(claimed) == 2
+
+    release = threading.Event()
+
+    def post_batch(http, url, secret, events):
+        if "slow" in url:
+            release.wait(5)
+        return 200, None
+
+    monkeypatch.setattr(WebhookDispatcher, "post_batch", staticmethod(post_batch))
+    results = WebhookDispatcher.send(claimed)
+    # The fast endpoint's result arrives while the slow one is still pending
+    first = next(results)
+    fast = next(item for item in claimed if item["url"] == stub.url)
+    assert first[0] == [d for d, _ in fast["deliveries"]]
+    release.set()
+    assert len(list(results)) == 1
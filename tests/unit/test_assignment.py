@@ -0,0 +1,67 @@
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.db.models.workflow import AssignmentStrategy, StepType, WorkflowStep
+from app.services.assignment import AssignmentService, LoadCounter
+
+
+@pytest.fixture
+def counter():
+    counter = LoadCounter(resync_seconds=3600)
+    counter._synced_at = float("inf")  # no database behind the unit tests
+    with patch("app.services.assignment.load_counter", counter):
+        yield counter
+
+
+def make_step(strategy, skill=None):
+    return MagicMock(
+        spec=WorkflowStep,
+        id=uuid4(),
+        required_role_id=uuid4(),
+        step_type=StepType.HUMAN,
+        assignment_strategy=strategy,
+        assignment_skill=skill,
+    )
+
+
+def pick_many(step, members, n):
+    with patch.object(AssignmentService, "_role_members", return_value=members):
+        return [AssignmentService.pick(MagicMock(), step) for _ in range(n)]
+
+
+def test_round_robin_takes_turns(counter):
+    members = [(uuid4(), {}) for _ in range(3)]
+    picks = pick_many(make_step(AssignmentStrategy.ROUND_ROBIN), members, 6)
+    assert [picks.count(user_id) for user_id, _ in members] == [2, 2, 2]
+
+
+def test_least_loaded_prefers_idle_members(counter):
+    busy, idle = uuid4(), uuid4()
+    counter.adjust(busy, 5)
+    picks = pick_many(make_step(AssignmentStrategy.LEAST_LOADED), [(busy, {}), (idle, {})], 4)
+    assert picks == [idle] * 4
+    assert counter.loads(MagicMock(), [busy, idle]) == {busy: 5, idle: 4}
+
+
+def test_skill_weighted_balances_by_weight(counter):
+    expert, junior, outsider = uuid4(), uuid4(), uuid4()
+    members = [(expert, {"tax": 3}), (junior, {"tax": 1}), (outsider, {})]
+    picks = pick_many(make_step(AssignmentStrategy.SKILL_WEIGHTED, "tax"), members, 8)
+    assert picks.count(expert) == 6 and picks.count(junior) == 2
+    assert outsider not in picks
+
+
+def test_open_steps_are_not_assigned(counter):
+    assert pick_many(make_step(None), [(uuid4(), {})], 1) == [None]
+    automatic = make_step(AssignmentStrategy.ROUND_ROBIN)
+    automatic.step_type = StepType.AUTOMATIC
+    assert pick_many(automatic, [(uuid4(), {})], 1) == [None]
+    assert pick_many(make_step(AssignmentStrategy.LEAST_LOADED), [], 1) == [None]
+
+
+def test_counters_never_go_negative(counter):
+    user_id = uuid4()
+    counter.adjust(user_id, -1)
+    assert counter.loads(MagicMock(), [user_id]) == {user_id: 0}
@@ -0,0 +1,53 @@
+from datetime import datetime
+
+import pytest
+
+from app.services.calendar import WorkingCalendar, add_sla_hours
+
+OFFICE = {day: [["09:00", "17:00"]] for day in ("mon", "tue", "wed", "thu", "fri")}
+
+
+def test_add_hours_skips_nights_and_weekends():
+    calendar = WorkingCalendar("UTC", OFFICE)
+    # Friday 15:00 + 4 working hours -> Monday 11:00
+    assert calendar.add_hours(datetime(2026, 10, 16, 15), 4) == datetime(2026, 10, 19, 11)
+    # Saturday counts from Monday morning
+    assert calendar.add_hours(datetime(2026, 10, 17, 12), 8) == datetime(2026, 10, 19, 17)
+
+
+def test_add_hours_skips_holidays():
+    calendar = WorkingCalendar("UTC", OFFICE, holidays=["2026-10-19"])
+    assert calendar.add_hours(datetime(2026, 10, 16, 15), 4) == datetime(2026, 10, 20, 11)
+
+
+def test_timezone_and_dst():
+    calendar = WorkingCalendar("Europe/Berlin", OFFICE)
+    # Berlin is UTC+2 before the switch on 25 Oct 2026, UTC+1 after
+    assert calendar.add_hours(datetime(2026, 10, 23, 6), 1) == datetime(2026, 10, 23, 8)
+    assert calendar.add_hours(datetime(2026, 10, 23, 14), 2) == datetime(2026, 10, 26, 9)
+
+
+def test_is_working():
+    calendar = WorkingCalendar("UTC", OFFICE)
+    assert calendar.is_working(datetime(2026, 10, 19, 9))
+    assert not calendar.is_working(datetime(2026, 10, 19, 17))
+    assert not calendar.is_working(datetime(2026, 10, 18, 12))
+
+
+def test_table_rebuilt_outside_horizon():
+    calendar = WorkingCalendar("UTC", OFFICE, horizon_days=14)
+    assert calendar.add_hours(datetime(2026, 10, 19, 9), 8) == datetime(2026, 10, 19, 17)
+    # Far past the first table, and more hours than one horizon holds
+    assert calendar.add_hours(datetime(2030, 1, 7, 9), 8) == datetime(2030, 1, 7, 17)
+    assert calendar.add_hours(datetime(2026, 10, 19, 9), 8 * 20) == datetime(2026, 11, 13, 17)
+
+
+def test_invalid_definitions():
+    with pytest.raises(ValueError):
+        WorkingCalendar("UTC", {})
+    with pytest.raises(ValueError):
+        WorkingCalendar("UTC", {"mon": [["09:00", "25:00"]]})
+
+
+def test_without_calendar_hours_are_wall_clock():
+    assert add_sla_hours(None, datetime(2026, 10, 17, 12), 8) == datetime(2026, 10, 17, 20)
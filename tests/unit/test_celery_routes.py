@@ -0,0 +1,30 @@
+import re
+import shlex
+from pathlib import Path
+
+import pytest
+
+from app.core.celery_app import celery_app
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _consumed_queues(text):
+    """
+    Queues consumed by the celery workers started in a deployment file.
+    """
+    queues = set()
+    for line in re.findall(r"celery -A \S+ worker[^\n]*", text):
+        args = shlex.split(line)
+        if "-Q" in args:
+            queues.update(args[args.index("-Q") + 1].split(","))
+        else:
+            queues.add(celery_app.conf.task_default_queue)
+    return queues
+
+
+@pytest.mark.parametrize("path", ["docker-compose.yml", "DEPLOYMENT.md"])
+def test_every_routed_queue_has_a_worker(path):
+    consumed = _consumed_queues((ROOT / path).read_text())
+    routed = {route["queue"] for route in celery_app.conf.task_routes.values()}
+    assert routed | {celery_app.conf.task_default_queue} <= consumed
@@ -0,0 +1,47 @@
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse
+from fastapi.testclient import TestClient
+
+from app.middleware.compression import CompressionMiddleware, negotiate
+
+
+def _app():
+    app = FastAPI(default_response_class=ORJSONResponse)
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+    @app.get("/big")
+    def big(response: Response):
+        response.headers["ETag"] = '"abc"'
+        return [{"id": i, "name": f"item {i}"} for i in range(200)]
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    return app
+
+
+def test_negotiate_prefers_brotli_only_when_available():
+    assert negotiate("gzip, deflate, br", brotli_available=True) == "br"
+    assert negotiate("gzip, deflate, br", brotli_available=False) == "gzip"
+    assert negotiate("gzip;q=0, br;q=0.5", brotli_available=False) is None
+    assert negotiate("*", brotli_available=False) == "gzip"
+    assert negotiate("", brotli_available=True) is None
+
+
+def test_large_json_is_gzipped_and_small_left_alone():
+    client = TestClient(_app())
+    r = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["Content-Encoding"] == "gzip"
+    assert r.headers["Vary"] == "Accept-Encoding"
+    # The encoded body is a different representation
+    assert r.headers["ETag"] == 'W/"abc"'
+    assert int(r.headers["Content-Length"]) < len(r.content)
+    assert r.json()[199] == {"id": 199, "name": "item 199"}
+
+    r = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in r.headers
+
+    r = client.get("/big", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in r.headers
+    assert r.headers["ETag"] == '"abc"'
@@ -0,0 +1,35 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from app.services.definition_cache import WorkflowDefinitionCache
+
+
+def test_entries_are_keyed_by_updated_at_and_evicted_lru():
+    cache = WorkflowDefinitionCache(max_entries=2)
+    a, b, c = uuid4(), uuid4(), uuid4()
+    t = datetime(2026, 1, 1)
+
+    cache.put(a, t, b"a1")
+    cache.put(b, t, b"b1")
+    assert cache.get(a, t) == b"a1"
+    # A newer updated_at never sees the old body
+    assert cache.get(a, t + timedelta(seconds=1)) is None
+
+    cache.put(c, t, b"c1")  # evicts b, the least recently used
+    assert cache.get(b, t) is None
+    assert cache.get(a, t) == b"a1"
+    assert cache.stats()["entries"] == 2
+
+
+def test_invalidate_drops_every_version_of_a_workflow():
+    cache = WorkflowDefinitionCache(max_entries=10)
+    a, b = uuid4(), uuid4()
+    t = datetime(2026, 1, 1)
+    cache.put(a, t, b"old")
+    cache.put(a, t + timedelta(hours=1), b"new")
+    cache.put(b, t, b"other")
+
+    cache.invalidate(a)
+    assert cache.get(a, t) is None
+    assert cache.get(a, t + timedelta(hours=1)) is None
+    assert cache.get(b, t) == b"other"
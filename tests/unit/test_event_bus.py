@@ -0,0 +1,173 @@
+import asyncio
+import threading
+from uuid import uuid4
+
+from app.services import event_bus
+from app.services.event_bus import EventBus
+
+
+def test_publish_from_another_thread_reaches_matching_subscribers():
+    bus = EventBus()
+
+    async def scenario():
+        async with bus.subscribe({"role:a", "role:b"}) as both, bus.subscribe({"role:c"}) as other:
+            publisher = threading.Thread(
+                target=bus.publish, args=(["role:a", "role:b"], {"type": "task_added", "n": 1})
+            )
+            publisher.start()
+            publisher.join()
+            first = await both.get(timeout=1)
+            # Subscribed to both topics, still delivered once
+            assert await both.get(timeout=0.05) is None
+            assert await other.get(timeout=0.05) is None
+            return first
+
+    assert asyncio.run(scenario()) == {"type": "task_added", "n": 1}
+    assert bus.subscriber_count() == 0
+
+
+def test_slow_subscriber_gets_a_resync_instead_of_a_backlog():
+    bus = EventBus()
+
+    async def scenario():
+        async with bus.subscribe({"stats"}, max_queue=2) as sub:
+            for n in range(5):
+                bus.publish(["stats"], {"type": "stats_delta", "n": n})
+            await asyncio.sleep(0)
+            received = [await sub.get(timeout=0.05) for _ in range(2)]
+            bus.publish(["stats"], {"type": "stats_delta", "n": 5})
+            received.append(await sub.get(timeout=1))
+            return received
+
+    assert asyncio.run(scenario()) == [
+        {"type": "resync"},
+        None,
+        {"type": "stats_delta", "n": 5},
+    ]
+
+
+def test_step_events_route_to_inbox_and_requester(monkeypatch):
+    bus = EventBus()
+    monkeypatch.setattr(event_bus, "bus", bus)
+    role_id, requester_id = uuid4(), uuid4()
+    payload = {
+        "request_id": uuid4(),
+        "request_step_id": uuid4(),
+        "workflow_id": uuid4(),
+        "requester_id": requester_id,
+        "step_id": uuid4(),
+        "step_name": "Review",
+        "step_type": "HUMAN",
+        "required_role_id": role_id,
+        "required_permission_id": None,
+    }
+
+    async def scenario():
+        async with bus.subscribe({f"role:{role_id}"}) as inbox, bus.subscribe(
+            {f"user:{requester_id}"}
+        ) as requester:
+            event_bus._on_step_activated(payload)
+            event_bus._on_step_activated({**payload, "step_type": "AUTOMATIC"})
+            return (
+                await inbox.get(timeout=1),
+                await inbox.get(timeout=0.05),
+                await requester.get(timeout=1),
+            )
+
+    task, nothing, update = asyncio.run(scenario())
+    assert task["type"] == "task_added"
+    assert task["request_step_id"] == str(payload["request_step_id"])
+    # Automatic steps never show up in an inbox
+    assert nothing is None
+    assert update["type"] == "request_updated"
+    assert update["current_step_name"] == "Review"
+
+
+def test_step_requiring_role_and_permission_reaches_holders_of_both(monkeypatch):
+    from types import SimpleNamespace
+
+    bus = EventBus()
+    monkeypatch.setattr(event_bus, "bus", bus)
+    role_id, permission_id = uuid4(), uuid4()
+    permission = SimpleNamespace(id=permission_id)
+    both = SimpleNamespace(id=uuid4(), roles=[SimpleNamespace(id=role_id, permissions=[permission])])
+    role_only = SimpleNamespace(id=uuid4(), roles=[SimpleNamespace(id=role_id, permissions=[])])
+    payload = {
+        "request_id": uuid4(),
+        "request_step_id": uuid4(),
+        "step_id": uuid4(),
+        "step_type": "HUMAN",
+        "required_role_id": role_id,
+        "required_permission_id": permission_id,
+    }
+
+    async def scenario():
+        async with bus.subscribe(event_bus.inbox_topics(both)) as holder, bus.subscribe(
+            event_bus.inbox_topics(role_only)
+        ) as member:
+            event_bus._on_step_activated(payload)
+            return await holder.get(timeout=1), await member.get(timeout=0.05)
+
+    task, nothing = asyncio.run(scenario())
+    assert task["type"] == "task_added"
+    assert nothing is None
+
+
+def test_assigned_steps_reach_only_their_assignee(monkeypatch):
+    bus = EventBus()
+    monkeypatch.setattr(event_bus, "bus", bus)
+    role_id, assignee_id = uuid4(), uuid4()
+    payload = {
+        "request_id": uuid4(),
+        "request_step_id": uuid4(),
+        "step_id": uuid4(),
+        "step_type": "HUMAN",
+        "required_role_id": role_id,
+        "required_permission_id": None,
+        "assigned_to": assignee_id,
+    }
+
+    async def scenario():
+        async with bus.subscribe({f"assignee:{assignee_id}"}) as assignee, bus.subscribe(
+            {f"role:{role_id}"}
+        ) as member:
+            event_bus._on_step_activated(payload)
+            event_bus._on_step_skipped({**payload, "previous_status": "PENDING"})
+            return (
+                await assignee.get(timeout=1),
+                await assignee.get(timeout=1),
+                await member.get(timeout=0.05),
+            )
+
+    added, removed, nothing = asyncio.run(scenario())
+    assert added["type"] == "task_added"
+    assert removed["type"] == "task_removed"
+    assert nothing is None
+
+
+def test_delegates_follow_the_inbox_but_not_the_requests_of_who_they_cover(monkeypatch):
+    from types import SimpleNamespace
+
+    bus = EventBus()
+    monkeypatch.setattr(event_bus, "bus", bus)
+    delegator = SimpleNamespace(id=uuid4(), roles=[])
+    payload = {
+        "request_id": uuid4(),
+        "request_step_id": uuid4(),
+        "step_id": uuid4(),
+        "step_type": "HUMAN",
+        "required_role_id": None,
+        "required_permission_id": None,
+        "assigned_to": delegator.id,
+        # The delegator also started this request
+        "requester_id": delegator.id,
+    }
+
+    async def scenario():
+        async with bus.subscribe(event_bus.inbox_topics(delegator)) as delegate:
+            event_bus._on_step_activated(payload)
+            return await delegate.get(timeout=1), await delegate.get(timeout=0.05)
+
+    task, nothing = asyncio.run(scenario())
+    assert task["type"] == "task_added"
+    assert nothing is None
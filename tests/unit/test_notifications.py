@@ -1,7 +1,7 @@
 import pytest
 from unittest.mock import MagicMock, patch
 from uuid import uuid4
-from app.tasks.notifications import notify_new_assignment
+from app.tasks.notifications import notify_new_assignment, notify_new_assignments_batch
 from app.db.models.user import User, Role
 from app.db.models.workflow import WorkflowStep
 
@@ -39,3 +39,49 @@ def test_notify_new_assignment_finds_emails(mock_db_session):
         mock_notify.assert_called_once()
         args, kwargs = mock_notify.call_args
         assert kwargs["email"] == "test@example.com"
+
+
+def test_notify_new_assignments_batch_resolves_recipients_once(mock_db_session):
+    step_id = uuid4()
+    mock_step = MagicMock(spec=WorkflowStep, id=step_id, required_role_id=uuid4())
+    users = [
+        MagicMock(spec=User, email="a@example.com", is_active=True),
+        MagicMock(spec=User, email="b@example.com", is_active=False),
+    ]
+
+    mock_db_session.query.return_value.filter.return_value.first.return_value = (
+        mock_step
+    )
+    mock_db_session.query.return_value.join.return_value.filter.return_value.all.return_value = users
+
+    assignments = [{"request_id": str(uuid4()), "deadline": "today"} for _ in range(3)]
+    with patch(
+        "app.services.notification.NotificationService.notify_task_assigned"
+    ) as mock_notify:
+        count = notify_new_assignments_batch(str(step_id), "WF", "Step", assignments)
+
+    assert count == 3
+    assert mock_notify.call_count == 3
+    assert mock_db_session.query.return_value.join.call_count == 1
+
+
+def test_notify_new_assignment_only_emails_assignee(mock_db_session):
+    step_id, assignee_id = uuid4(), uuid4()
+    mock_step = MagicMock(spec=WorkflowStep, id=step_id, required_role_id=uuid4())
+    assignee = MagicMock(spec=User, id=assignee_id, email="me@example.com", is_active=True)
+
+    mock_db_session.query.return_value.filter.return_value.first.return_value = (
+        mock_step
+    )
+    mock_db_session.query.return_value.filter.return_value.all.return_value = [assignee]
+
+    with patch(
+        "app.services.notification.NotificationService.notify_task_assigned"
+    ) as mock_notify:
+        count = notify_new_assignment(
+            step_id, uuid4(), "WF", "Step", "today", assignee_id=str(assignee_id)
+        )
+
+    assert count == 1
+    assert mock_notify.call_args.kwargs["email"] == "me@example.com"
+    mock_db_session.query.return_value.join.assert_not_called()
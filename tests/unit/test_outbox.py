@@ -0,0 +1,60 @@
+from unittest.mock import patch
+from uuid import uuid4
+
+from app.core.celery_app import celery_app
+from app.db.models.outbox import OutboxMessage
+from app.services.outbox import Outbox
+from app.tasks.outbox import process_outbox_batch
+
+
+def test_relay_publishes_one_message_per_queue(db):
+    request_id = uuid4()
+    Outbox.enqueue(db, "app.tasks.notifications.notify_new_assignment", request_id=request_id)
+    Outbox.enqueue(db, "app.tasks.notifications.notify_new_assignment", request_id=uuid4())
+    Outbox.enqueue(db, "app.tasks.automation.run_automatic_steps", request_id=request_id)
+    db.commit()
+
+    with patch.object(process_outbox_batch, "apply_async") as publish:
+        assert Outbox.relay_batch(db) == 3
+        assert Outbox.relay_batch(db) == 0
+
+    assert publish.call_count == 2
+    by_queue = {c.kwargs["queue"]: c.kwargs["kwargs"]["messages"] for c in publish.call_args_list}
+    assert len(by_queue[None]) == 2
+    assert by_queue["automation"][0]["kwargs"] == {"request_id": str(request_id)}
+    assert db.query(OutboxMessage).filter(OutboxMessage.dispatched_at == None).count() == 0
+
+
+def test_relay_keeps_messages_when_publish_fails(db):
+    Outbox.enqueue(db, "app.tasks.notifications.notify_new_assignment", request_id=uuid4())
+    db.commit()
+
+    with patch.object(process_outbox_batch, "apply_async", side_effect=ConnectionError("broker down")):
+        assert Outbox.relay_batch(db) == 0
+
+    message = db.query(OutboxMessage).one()
+    assert message.dispatched_at is None
+    assert message.attempts == 1
+    assert "broker down" in message.last_error
+
+
+def test_process_outbox_batch_runs_each_task():
+    calls = []
+
+    @celery_app.task(name="tests.outbox_probe")
+    def probe(value):
+        calls.append(value)
+
+    try:
+        executed = process_outbox_batch(
+            [
+                {"id": "1", "task": "tests.outbox_probe", "kwargs": {"value": 1}},
+                {"id": "2", "task": "tests.unknown", "kwargs": {}},
+                {"id": "3", "task": "tests.outbox_probe", "kwargs": {"value": 3}},
+            ]
+        )
+    finally:
+        celery_app.tasks.pop("tests.outbox_probe", None)
+
+    assert executed == 2
+    assert calls == [1, 3]
@@ -0,0 +1,40 @@
+import pytest
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.pool import QueuePool
+from app.db.pool_metrics import get_pool_metrics, instrumented_pool_class, pool_snapshots
+
+
+@pytest.fixture
+def pooled_engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=instrumented_pool_class(QueuePool, "test_pool"),
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1,
+    )
+    yield engine
+    engine.dispose()
+
+
+def test_checkout_is_recorded(pooled_engine):
+    before = get_pool_metrics("test_pool").checkouts
+
+    with pooled_engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        snapshot = pool_snapshots()["test_pool"]
+        assert snapshot["checked_out"] == 1
+        assert snapshot["saturation"] == 1.0
+
+    assert get_pool_metrics("test_pool").checkouts == before + 1
+    assert pool_snapshots()["test_pool"]["checked_out"] == 0
+
+
+def test_checkout_timeout_is_recorded(pooled_engine):
+    before = get_pool_metrics("test_pool").checkout_timeouts
+
+    with pooled_engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            pooled_engine.connect()
+
+    assert get_pool_metrics("test_pool").checkout_timeouts == before + 1
@@ -0,0 +1,64 @@
+import threading
+
+import pytest
+
+from app.services import post_commit
+from app.services.post_commit import PostCommitExecutor
+
+
+@pytest.fixture
+def recorded(monkeypatch):
+    calls = []
+    monkeypatch.setitem(post_commit._handlers, "TEST_EVENT", [lambda p: calls.append(p["n"])])
+    monkeypatch.setattr(post_commit, "executor", PostCommitExecutor(workers=0, max_queue=10))
+    return calls
+
+
+def test_effects_run_only_after_commit(db, recorded):
+    post_commit.emit(db, "TEST_EVENT", n=1)
+    assert recorded == []
+    db.commit()
+    assert recorded == [1]
+
+
+def test_rolled_back_effects_are_dropped(db, recorded):
+    post_commit.emit(db, "TEST_EVENT", n=1)
+    try:
+        with db.begin_nested():
+            post_commit.emit(db, "TEST_EVENT", n=2)
+            raise ValueError("item failed")
+    except ValueError:
+        pass
+    with db.begin_nested():
+        post_commit.emit(db, "TEST_EVENT", n=3)
+    db.commit()
+    assert recorded == [1, 3]
+
+    post_commit.emit(db, "TEST_EVENT", n=4)
+    db.rollback()
+    db.commit()
+    assert recorded == [1, 3]
+
+
+def test_unhandled_events_are_not_collected(db):
+    post_commit.emit(db, "NOBODY_LISTENS", n=1)
+    assert not db.info.get(post_commit._INFO_KEY)
+
+
+def test_full_queue_runs_in_caller_and_counts_backpressure():
+    executor = PostCommitExecutor(workers=1, max_queue=1)
+    release = threading.Event()
+    ran_inline = []
+
+    executor.submit(release.wait)  # occupies the worker
+    while executor.metrics()["queue_depth"]:
+        pass
+    executor.submit(lambda: None)  # fills the queue
+    executor.submit(lambda: ran_inline.append(threading.current_thread().name))
+
+    assert ran_inline == [threading.current_thread().name]
+    release.set()
+    assert executor.drain()
+    metrics = executor.metrics()
+    assert metrics["caller_runs"] == 1
+    assert metrics["submitted"] == metrics["executed"] == 3
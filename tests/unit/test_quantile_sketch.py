@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+from app.services.quantile_sketch import QuantileSketch
+
+
+def exact(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def test_quantiles_within_relative_accuracy():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(2, 1.5) for _ in range(20000)]
+    sketch = QuantileSketch(0.01)
+    sketch.extend(values)
+
+    for q in (0.5, 0.9, 0.99):
+        assert sketch.quantile(q) == pytest.approx(exact(values, q), rel=0.0101)
+    assert sketch.count == len(values)
+    assert sketch.max == max(values)
+    assert len(sketch.bins) < 2000
+
+
+def test_merge_matches_single_sketch():
+    rng = random.Random(11)
+    values = [rng.expovariate(0.1) for _ in range(5000)]
+    whole, first, second = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    whole.extend(values)
+    first.extend(values[:1234])
+    second.extend(values[1234:])
+    first.merge(second)
+
+    assert first.bins == whole.bins
+    assert first.count == whole.count
+    assert first.quantile(0.9) == whole.quantile(0.9)
+
+
+def test_round_trip_and_edge_cases():
+    assert QuantileSketch().quantile(0.5) is None
+
+    sketch = QuantileSketch()
+    sketch.extend([0, 0, 5.0])
+    assert sketch.quantile(0.5) == 0.0
+    assert sketch.quantile(1) == 5.0
+
+    restored = QuantileSketch.from_dict(sketch.to_dict())
+    assert restored.to_dict() == sketch.to_dict()
+    assert restored.quantile(0.99) == sketch.quantile(0.99)
+
+    with pytest.raises(ValueError):
+        sketch.merge(QuantileSketch(0.05))
@@ -0,0 +1,76 @@
+import pytest
+from sqlalchemy import Column, Integer, String, create_engine, insert
+from sqlalchemy.orm import declarative_base, sessionmaker
+from app.db.routing import ReadYourWritesTracker, RoutingSession
+
+RoutingBase = declarative_base()
+
+
+class Item(RoutingBase):
+    __tablename__ = "items"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50))
+
+
+@pytest.fixture
+def routed_session_factory(tmp_path):
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    RoutingBase.metadata.create_all(primary)
+    RoutingBase.metadata.create_all(replica)
+
+    tracker = ReadYourWritesTracker(window_seconds=60)
+
+    class TestRoutingSession(RoutingSession):
+        replica_bind = replica
+
+    TestRoutingSession.tracker = tracker
+    factory = sessionmaker(class_=TestRoutingSession, bind=primary)
+    yield factory, tracker
+    primary.dispose()
+    replica.dispose()
+
+
+def test_read_only_session_reads_replica_and_writes_primary(routed_session_factory):
+    factory, _ = routed_session_factory
+
+    with factory() as db:
+        db.add(Item(id=1, name="primary only"))
+        db.commit()
+
+    with factory() as db:
+        db.info["read_only"] = True
+        # Replica has not received the row
+        assert db.query(Item).count() == 0
+
+        # Flushes and DML statements still go to the primary
+        db.add(Item(id=2, name="flushed"))
+        db.execute(insert(Item).values(id=3, name="inserted"))
+        db.commit()
+
+    with factory() as db:
+        assert db.query(Item).count() == 3
+
+
+def test_commit_marks_user_for_read_your_writes(routed_session_factory):
+    factory, tracker = routed_session_factory
+
+    with factory() as db:
+        db.info["user_id"] = "reader"
+        db.query(Item).all()
+        db.commit()
+    assert not tracker.is_recent("reader")
+
+    with factory() as db:
+        db.info["user_id"] = "writer"
+        db.add(Item(id=10, name="x"))
+        db.commit()
+    assert tracker.is_recent("writer")
+
+
+def test_tracker_window_expires():
+    tracker = ReadYourWritesTracker(window_seconds=0)
+    tracker.mark("user")
+    assert not tracker.is_recent("user")
+    assert not tracker.is_recent(None)
@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 from uuid import uuid4
 from datetime import datetime
 from sqlalchemy.orm import configure_mappers
@@ -14,6 +14,7 @@ from app.db.models.request import (
 )
 from app.db.models.workflow import Workflow, WorkflowStep, StepTransition
 from app.db.models.audit import AuditLog
+from app.db.models.outbox import OutboxMessage
 from app.core.exceptions import WorkflowEngineError, ConditionEvaluationError
 
 # Force SQLAlchemy to initialize mappers
@@ -25,6 +26,16 @@ def mock_db():
     return MagicMock()
 
 
+@pytest.fixture(autouse=True)
+def no_webhook_subscribers(monkeypatch):
+    # The query stubs below answer one model at a time, so keep the
+    # subscriber lookup off them
+    monkeypatch.setattr(
+        "app.services.webhooks.WebhookService._subscribers",
+        staticmethod(lambda db, event_type: []),
+    )
+
+
 @pytest.fixture
 def sample_workflow():
     wf_id = uuid4()
@@ -57,9 +68,17 @@ def test_start_workflow_success(mock_db, sample_workflow):
 
     mock_db.query.side_effect = side_effect
 
-    with patch("app.tasks.notifications.notify_new_assignment.delay") as mock_notify:
-        request = WorkflowEngine.start_workflow(mock_db, wf_id, requester_id, data)
-        assert mock_notify.called
+    request = WorkflowEngine.start_workflow(mock_db, wf_id, requester_id, data)
+
+    # The notification is written to the outbox, not sent to the broker
+    queued = [
+        c.args[0]
+        for c in mock_db.add.call_args_list
+        if isinstance(c.args[0], OutboxMessage)
+    ]
+    assert [m.task_name for m in queued] == [
+        "app.tasks.notifications.notify_new_assignment"
+    ]
 
     assert request.workflow_id == wf_id
     assert request.requester_id == requester_id
@@ -96,9 +115,9 @@ def test_process_step_linear(mock_db, sample_workflow):
     def side_effect(model):
         m = MagicMock()
         if model == WorkflowRequest:
-            m.filter.return_value.first.return_value = request
+            m.filter.return_value.with_for_update.return_value.first.return_value = request
         elif model == RequestStep:
-            m.filter.return_value.first.return_value = current_exec
+            m.filter.return_value.all.return_value = [current_exec]
         elif model == StepTransition:
             m.filter.return_value.all.return_value = [transition]
         elif model == WorkflowStep:
@@ -138,9 +157,9 @@ def test_process_step_terminal(mock_db, sample_workflow):
     def side_effect(model):
         m = MagicMock()
         if model == WorkflowRequest:
-            m.filter.return_value.first.return_value = request
+            m.filter.return_value.with_for_update.return_value.first.return_value = request
         elif model == RequestStep:
-            m.filter.return_value.first.return_value = current_exec
+            m.filter.return_value.all.return_value = [current_exec]
         elif model == StepTransition:
             m.filter.return_value.all.return_value = []
         return m
@@ -180,3 +199,45 @@ def test_condition_evaluator_invalid_path():
     # Non-existent field should return False (failed match)
     config = {"field": "request_data.missing", "operator": "==", "value": 100}
     assert evaluator.evaluate(config, context) is False
+
+
+def test_process_step_lock_conflict(mock_db):
+    from sqlalchemy.exc import OperationalError
+    from app.core.exceptions import ConcurrencyConflictError
+
+    lock_error = OperationalError("SELECT ... FOR UPDATE NOWAIT", {}, MagicMock(pgcode="55P03"))
+    mock_db.query.return_value.filter.return_value.with_for_update.return_value.first.side_effect = lock_error
+
+    with pytest.raises(ConcurrencyConflictError):
+        WorkflowEngine.process_step(mock_db, uuid4(), MagicMock(roles=[]), "APPROVED")
+
+
+def test_bulk_process_reports_locked_requests_as_conflicts(mock_db):
+    locked, missing = uuid4(), uuid4()
+
+    def side_effect(*entities):
+        m = MagicMock()
+        if entities[0] is WorkflowRequest.id:
+            # Only `locked` exists, and another transaction holds its row
+            m.filter.return_value.__iter__.return_value = iter([(locked,)])
+            m.filter.return_value.with_for_update.return_value.__iter__.return_value = iter([])
+        else:
+            m.join.return_value.options.return_value.filter.return_value.with_for_update.return_value.all.return_value = []
+        return m
+
+    mock_db.query.side_effect = side_effect
+
+    results = WorkflowEngine.process_steps_bulk(
+        mock_db,
+        MagicMock(roles=[]),
+        [
+            {"request_id": locked, "outcome": "APPROVED"},
+            {"request_id": missing, "outcome": "APPROVED"},
+        ],
+    )
+
+    assert [r["success"] for r in results] == [False, False]
+    assert results[0]["error_code"] == "CONCURRENT_MODIFICATION"
+    assert "Retry shortly" in results[0]["error"]
+    assert results[1]["error_code"] is None
+    assert "no pending execution step" in results[1]["error"]
@@ -0,0 +1,109 @@
+import pytest
+
+from app.core.exceptions import WorkflowValidationError
+from app.services.workflow_graph import WorkflowGraphAnalyzer, conditions_overlap
+
+
+def step(order, **kwargs):
+    return {"name": f"Step {order}", "step_order": order, **kwargs}
+
+
+def move(from_order, to_order, outcome="APPROVED", **kwargs):
+    return {
+        "from_step_order": from_order,
+        "to_step_order": to_order,
+        "outcome": outcome,
+        **kwargs,
+    }
+
+
+def codes(steps, transitions):
+    analyzer = WorkflowGraphAnalyzer.from_definition(steps, transitions)
+    return sorted((i.code, i.step) for i in analyzer.analyze())
+
+
+def test_linear_definition_is_clean():
+    assert codes([step(1), step(2), step(3)], [move(1, 2), move(2, 3)]) == []
+
+
+def test_unreachable_and_unknown_steps():
+    result = codes([step(1), step(2), step(3)], [move(1, 2), move(2, 7)])
+    assert ("unreachable_step", 3) in result
+    assert ("unknown_step", 7) in result
+
+
+def test_missing_entry_and_duplicate_orders():
+    result = codes([step(2), step(2)], [])
+    assert ("no_entry_step", None) in result
+    assert ("duplicate_step_order", 2) in result
+
+
+def test_cycle_without_exit():
+    transitions = [
+        move(1, 2),
+        move(1, 2, "REJECTED"),
+        move(2, 1),
+        move(2, 1, "REJECTED"),
+    ]
+    result = codes([step(1), step(2)], transitions)
+    assert ("no_exit", 1) in result and ("no_exit", 2) in result
+
+
+def test_rework_loop_with_exit_is_allowed():
+    # Rejection sends the request back; approval at step 2 ends it
+    transitions = [move(1, 2), move(2, 1, "REJECTED")]
+    assert codes([step(1), step(2)], transitions) == []
+
+
+def test_unknown_automatic_action():
+    steps = [step(1, step_type="AUTOMATIC", action_config={"action": "nope"})]
+    assert codes(steps, []) == [("unknown_action", 1)]
+
+
+def test_route_warnings():
+    amount = {"field": "request_data.amount"}
+    transitions = [
+        move(1, 2, condition_config={**amount, "operator": ">", "value": 100}),
+        move(1, 3, condition_config={**amount, "operator": ">=", "value": 500}),
+    ]
+    result = codes([step(1), step(2), step(3)], transitions)
+    assert result == [("condition_overlap", 1), ("no_default_route", 1)]
+
+    transitions = [move(1, 2), move(1, 3)]
+    result = codes([step(1), step(2), step(3)], transitions)
+    assert ("shadowed_route", 1) in result
+
+
+def test_validate_raises_on_errors_only():
+    analyzer = WorkflowGraphAnalyzer.from_definition([step(1), step(3)], [])
+    with pytest.raises(WorkflowValidationError) as exc:
+        analyzer.validate()
+    assert [i.code for i in exc.value.issues] == ["unreachable_step"]
+
+
+@pytest.mark.parametrize(
+    "a, b, expected",
+    [
+        ((">", 100), ("<", 100), False),
+        ((">=", 100), ("<=", 100), True),
+        (("==", "gold"), ("in", ["gold", "silver"]), True),
+        (("==", "gold"), ("!=", "gold"), False),
+        (("in", [50, 150]), (">", 100), True),
+        (("in", [50]), (">", 100), False),
+    ],
+)
+def test_conditions_overlap(a, b, expected):
+    field = "request_data.tier"
+    first = {"field": field, "operator": a[0], "value": a[1]}
+    second = {"field": field, "operator": b[0], "value": b[1]}
+    assert conditions_overlap(first, second) is expected
+    assert conditions_overlap(second, first) is expected
+
+
+def test_outcome_table_keeps_transition_order():
+    transitions = [move(1, 3, condition_config={"field": "x", "value": 1}), move(1, 2)]
+    table = WorkflowGraphAnalyzer.from_definition(
+        [step(1), step(2), step(3)], transitions
+    ).outcome_table()
+    assert [r.to_step_id for r in table[1]["APPROVED"]] == [3, 2]
+    assert table[2] == {} and table[3] == {}